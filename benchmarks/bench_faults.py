@@ -0,0 +1,174 @@
+'''
+time and memory profile every fault condition on synthetic plant data
+$ python -m benchmarks.bench_faults --rows 10000 100000 1000000 -o bench.json
+
+compare two result files, exits 1 when anything got slower than --tolerance
+$ python -m benchmarks.bench_faults --compare old.json new.json
+'''
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from faults import cycling, kernels
+from faults.conditions import CyclingFaultCondition
+from faults.plant import BoilerPlantFaults, build_faults
+from faults.shards import ShardedPlantFaults
+from faults.streaming import StreamingFaults
+from faults.threaded import ThreadedFaults
+from faults.synthetic import PLANT_CONFIG, synthetic_plant
+
+
+def measure(func, repeat: int = 3) -> dict:
+    """Best wall time of repeat runs and the tracemalloc peak of one more."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": min(times), "peak_bytes": peak}
+
+
+def with_backend(name: str, func):
+    previous = cycling.set_backend(name)
+    try:
+        return func()
+    finally:
+        cycling.set_backend(previous)
+
+
+def engines(df: pd.DataFrame, config: dict) -> dict:
+    """name -> function of every way to compute the flags of df."""
+    runs = {}
+    for fault_id, fault in build_faults(config).items():
+        runs[f"{fault_id}.apply"] = \
+            lambda fault=fault: fault.apply(df.copy(deep=False))
+        runs[f"{fault_id}.evaluate"] = lambda fault=fault: fault.evaluate(df)
+
+        if isinstance(fault, CyclingFaultCondition) and cycling.HAVE_NUMBA:
+            # the compiled window counts against the numpy ones
+            for backend in cycling.BACKENDS:
+                runs[f"{fault_id}.{backend}"] = \
+                    lambda fault=fault, backend=backend: with_backend(
+                        backend, lambda: fault.evaluate(df))
+
+        if not isinstance(fault, CyclingFaultCondition):
+            arrays = {col: df[col].to_numpy() for col in fault.columns()}
+            work = kernels.Workspace()
+            out = np.empty(len(df), dtype=bool)
+            runs[f"{fault_id}.kernel"] = \
+                lambda fault=fault, arrays=arrays, work=work, out=out: \
+                fault.flag_array(arrays, out, work)
+
+    plant = BoilerPlantFaults(config)
+    runs["plant.apply"] = lambda: plant.apply(df)
+
+    threaded = ThreadedFaults(config)
+    runs["plant.threads"] = lambda: threaded.evaluate(df)
+
+    for pool in ("thread", "process"):
+        sharded = ShardedPlantFaults(config, pool=pool)
+        runs[f"shards.{pool}"] = lambda sharded=sharded: sharded.apply(df)
+
+    chunksize = max(len(df) // 10, 1)
+    runs["plant.streaming"] = lambda: StreamingFaults(config).evaluate(
+        df.iloc[i:i + chunksize] for i in range(0, len(df), chunksize))
+    return runs
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+            check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(rows: list, repeat: int = 3, freq="1min", seed: int = 0,
+        only: str = None) -> dict:
+    results = []
+    for n in rows:
+        df = synthetic_plant(n, freq=freq, seed=seed)
+        for name, func in engines(df, PLANT_CONFIG).items():
+            if only and only not in name:
+                continue
+            result = measure(func, repeat)
+            result.update(name=name, rows=n,
+                          rows_per_second=n / result["seconds"])
+            results.append(result)
+            print(f"{name:<18} {n:>11,} rows {result['seconds']:9.4f} s "
+                  f"{result['peak_bytes'] / 2**20:9.1f} MiB", file=sys.stderr)
+
+    return {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "freq": freq,
+        "seed": seed,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(old: dict, new: dict, tolerance: float = 0.2) -> list:
+    """(name, rows, new / old time) of every result slower than tolerance."""
+    before = {(r["name"], r["rows"]): r["seconds"] for r in old["results"]}
+    slower = []
+    for r in new["results"]:
+        key = (r["name"], r["rows"])
+        if key in before and before[key] > 0:
+            ratio = r["seconds"] / before[key]
+            if ratio > 1.0 + tolerance:
+                slower.append((r["name"], r["rows"], ratio))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+",
+                        default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--freq", default="1min")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", help="run the benchmarks with this in the name")
+    parser.add_argument("-o", "--output", default="bench.json")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"))
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            old = json.load(f)
+        with open(args.compare[1]) as f:
+            new = json.load(f)
+        slower = compare(old, new, args.tolerance)
+        for name, rows, ratio in slower:
+            print(f"{name:<18} {rows:>11,} rows {ratio:6.2f}x slower")
+        return 1 if slower else 0
+
+    report = run(args.rows, args.repeat, args.freq, args.seed, args.only)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+'''
+command line for the boiler plant faults
+
+$ python -m faults list
+$ python -m faults validate plant.json
+$ python -m faults run plant.json trend_log.parquet -o results --episodes
+
+pandas and the fault code are only imported by run, so --help, list
+and validate return in tens of milliseconds.
+'''
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from faults.registry import check_config, fault_specs
+
+
+def read_config(path) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def select_faults(config: dict, faults: str = None) -> dict:
+    """The config of a comma separated subset of fault ids."""
+    if not faults:
+        return config
+    ids = [fault_id.strip() for fault_id in faults.split(",") if fault_id.strip()]
+    missing = [fault_id for fault_id in ids if fault_id not in config]
+    if missing:
+        raise ValueError(f"{', '.join(missing)} not in the plant config")
+    return {fault_id: config[fault_id] for fault_id in ids}
+
+
+def cmd_list(args) -> int:
+    for fault_id, spec in fault_specs().items():
+        print(f"{fault_id:<5} {spec['class']:<23} {spec['description']}")
+        if args.verbose:
+            print(f"      required: {', '.join(spec['required'])}")
+            print(f"      optional: {', '.join(spec['optional'])}")
+    return 0
+
+
+def cmd_validate(args) -> int:
+    try:
+        config = select_faults(read_config(args.config), args.faults)
+    except (OSError, ValueError) as e:
+        print(f"{args.config}: {e}", file=sys.stderr)
+        return 2
+    errors = check_config(config)
+    for error in errors:
+        print(f"{args.config}: {error}", file=sys.stderr)
+    if errors:
+        return 2
+    print(f"{args.config}: {len(config)} fault conditions ok")
+    return 0
+
+
+def run_file(plant, path, out_dir: Path, args) -> list:
+    # imported here to keep pandas off the startup path
+    from faults.batch import write_site_results
+    from faults.episodes import flags_to_episodes
+    from faults.loader import load_trend_log
+
+    df = load_trend_log(path, plant, start=args.start, end=args.end,
+                        compact=args.compact)
+    results = plant.apply(df)
+    stem = Path(path).stem
+    if args.store:
+        from faults.store import FaultStore
+
+        with FaultStore(args.store) as store:
+            store.write_results(stem, results,
+                                periods=plant.episode_periods())
+    if not args.episodes:
+        return write_site_results(results, out_dir, stem)
+
+    out_path = out_dir / f"{stem}.episodes.csv"
+    flags_to_episodes(results, args.min_duration,
+                      plant.episode_periods()).to_csv(out_path, index=False)
+    return [str(out_path)]
+
+
+def cmd_run(args) -> int:
+    code = cmd_validate(args)
+    if code:
+        return code
+
+    from faults.plant import BoilerPlantFaults
+
+    plant = BoilerPlantFaults(select_faults(read_config(args.config), args.faults))
+    out_dir = Path(args.output)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    code = 0
+    for path in args.inputs:
+        try:
+            for output in run_file(plant, path, out_dir, args):
+                print(output)
+        except Exception as e:
+            # a bad file is reported and the others still run
+            print(f"{path}: {type(e).__name__}: {e}", file=sys.stderr)
+            code = 1
+    return code
+
+
+def parser() -> argparse.ArgumentParser:
+    doc = __doc__.strip().splitlines()
+    p = argparse.ArgumentParser(
+        prog="python -m faults", description=doc[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="\n".join(doc[1:]))
+    commands = p.add_subparsers(dest="command", required=True)
+
+    p_list = commands.add_parser("list", help="fault ids and what they flag")
+    p_list.add_argument("-v", "--verbose", action="store_true",
+                        help="also show the arguments of each fault")
+    p_list.set_defaults(func=cmd_list)
+
+    for name, func, help in (
+            ("validate", cmd_validate, "check a plant config without data"),
+            ("run", cmd_run, "run a plant config on trend log files")):
+        p_cmd = commands.add_parser(name, help=help)
+        p_cmd.add_argument("config", help="json plant config, fault id to arguments")
+        p_cmd.add_argument("-f", "--faults",
+                           help="comma separated fault ids to run, default all")
+        p_cmd.set_defaults(func=func)
+
+    p_run = commands.choices["run"]
+    p_run.add_argument("inputs", nargs="+",
+                       help="csv, parquet or feather trend logs")
+    p_run.add_argument("-o", "--output", default=".",
+                       help="directory for the result csv files")
+    p_run.add_argument("--episodes", action="store_true",
+                       help="write fault episodes instead of the flags")
+    p_run.add_argument("--min-duration",
+                       help="drop episodes shorter than this, like 15min")
+    p_run.add_argument("--start", help="first timestamp to read")
+    p_run.add_argument("--end", help="read up to this timestamp")
+    p_run.add_argument("--store",
+                       help="also write the episodes to this sqlite file, "
+                       "the file name is the site")
+    p_run.add_argument("--compact", action="store_true",
+                       help="read with the compact float32 / int8 dtypes")
+    return p
+
+
+def main(argv=None) -> int:
+    args = parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
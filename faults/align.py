@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+
+from faults.episodes import to_timedelta
+from faults.loader import (_bound, _cast_frame, column_dtypes,
+                            required_columns)
+
+
+def points_from_long(df: pd.DataFrame, time_col="timestamp", point_col="point",
+                     value_col="value") -> dict:
+    """Point name to its own series from a long (time, point, value) log."""
+    return {point: pd.Series(group[value_col].to_numpy(),
+                             index=pd.DatetimeIndex(group[time_col]),
+                             name=point)
+            for point, group in df.groupby(point_col, sort=False)}
+
+
+def _sorted(series: pd.Series):
+    index = pd.DatetimeIndex(series.index)
+    stamps = index.as_unit("ns").asi8
+    values = series.to_numpy()
+    if len(stamps) > 1 and not (stamps[1:] >= stamps[:-1]).all():
+        order = np.argsort(stamps, kind="stable")
+        stamps, values = stamps[order], values[order]
+    return stamps, values, index.tz
+
+
+def _to_index(stamps: np.ndarray, tz) -> pd.DatetimeIndex:
+    index = pd.DatetimeIndex(stamps.view("M8[ns]"))
+    if tz is not None:
+        index = index.tz_localize("UTC").tz_convert(tz)
+    return index
+
+
+def _max_ages(max_age, cols) -> dict:
+    # one limit for every point or a dict of point to limit, None has none
+    if not isinstance(max_age, dict):
+        max_age = {col: max_age for col in cols}
+    return {col: None if max_age.get(col) is None
+            else to_timedelta(max_age[col]).value for col in cols}
+
+
+def align_points(points: dict, config, freq=None, start=None, end=None,
+                 max_age=None, dtypes=True, compact=False,
+                 return_stale=False):
+    """One dataframe of the points the configured faults read.
+
+    points maps point names to series each on their own timestamps, a
+    trend every 5 s, every minute or on change of value. Each point
+    takes its last value at or before every time of the timeline (asof),
+    found with a searchsorted on its sorted timestamps, so nothing is
+    joined or forward filled beyond the output rows. The timeline is
+    every freq from start to end, or without freq every time any of the
+    points was logged. A value older than max_age (one limit or a dict
+    of point to limit, None for no limit) is stale, like a time before
+    a point's first sample, and rows with any stale point are dropped
+    since the faults can not be evaluated on them. With return_stale
+    also returns the stale mask of every point on the whole timeline.
+    Columns are cast like load_trend_log() does with dtypes and compact.
+    Naive start and end are wall times in the time zone of the points.
+    """
+    cols = required_columns(config)
+    missing = [col for col in cols if col not in points]
+    if missing:
+        raise KeyError(f"no series for the points {missing}")
+    series = {col: _sorted(points[col]) for col in cols}
+    tz = series[cols[0]][2]
+
+    if freq is None:
+        # merge of the sorted timestamps, the event timeline
+        index = _to_index(np.unique(np.concatenate(
+            [stamps for stamps, _, _ in series.values()])), tz)
+        if start is not None:
+            index = index[index >= _bound(start, tz)]
+        if end is not None:
+            index = index[index < _bound(end, tz)]
+    else:
+        logged = _to_index(np.concatenate(
+            [stamps[[0, -1]] for stamps, _, _ in series.values()
+             if len(stamps)]), tz)
+        start = logged.min().floor(freq) if start is None else \
+            _bound(start, tz)
+        end = logged.max() if end is None else \
+            _bound(end, tz) - pd.Timedelta(1)
+        index = pd.date_range(start, end, freq=freq, unit="ns")
+    timeline = index.as_unit("ns").asi8
+
+    ages = _max_ages(max_age, cols)
+    positions, stale = {}, {}
+    for col, (stamps, _, _) in series.items():
+        pos = np.searchsorted(stamps, timeline, side="right") - 1
+        col_stale = pos < 0
+        pos[col_stale] = 0
+        if ages[col] is not None and len(stamps):
+            col_stale |= timeline - stamps[pos] > ages[col]
+        positions[col], stale[col] = pos, col_stale
+
+    keep = ~np.logical_or.reduce(list(stale.values()))
+    df = pd.DataFrame({col: series[col][1][positions[col][keep]]
+                       for col in cols}, index=index[keep])
+    if dtypes:
+        df = _cast_frame(df, column_dtypes(config, compact))
+    if return_stale:
+        return df, pd.DataFrame(stale, index=index)
+    return df
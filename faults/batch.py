@@ -0,0 +1,169 @@
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import pandas as pd
+
+from faults.episodes import flags_to_episodes
+from faults.loader import load_trend_log
+from faults.plant import BoilerPlantFaults
+from faults.store import FaultStore, result_span
+
+
+def load_manifest(path) -> list:
+    """Sites to run from a json manifest file.
+
+    {"defaults": {plant config}, "sites": [{"site": "name", "path":
+    "trend_log.csv", "config": {plant config}}, ...]}. A site config
+    adds faults or overrides single thresholds and columns of the
+    defaults, relative paths are relative to the manifest.
+    """
+    path = Path(path)
+    with open(path) as f:
+        manifest = json.load(f)
+
+    defaults = manifest.get("defaults", {})
+    sites = []
+    for site in manifest["sites"]:
+        config = {fault_id: dict(args) for fault_id, args in defaults.items()}
+        for fault_id, args in site.get("config", {}).items():
+            config.setdefault(fault_id, {}).update(args)
+
+        data_path = Path(site["path"])
+        if not data_path.is_absolute():
+            data_path = path.parent / data_path
+        sites.append({"site": site["site"], "path": str(data_path),
+                      "config": config})
+    return sites
+
+
+def write_site_results(results: dict, out_dir, site: str) -> list:
+    """Write row flags and cycling window flags of one site to csv."""
+    by_index = {}
+    for flag, series in results.items():
+        key = "cycling" if flag in ("fc12_flag", "fc13_flag", "fc14_flag") \
+            else "flags"
+        by_index.setdefault(key, {})[flag] = series
+
+    outputs = []
+    for key, flags in by_index.items():
+        out_path = Path(out_dir) / f"{site}.{key}.csv"
+        pd.DataFrame(flags).to_csv(out_path)
+        outputs.append(str(out_path))
+    return outputs
+
+
+def run_site(site: dict, out_dir, episodes: bool = False) -> dict:
+    """Run one site and write its flags, errors are returned not raised.
+
+    Runs in a worker process, a bad site's TypeError from the column
+    checks only fails that site. With episodes the result also holds
+    the fault episodes of the site for the parent to store.
+    """
+    result = {"site": site["site"], "pid": os.getpid(), "rows": 0,
+              "seconds": 0.0, "outputs": [], "error": None}
+    start = time.perf_counter()
+    try:
+        plant = BoilerPlantFaults(site["config"])
+        # only the points the configured faults read
+        df = load_trend_log(site["path"], plant)
+        results = plant.apply(df)
+        result["rows"] = len(df)
+        result["outputs"] = write_site_results(results, out_dir, site["site"])
+        if episodes:
+            result["episodes"] = flags_to_episodes(
+                results, periods=plant.episode_periods())
+            result["span"] = result_span(results)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+        result["traceback"] = traceback.format_exc()
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def throughput(results: list) -> dict:
+    """Rows per second of every worker process over its sites."""
+    rows, seconds = {}, {}
+    for result in results:
+        pid = result["pid"]
+        rows[pid] = rows.get(pid, 0) + result["rows"]
+        seconds[pid] = seconds.get(pid, 0.0) + result["seconds"]
+    return {pid: rows[pid] / seconds[pid] if seconds[pid] else 0.0
+            for pid in rows}
+
+
+def batch_summary(results: list, seconds: float) -> dict:
+    """Totals of a run and the rows per second of every worker."""
+    rows = sum(result["rows"] for result in results)
+    return {
+        "sites": len(results),
+        "errors": sum(result["error"] is not None for result in results),
+        "rows": rows,
+        "seconds": seconds,
+        "rows_per_second": rows / seconds if seconds else 0.0,
+        "rows_per_second_per_worker": {
+            str(pid): rate for pid, rate in throughput(results).items()
+            if pid is not None},
+    }
+
+
+def run_batch(sites, out_dir, workers: int = None, log_name="batch_log.jsonl",
+              store=None) -> list:
+    """Run every site of a manifest on a process pool.
+
+    sites is a manifest path or the list load_manifest() returns.
+    Flags are written to out_dir as each site finishes and one json
+    line per site goes to out_dir/log_name, then a last {"summary": ...}
+    line with batch_summary(), the throughput per worker. workers=0
+    runs the sites in this process. store is a faults.store.FaultStore
+    or the path of one, the episodes of every site are written to it by
+    this process as the sites finish so the workers never contend for
+    the database.
+    """
+    if not isinstance(sites, list):
+        sites = load_manifest(sites)
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    if store is not None and not isinstance(store, FaultStore):
+        store = FaultStore(store)
+    episodes = store is not None
+
+    results = []
+    start = time.perf_counter()
+    with open(out_dir / log_name, "a") as log:
+
+        def finished(result):
+            site_episodes = result.pop("episodes", None)
+            span = result.pop("span", {})
+            if site_episodes is not None:
+                result["episodes"] = store.write_episodes(
+                    result["site"], site_episodes, **span)
+            results.append(result)
+            log.write(json.dumps(
+                {k: v for k, v in result.items() if k != "traceback"}) + "\n")
+            log.flush()
+
+        if workers == 0:
+            for site in sites:
+                finished(run_site(site, out_dir, episodes))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(run_site, site, out_dir, episodes): site
+                           for site in sites}
+                for future in as_completed(futures):
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # the worker itself died, not the fault logic
+                        result = {"site": futures[future]["site"], "pid": None,
+                                  "rows": 0, "seconds": 0.0, "outputs": [],
+                                  "error": f"{type(e).__name__}: {e}"}
+                    finished(result)
+
+        summary = batch_summary(results, time.perf_counter() - start)
+        log.write(json.dumps({"summary": summary}) + "\n")
+
+    return results
@@ -0,0 +1,187 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from faults.episodes import to_episodes
+from faults.loader import load_trend_log
+from faults.plant import build_faults, reject_devices
+
+
+# bump when the stored results change shape
+CACHE_VERSION = 1
+
+# attributes that do not change the flags
+_NOT_PARAMS = ("troubleshoot", "instrument", "flag_dtype")
+
+
+def _hash(*parts) -> str:
+    h = hashlib.blake2b(digest_size=20)
+    for part in parts:
+        h.update(part if isinstance(part, (bytes, memoryview))
+                 else str(part).encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _array_bytes(values: np.ndarray):
+    if values.dtype == object:
+        values = pd.util.hash_array(values)
+    return memoryview(np.ascontiguousarray(values)).cast("B")
+
+
+def fault_params(fault) -> str:
+    """The class, thresholds and column mapping of a fault as json."""
+    params = {name: value for name, value in vars(fault).items()
+              if name not in _NOT_PARAMS}
+    return json.dumps([type(fault).__name__, params], sort_keys=True,
+                      default=str)
+
+
+def index_fingerprint(index: pd.Index) -> str:
+    """Hash of the timestamps, with the range and length to read it."""
+    index = pd.DatetimeIndex(index)
+    stamps = index.as_unit("ns").asi8
+    return _hash(len(index), index.tz, index[:1], index[-1:],
+                 _array_bytes(stamps))
+
+
+def column_fingerprint(df: pd.DataFrame, col) -> str:
+    values = df[col].to_numpy()
+    return _hash(col, values.dtype.str, _array_bytes(values))
+
+
+def file_fingerprint(path, **kwargs) -> str:
+    """Hash of a file's path, size and modification time, no data read."""
+    stat = os.stat(path)
+    return _hash(Path(path).resolve(), stat.st_size, stat.st_mtime_ns,
+                 json.dumps(kwargs, sort_keys=True, default=str))
+
+
+class ResultCache:
+    """On disk cache of fault flags and episodes.
+
+    Entries are keyed per fault by a fingerprint of the data it read
+    (the hash of its columns and the index, or of a file's path, size
+    and mtime) and its class, thresholds and column mapping, so changing
+    one threshold only misses for that fault. Each entry holds the flag
+    series and its episodes. Past max_bytes the least recently used
+    entries are removed.
+    """
+
+    def __init__(self, path, max_bytes: int = 1 << 30):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, fault, fingerprint: str) -> str:
+        return _hash(CACHE_VERSION, fingerprint, fault_params(fault))
+
+    def _entry(self, key: str) -> Path:
+        return self.path / f"{key}.pkl"
+
+    def get(self, key: str):
+        """Stored {"flag": series, "episodes": dataframe} or None.
+
+        An entry that does not load, truncated or written by another
+        pandas version, is removed and counts as a miss.
+        """
+        entry = self._entry(key)
+        try:
+            result = pd.read_pickle(entry)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception:
+            entry.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+        # the modification time is the last use for the LRU order
+        os.utime(entry)
+        self.hits += 1
+        return result
+
+    def put(self, key: str, result: dict):
+        entry = self._entry(key)
+        tmp = entry.with_suffix(".tmp")
+        pd.to_pickle(result, tmp)
+        os.replace(tmp, entry)
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until under max_bytes."""
+        entries = []
+        for entry in self.path.glob("*.pkl"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self):
+        for entry in self.path.glob("*.pkl"):
+            entry.unlink(missing_ok=True)
+
+    def _compute(self, fault, df: pd.DataFrame) -> dict:
+        flag, _, _ = fault._evaluate(df)
+        return {"flag": flag,
+                "episodes": to_episodes(flag, period=fault.episode_period())}
+
+    def evaluate(self, config, df: pd.DataFrame) -> dict:
+        """Flag name to {"flag", "episodes"} of every configured fault."""
+        faults = build_faults(config)
+        reject_devices(faults)
+        index_fp = index_fingerprint(df.index)
+        columns = {}
+
+        results = {}
+        for fault in faults.values():
+            for col in fault.columns():
+                if col not in columns:
+                    columns[col] = column_fingerprint(df, col)
+            key = self.key(fault, _hash(
+                index_fp, *(columns[col] for col in fault.columns())))
+
+            result = self.get(key)
+            if result is None:
+                result = self._compute(fault, df)
+                self.put(key, result)
+            results[fault.flag_col] = result
+        return results
+
+    def evaluate_file(self, config, path, **kwargs) -> dict:
+        """evaluate() of a trend log file, hits do not read the file.
+
+        Misses load only the columns of the missed faults with
+        faults.loader.load_trend_log(path, faults, **kwargs).
+        """
+        faults = build_faults(config)
+        reject_devices(faults)
+        file_fp = file_fingerprint(path, **kwargs)
+
+        results, missed = {}, {}
+        for fault in faults.values():
+            key = self.key(fault, file_fp)
+            results[fault.flag_col] = self.get(key)
+            if results[fault.flag_col] is None:
+                missed[key] = fault
+
+        if missed:
+            df = load_trend_log(path, list(missed.values()), **kwargs)
+            for key, fault in missed.items():
+                result = self._compute(fault, df)
+                self.put(key, result)
+                results[fault.flag_col] = result
+        return results
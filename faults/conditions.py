@@ -0,0 +1,794 @@
+import numpy as np
+import pandas as pd
+import pandas.api.types as pdtypes
+
+from faults import kernels
+from faults.cycling import cycle_counts, cycling_flag
+from faults.episodes import to_episodes
+from faults.instrument import phase
+from faults.persistence import persist_flag
+
+
+class HelperUtils():
+    def float_check_err(self, col):
+        err_str = " column failed with a check that the data is a float"
+        return str(col) + err_str
+
+    def float_max_check_err(self, col):
+        err_str = " column failed with a check that the data is a float between 0.0 and 1.0"
+        return str(col) + err_str
+
+    def int_check_err(self, col):
+        err_str = " column failed with a check that the data is type int"
+        return str(col) + err_str
+
+    def int_max_check_err(self, col):
+        err_str = " column failed with a check that the status data for a motor or isolation valve is an int between 0 and 1"
+        return str(col) + err_str
+
+    def isfloat(self, num):
+        try:
+            float(num)
+            return True
+        except:
+            return False
+
+    def isLessThanOnePointOne(self, num):
+        try:
+            if num <= 1.0:
+                return True
+        except:
+            return False
+
+
+HELPER_UTILS = HelperUtils()
+
+
+def expand_checks(checks: list) -> list:
+    """The checks with the device column lists split into one per column."""
+    return [(kind, one) for kind, col in checks
+            for one in (col if isinstance(col, tuple) else (col,))]
+
+
+def check_columns(df: pd.DataFrame, checks: list, stats: dict = None):
+    """Raise a TypeError for the first column failing its data check.
+
+    checks are ("float" | "int" | "int_only", col), "float" is an analog
+    output between 0.0 and 1.0, "int" a status point of 0 or 1 and
+    "int_only" any int like a boiler stage. Column stats passed in from
+    validate_plant_schema() are used instead of scanning the data.
+    """
+    for kind, col in expand_checks(checks):
+        col_stats = stats.get(col) if stats else None
+        if col_stats is None:
+            dtype, col_max = df[col].dtype, None
+        else:
+            dtype, col_max = col_stats.dtype, col_stats.max
+
+        if kind == "float":
+            # check analog ouputs [data with units of %] are floats only
+            if not pdtypes.is_float_dtype(dtype):
+                raise TypeError(HELPER_UTILS.float_check_err(col))
+
+            if col_max is None:
+                col_max = df[col].max()
+            if col_max > 1.0:
+                raise TypeError(HELPER_UTILS.float_max_check_err(col))
+
+        else:
+            # check if motor status is an int only
+            if not pdtypes.is_integer_dtype(dtype):
+                raise TypeError(HELPER_UTILS.int_check_err(col))
+
+            if kind == "int":
+                if col_max is None:
+                    col_max = df[col].max()
+                if col_max > 1:
+                    raise TypeError(HELPER_UTILS.int_max_check_err(col))
+
+
+class FaultCondition:
+    """Shared apply and evaluate for the fault conditions below.
+
+    Subclasses set flag_col and implement checks() and kernel_masks(),
+    kernel_masks() runs the NumPy kernel of the fault on a dict of column
+    arrays and returns the boolean checks AND'ed into the flag.
+    """
+
+    flag_col = None
+    # faults.instrument.Instrument timing each phase, None is off
+    instrument = None
+    # how long the fault has to persist before it is reported and has
+    # to be gone before it clears, see faults.persistence.persist_flag()
+    persist = None
+    clear = None
+    # dtype of the flag column apply() writes, np.uint8 or bool keep
+    # results 8x smaller than the default int64
+    flag_dtype = int
+
+    def _phase(self, name: str, df: pd.DataFrame):
+        return phase(self.instrument, self.flag_col[:-5], name, len(df))
+
+    def __setattr__(self, name, value):
+        # a list of columns, one per boiler or pump, is kept as a tuple
+        # which is also the key of its 2-D array in column_arrays()
+        if name.endswith("_col") and isinstance(value, list):
+            value = tuple(value)
+        super().__setattr__(name, value)
+
+    def checks(self) -> list:
+        """Column data checks, see check_columns()."""
+        return []
+
+    def columns(self) -> list:
+        """Every dataframe column the fault reads, the *_col arguments."""
+        cols = []
+        for name, value in vars(self).items():
+            if name.endswith("_col"):
+                for col in value if isinstance(value, tuple) else (value,):
+                    if col not in cols:
+                        cols.append(col)
+        return cols
+
+    def devices(self) -> list:
+        """Device names when *_col arguments are lists of columns, else None.
+
+        The devices are named by the columns of the first list argument.
+        """
+        for name, value in vars(self).items():
+            if name.endswith("_col") and isinstance(value, tuple):
+                return list(value)
+        return None
+
+    def flag_columns(self) -> list:
+        """flag_col, or one flag_col_<device> per device."""
+        devices = self.devices()
+        if devices is None:
+            return [self.flag_col]
+        return [f"{self.flag_col}_{device}" for device in devices]
+
+    def column_arrays(self, df: pd.DataFrame) -> dict:
+        """Column (or tuple of device columns) to its NumPy array.
+
+        With devices every array is devices by samples: the device columns
+        stacked and the shared columns broadcast without a copy, so the
+        kernels flag every device in one 2-D operation.
+        """
+        devices = self.devices()
+        if devices is None:
+            return {col: df[col].to_numpy() for col in self.columns()}
+
+        shape = (len(devices), len(df))
+        arrays = {}
+        for name, value in vars(self).items():
+            if not name.endswith("_col"):
+                continue
+            if isinstance(value, tuple):
+                if len(value) != len(devices):
+                    raise ValueError(
+                        f"{name} has {len(value)} columns for "
+                        f"{len(devices)} devices")
+                arrays[value] = np.stack([df[col].to_numpy() for col in value])
+            else:
+                arrays[value] = np.broadcast_to(df[value].to_numpy(), shape)
+        return arrays
+
+    def kernel_masks(self, arrays: dict, work=None) -> dict:
+        raise NotImplementedError
+
+    def helper_masks(self, df: pd.DataFrame) -> dict:
+        return self.kernel_masks(self.column_arrays(df))
+
+    def _device_frame(self, arrays: dict, index, names=None) -> pd.DataFrame:
+        # name to devices by samples array -> one column per device
+        devices = self.devices()
+        return pd.DataFrame(
+            {f"{name}_{device}": row
+             for name, array in arrays.items()
+             for device, row in zip(devices, np.broadcast_to(
+                 array, (len(devices), len(index))))},
+            index=index)
+
+    def flag_array(self, arrays: dict, out=None, work=None) -> np.ndarray:
+        """The boolean flag from a dict of column name to NumPy array.
+
+        No pandas and no column checks, with a kernels.Workspace and an
+        out array nothing is allocated on repeat calls of the same length.
+        """
+        return kernels.all_of(self.kernel_masks(arrays, work).values(), out)
+
+    def validate(self, df: pd.DataFrame, stats: dict = None):
+        check_columns(df, self.checks(), stats)
+
+    def _evaluate(self, df: pd.DataFrame, state=None, stats=None):
+        # returns the flag, helper frame and the persistence state to
+        # carry into the next chunk of the same trend log
+        with self._phase("validate", df):
+            self.validate(df, stats)
+        with self._phase("masks", df):
+            masks = self.helper_masks(df)
+
+        with self._phase("flag", df):
+            flag = kernels.all_of(masks.values())
+        if self.devices() is not None:
+            return self._device_flags(df, flag, masks, state)
+        if self.persist is not None:
+            with self._phase("persist", df):
+                flag, state = persist_flag(
+                    flag, df.index, self.persist, self.clear, state)
+
+        flag = pd.Series(flag.view(np.uint8), index=df.index,
+                         name=self.flag_col)
+        return flag, pd.DataFrame(masks, index=df.index), state
+
+    def _device_flags(self, df: pd.DataFrame, flag, masks, state):
+        # flag is devices by samples, persist runs per device with a
+        # list of states
+        flag = flag.view(np.uint8)
+        if self.persist is not None:
+            with self._phase("persist", df):
+                state = state or [None] * len(flag)
+                persisted = [persist_flag(row, df.index, self.persist,
+                                          self.clear, row_state)
+                             for row, row_state in zip(flag, state)]
+                flag = np.stack([row for row, _ in persisted])
+                state = [row_state for _, row_state in persisted]
+
+        flags = pd.DataFrame(flag.T, index=df.index,
+                             columns=self.flag_columns())
+        return flags, self._device_frame(masks, df.index), state
+
+    def evaluate(self, df: pd.DataFrame, stats: dict = None):
+        """Compute the fault flag without writing into df.
+
+        Returns the flag as a uint8 series on the df index, or when
+        troubleshoot is enabled a dataframe of the helper masks and flag.
+        With persist set the flag is only 1 once the fault lasted persist.
+        With lists of device columns the flags are a dataframe with one
+        flag_col_<device> column per device. stats returned by
+        faults.plant.validate_plant_schema(df, ...) skip the column scans
+        of the checks, they are not checked against df again.
+        """
+        flag, helpers, _ = self._evaluate(df, stats=stats)
+
+        if self.troubleshoot:
+            if isinstance(flag, pd.Series):
+                flag = flag.to_frame()
+            for col in flag.columns:
+                helpers[col] = flag[col]
+            return helpers
+        return flag
+
+    def episode_period(self):
+        """Length of one flag sample, None infers it from the data."""
+        return None
+
+    def episodes(self, df: pd.DataFrame, min_duration=None,
+                 stats: dict = None) -> pd.DataFrame:
+        """Fault episodes with start, end, duration and samples.
+
+        The run-length encoded flag instead of one value per row, see
+        faults.episodes.to_episodes().
+        """
+        flag, _, _ = self._evaluate(df, stats=stats)
+        if isinstance(flag, pd.Series):
+            return to_episodes(flag, min_duration, self.episode_period())
+
+        # one set of episodes per device flag
+        frames = []
+        for col in flag.columns:
+            episodes = to_episodes(
+                flag[col], min_duration, self.episode_period())
+            episodes.insert(0, "flag", col)
+            frames.append(episodes)
+        return pd.concat(frames, ignore_index=True)
+
+    def apply(self, df: pd.DataFrame, stats: dict = None) -> pd.DataFrame:
+        result = self.evaluate(df, stats)
+
+        with self._phase("assign", df):
+            if self.troubleshoot:
+                print("Troubleshoot mode enabled - not removing helper columns")
+                for col in result.columns:
+                    df[col] = result[col]
+            elif isinstance(result, pd.Series):
+                result = result.to_frame()
+
+            for col in self.flag_columns():
+                df[col] = result[col].astype(self.flag_dtype)
+
+        return df
+
+
+class CyclingFaultCondition(FaultCondition):
+    """Shared apply and evaluate for the cycling faults FC12 - FC14.
+
+    kernel_masks() returns the modes whose starts are counted per window
+    and os_max is the most starts allowed in a window.
+    """
+
+    os_max = None
+
+    def _evaluate(self, df: pd.DataFrame, state=None, stats=None):
+        with self._phase("validate", df):
+            self.validate(df, stats)
+        with self._phase("masks", df):
+            masks = self.helper_masks(df)
+
+        with self._phase("resample", df):
+            if self.devices() is None:
+                counts = cycle_counts(df.index, masks, self.window)
+                flag = cycling_flag(counts, self.os_max, self.flag_col)
+                return flag.astype(np.uint8), counts, None
+
+            # starts of every mode of every device per window, a device
+            # is flagged by its own modes
+            counts = cycle_counts(
+                df.index, self._device_frame(masks, df.index), self.window)
+            flag = pd.DataFrame({
+                col: cycling_flag(counts[[f"{name}_{device}"
+                                          for name in masks]],
+                                  self.os_max, col)
+                for device, col in zip(self.devices(), self.flag_columns())
+            }).astype(np.uint8)
+        return flag, counts, None
+
+    def evaluate(self, df: pd.DataFrame, stats: dict = None):
+        """Count starts per window without writing into df.
+
+        Returns the flag as a uint8 series per window, or when
+        troubleshoot is enabled a dataframe of the counts and flag.
+        """
+        return super().evaluate(df, stats)
+
+    def episode_period(self):
+        return self.window
+
+    def apply(self, df: pd.DataFrame, stats: dict = None) -> pd.DataFrame:
+        result = self.evaluate(df, stats)
+
+        with self._phase("assign", df):
+            if self.troubleshoot:
+                print("Troubleshoot mode enabled - not removing helper columns")
+
+            elif isinstance(result, pd.Series):
+                result = result.to_frame()
+
+            for col in self.flag_columns():
+                result[col] = result[col].astype(self.flag_dtype)
+        return result
+
+
+class FaultConditionOne(FaultCondition):
+    """OS1 - Diff pressure too high with pumps off"""
+
+    flag_col = "fc1_flag"
+
+    def __init__(
+        self,
+        pump_diff_press_err_thres: float,
+        pump_diff_press_col: str,
+        pump_status_bool_col: str,
+        pump_diff_press_setpoint_col: str,
+        troubleshoot=False,
+        persist: str = None,
+        clear: str = None
+    ):
+        self.pump_diff_press_err_thres = pump_diff_press_err_thres
+        self.pump_diff_press_col = pump_diff_press_col
+        self.pump_status_bool_col = pump_status_bool_col
+        self.pump_diff_press_setpoint_col = pump_diff_press_setpoint_col
+        self.persist = persist
+        self.clear = clear
+        self.troubleshoot = troubleshoot
+
+    def checks(self) -> list:
+        return [("int", self.pump_status_bool_col)]
+
+    def kernel_masks(self, arrays: dict, work=None) -> dict:
+        return kernels.fc1(
+            arrays[self.pump_diff_press_col],
+            arrays[self.pump_diff_press_setpoint_col],
+            arrays[self.pump_status_bool_col],
+            self.pump_diff_press_err_thres, work)
+
+
+class FaultConditionTwo(FaultCondition):
+    """OS1 - Flow meter when PRIMARY pumps are off should be zero"""
+
+    flag_col = "fc2_flag"
+
+    def __init__(
+        self,
+        flow_meter_err_thres: float,
+        flow_meter_col: str,
+        pump_status_bool_col: str,
+        troubleshoot=False,
+        persist: str = None,
+        clear: str = None
+    ):
+        self.flow_meter_err_thres = flow_meter_err_thres
+        self.flow_meter_col = flow_meter_col
+        self.pump_status_bool_col = pump_status_bool_col
+        self.persist = persist
+        self.clear = clear
+        self.troubleshoot = troubleshoot
+
+    def checks(self) -> list:
+        return [("int", self.pump_status_bool_col)]
+
+    def kernel_masks(self, arrays: dict, work=None) -> dict:
+        return kernels.fc2(
+            arrays[self.flow_meter_col],
+            arrays[self.pump_status_bool_col],
+            self.flow_meter_err_thres, work, self.flag_col[:-5])
+
+
+class FaultConditionThree(FaultConditionTwo):
+    """OS1 - Flow meter when SECONDARY pumps are off should be zero"""
+
+    flag_col = "fc3_flag"
+
+
+class FaultConditionFour(FaultCondition):
+    """OS2,3 - Pumps not making DP setpoint"""
+
+    flag_col = "fc4_flag"
+
+    def __init__(
+        self,
+        vfd_speed_percent_err_thres: float,
+        vfd_speed_percent_max: float,
+        pump_diff_press_err_thres: float,
+        pump_diff_press_col: str,
+        pump_vfd_speed_col: str,
+        pump_diff_press_setpoint_col: str,
+        troubleshoot=False,
+        persist: str = None,
+        clear: str = None
+    ):
+        self.vfd_speed_percent_err_thres = vfd_speed_percent_err_thres
+        self.vfd_speed_percent_max = vfd_speed_percent_max
+        self.pump_diff_press_err_thres = pump_diff_press_err_thres
+        self.pump_diff_press_col = pump_diff_press_col
+        self.pump_vfd_speed_col = pump_vfd_speed_col
+        self.pump_diff_press_setpoint_col = pump_diff_press_setpoint_col
+        self.persist = persist
+        self.clear = clear
+        self.troubleshoot = troubleshoot
+
+    def checks(self) -> list:
+        return [("float", self.pump_vfd_speed_col)]
+
+    def kernel_masks(self, arrays: dict, work=None) -> dict:
+        return kernels.fc4(
+            arrays[self.pump_diff_press_col],
+            arrays[self.pump_diff_press_setpoint_col],
+            arrays[self.pump_vfd_speed_col],
+            self.pump_diff_press_err_thres,
+            self.vfd_speed_percent_max - self.vfd_speed_percent_err_thres, work)
+
+
+class FaultConditionFive(FaultCondition):
+    """OS2,3 - Flow meter when SECONDARY pumps are off should be zero"""
+
+    flag_col = "fc5_flag"
+
+    def __init__(
+        self,
+        flow_meter_err_thres: float,
+        hot_water_min_flow_stp: float,
+        hot_water_bypass_vlv_err_thres: float,
+        flow_meter_col: str,
+        hot_water_bypass_vlv_cmd_col: str,
+        pump_status_bool_col: str,
+        troubleshoot=False,
+        persist: str = None,
+        clear: str = None
+    ):
+        self.flow_meter_err_thres = flow_meter_err_thres
+        self.hot_water_min_flow_stp = hot_water_min_flow_stp
+        self.hot_water_bypass_vlv_err_thres = hot_water_bypass_vlv_err_thres
+        self.flow_meter_col = flow_meter_col
+        self.hot_water_bypass_vlv_cmd_col = hot_water_bypass_vlv_cmd_col
+        self.pump_status_bool_col = pump_status_bool_col
+        self.persist = persist
+        self.clear = clear
+        self.troubleshoot = troubleshoot
+
+    def checks(self) -> list:
+        return [("int", self.pump_status_bool_col),
+                ("float", self.hot_water_bypass_vlv_cmd_col)]
+
+    def kernel_masks(self, arrays: dict, work=None) -> dict:
+        return kernels.fc5(
+            arrays[self.flow_meter_col],
+            arrays[self.hot_water_bypass_vlv_cmd_col],
+            arrays[self.pump_status_bool_col],
+            self.hot_water_min_flow_stp - self.flow_meter_err_thres,
+            .99 - self.hot_water_bypass_vlv_err_thres, work)
+
+
+class FaultConditionSix(FaultCondition):
+    """OS2,3 - Hot water system not meeting supply setpoint"""
+
+    flag_col = "fc6_flag"
+
+    def __init__(
+        self,
+        hot_water_temp_err_thres: float,
+        hot_water_supply_temp_col: str,
+        hot_water_supply_temp_spt_col: str,
+        pump_status_bool_col: str,
+        troubleshoot=False,
+        persist: str = None,
+        clear: str = None
+    ):
+        self.hot_water_temp_err_thres = hot_water_temp_err_thres
+        self.hot_water_supply_temp_col = hot_water_supply_temp_col
+        self.hot_water_supply_temp_spt_col = hot_water_supply_temp_spt_col
+        self.pump_status_bool_col = pump_status_bool_col
+        self.persist = persist
+        self.clear = clear
+        self.troubleshoot = troubleshoot
+
+    def checks(self) -> list:
+        return [("int", self.pump_status_bool_col)]
+
+    def kernel_masks(self, arrays: dict, work=None) -> dict:
+        return kernels.fc6(
+            arrays[self.hot_water_supply_temp_col],
+            arrays[self.hot_water_supply_temp_spt_col],
+            arrays[self.pump_status_bool_col],
+            self.hot_water_temp_err_thres, work)
+
+
+class FaultConditionSeven(FaultCondition):
+    """OS1,2,3 - Hot water system static/gauge pressure low"""
+
+    flag_col = "fc7_flag"
+
+    def __init__(
+        self,
+        expansion_tank_press_stp: float,
+        hot_water_sys_gauge_pres_col: str,
+        pump_status_bool_col: str,
+        troubleshoot=False,
+        persist: str = None,
+        clear: str = None
+    ):
+        self.expansion_tank_press_stp = expansion_tank_press_stp
+        self.hot_water_sys_gauge_pres_col = hot_water_sys_gauge_pres_col
+        self.pump_status_bool_col = pump_status_bool_col
+        self.persist = persist
+        self.clear = clear
+        self.troubleshoot = troubleshoot
+
+    def checks(self) -> list:
+        return [("int", self.pump_status_bool_col)]
+
+    def kernel_masks(self, arrays: dict, work=None) -> dict:
+        return kernels.fc7(
+            arrays[self.hot_water_sys_gauge_pres_col],
+            arrays[self.pump_status_bool_col],
+            self.expansion_tank_press_stp * .9, work)
+
+
+class FaultConditionEight(FaultCondition):
+    """OS2,3 - Hot return temp too high for a condensing boiler to achieve high efficiency"""
+
+    flag_col = "fc8_flag"
+
+    def __init__(
+        self,
+        hot_water_temp_err_thres: float,
+        boiler_condensing_temp: float,
+        hot_water_return_temp_col: str,
+        pump_status_bool_col: str,
+        troubleshoot=False,
+        persist: str = None,
+        clear: str = None
+    ):
+        self.hot_water_temp_err_thres = hot_water_temp_err_thres
+        self.boiler_condensing_temp = boiler_condensing_temp
+        self.hot_water_return_temp_col = hot_water_return_temp_col
+        self.pump_status_bool_col = pump_status_bool_col
+        self.persist = persist
+        self.clear = clear
+        self.troubleshoot = troubleshoot
+
+    def checks(self) -> list:
+        return [("int", self.pump_status_bool_col)]
+
+    def kernel_masks(self, arrays: dict, work=None) -> dict:
+        return kernels.fc8(
+            arrays[self.hot_water_return_temp_col],
+            arrays[self.pump_status_bool_col],
+            self.hot_water_temp_err_thres, self.boiler_condensing_temp, work)
+
+
+class FaultConditionNine(FaultConditionEight):
+    """OS2,3 - Hot return temp too low for a NON condensing boiler, it will damage heat exchanger"""
+
+    flag_col = "fc9_flag"
+
+    def kernel_masks(self, arrays: dict, work=None) -> dict:
+        return kernels.fc9(
+            arrays[self.hot_water_return_temp_col],
+            arrays[self.pump_status_bool_col],
+            self.hot_water_temp_err_thres, self.boiler_condensing_temp, work)
+
+
+class FaultConditionTen(FaultCondition):
+    """OS2 - Boiler leaving temp and hot water sys
+    common hw water plant header temp mismatch
+    """
+
+    flag_col = "fc10_flag"
+
+    def __init__(
+        self,
+        hot_water_temp_err_thres: float,
+        flow_meter_col: str,
+        boiler_leaving_temp_col: str,
+        hot_water_supply_temp_col: str,
+        boiler_status_bool_col: str,
+        troubleshoot=False,
+        persist: str = None,
+        clear: str = None
+    ):
+        self.hot_water_temp_err_thres = hot_water_temp_err_thres
+        self.flow_meter_col = flow_meter_col
+        self.boiler_leaving_temp_col = boiler_leaving_temp_col
+        self.hot_water_supply_temp_col = hot_water_supply_temp_col
+        self.boiler_status_bool_col = boiler_status_bool_col
+        self.persist = persist
+        self.clear = clear
+        self.troubleshoot = troubleshoot
+
+    def checks(self) -> list:
+        return [("int", self.boiler_status_bool_col)]
+
+    def kernel_masks(self, arrays: dict, work=None) -> dict:
+        return kernels.fc10(
+            arrays[self.flow_meter_col],
+            arrays[self.boiler_leaving_temp_col],
+            arrays[self.hot_water_supply_temp_col],
+            arrays[self.boiler_status_bool_col],
+            self.hot_water_temp_err_thres, work, "fc10",
+            weighted=isinstance(self.flow_meter_col, tuple))
+
+
+class FaultConditionEleven(FaultCondition):
+    """OS2 - Boiler enter temp and hot water sys
+    common hw water plant header temp mismatch
+    """
+
+    flag_col = "fc11_flag"
+
+    def __init__(
+        self,
+        hot_water_temp_err_thres: float,
+        flow_meter_col: str,
+        boiler_enter_temp_col: str,
+        hot_water_return_temp_col: str,
+        boiler_status_bool_col: str,
+        troubleshoot=False,
+        persist: str = None,
+        clear: str = None
+    ):
+        self.hot_water_temp_err_thres = hot_water_temp_err_thres
+        self.flow_meter_col = flow_meter_col
+        self.boiler_enter_temp_col = boiler_enter_temp_col
+        self.hot_water_return_temp_col = hot_water_return_temp_col
+        self.boiler_status_bool_col = boiler_status_bool_col
+        self.persist = persist
+        self.clear = clear
+        self.troubleshoot = troubleshoot
+
+    def checks(self) -> list:
+        return [("int", self.boiler_status_bool_col)]
+
+    def kernel_masks(self, arrays: dict, work=None) -> dict:
+        return kernels.fc10(
+            arrays[self.flow_meter_col],
+            arrays[self.boiler_enter_temp_col],
+            arrays[self.hot_water_return_temp_col],
+            arrays[self.boiler_status_bool_col],
+            self.hot_water_temp_err_thres, work, "fc11",
+            weighted=isinstance(self.flow_meter_col, tuple))
+
+
+class FaultConditionTwelve(CyclingFaultCondition):
+    """OS1,2,3: Excessive Entire Plant Cycling.
+    Based on building loop or secondary pumps turning off and on
+    """
+
+    flag_col = "fc12_flag"
+
+    def __init__(
+        self,
+        plant_os_max: int,
+        pump_vfd_speed_col: str,
+        troubleshoot=False,
+        window: str = "h"
+    ):
+        self.plant_os_max = plant_os_max
+        self.pump_vfd_speed_col = pump_vfd_speed_col
+        self.window = window
+        self.troubleshoot = troubleshoot
+
+    @property
+    def os_max(self):
+        return self.plant_os_max
+
+    def checks(self) -> list:
+        return [("float", self.pump_vfd_speed_col)]
+
+    # pump starts and stops are counted per window
+    def kernel_masks(self, arrays: dict, work=None) -> dict:
+        return kernels.fc12(arrays[self.pump_vfd_speed_col], work)
+
+
+class FaultConditionThirteen(CyclingFaultCondition):
+    """OS2,3: Excessive individual boiler cycling ON and OFF.
+    Try and capture boiler itself or boiler circ pump.
+    Assumption is the building loop or secondary is running.
+    """
+
+    flag_col = "fc13_flag"
+
+    def __init__(
+        self,
+        boiler_os_max: int,
+        boiler_status_bool_col: str,
+        troubleshoot=False,
+        window: str = "h"
+    ):
+        self.boiler_os_max = boiler_os_max
+        self.boiler_status_bool_col = boiler_status_bool_col
+        self.window = window
+        self.troubleshoot = troubleshoot
+
+    @property
+    def os_max(self):
+        return self.boiler_os_max
+
+    def checks(self) -> list:
+        return [("int", self.boiler_status_bool_col)]
+
+    # boiler starts and stops are counted per window
+    def kernel_masks(self, arrays: dict, work=None) -> dict:
+        return kernels.fc13(arrays[self.boiler_status_bool_col], work)
+
+
+class FaultConditionFourteen(CyclingFaultCondition):
+    """OS 1,2,3: Excessive boiler staging. Stage number most likely
+    a boiler integration represented as an int like stage 1,2,3,4
+    """
+
+    flag_col = "fc14_flag"
+
+    def __init__(
+        self,
+        boiler_stage_os_max: int,
+        boiler_stage_int_col: str,
+        troubleshoot=False,
+        window: str = "h"
+    ):
+        self.boiler_stage_os_max = boiler_stage_os_max
+        self.boiler_stage_int_col = boiler_stage_int_col
+        self.window = window
+        self.troubleshoot = troubleshoot
+
+    @property
+    def os_max(self):
+        return self.boiler_stage_os_max
+
+    def checks(self) -> list:
+        return [("int_only", self.boiler_stage_int_col)]
+
+    # boiler stage changes against the previous sample are counted
+    # per window, the first sample has no change
+    def kernel_masks(self, arrays: dict, work=None) -> dict:
+        return kernels.fc14(arrays[self.boiler_stage_int_col], work)
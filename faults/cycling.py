@@ -0,0 +1,261 @@
+from importlib.util import find_spec
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+
+# optional, the window counts fall back to NumPy. numba is imported on
+# the first compiled count, not with this module
+HAVE_NUMBA = find_spec("numba") is not None
+
+
+def window_step(window="h") -> int:
+    """Length of a fixed time window in nanoseconds."""
+    step = to_offset(window).nanos
+    if step <= 0:
+        raise ValueError(f"window must be a positive length not {window!r}")
+    return step
+
+
+_DAY = 86400 * 10**9
+
+
+def _is_calendar(index: pd.DatetimeIndex, step: int) -> bool:
+    # day long windows on a tz aware index follow the local calendar
+    # like resample does, shorter windows are fixed lengths of time
+    return index.tz is not None and step % _DAY == 0
+
+
+def _stamps(index: pd.DatetimeIndex, calendar: bool) -> np.ndarray:
+    if calendar:
+        index = index.tz_localize(None)
+    return index.as_unit("ns").asi8
+
+
+def window_bins(index: pd.DatetimeIndex, window="h", origin=None):
+    """Bin a sorted datetime index into fixed time windows.
+
+    Windows are anchored on midnight of the first day like
+    df.resample(window) so hourly, 15 minute and daily buckets line up
+    with the pandas results, or on origin when given. Returns the window
+    number of each sample counted from the first window, and the first
+    window start.
+    """
+    index = pd.DatetimeIndex(index)
+    if not len(index):
+        window_step(window)
+        return np.zeros(0, dtype=np.int64), None
+
+    counter = CycleCounter(window, origin)
+    bins = counter.bins(index)
+    first = bins[0]
+    return bins - first, counter.window_starts(first, 1)[0]
+
+
+def rising_edges(mode: np.ndarray, bins: np.ndarray = None) -> np.ndarray:
+    """True where a 0/1 mode turns on.
+
+    The first sample of every window counts as an edge when the mode is
+    on, same as counting x.eq(1) & x.shift().ne(1) inside each bucket.
+    """
+    mode = np.asarray(mode, dtype=bool)
+    edges = mode.copy()
+    if len(mode) > 1:
+        prev_off = ~mode[:-1]
+        if bins is not None:
+            prev_off |= bins[1:] != bins[:-1]
+        edges[1:] &= prev_off
+    return edges
+
+
+def _count_starts(stamps, origin, step, mode, first_bin, n_bins,
+                  prev_bin, prev_mode):
+    # edge detection, window number and count in one loop over the
+    # time ordered samples, no bins or edges arrays. The window is only
+    # divided out when a sample crosses into the next one. prev_bin and
+    # prev_mode are the window and mode of the sample before the first
+    counts = np.zeros(n_bins, dtype=np.int64)
+    b = prev_bin
+    end = origin + (b + 1) * step
+    for i in range(len(stamps)):
+        if stamps[i] >= end:
+            b = (stamps[i] - origin) // step
+            end = origin + (b + 1) * step
+        on = mode[i] != 0
+        if on and (not prev_mode or b != prev_bin):
+            counts[b - first_bin] += 1
+        prev_mode = on
+        prev_bin = b
+    return counts
+
+
+_count_starts_jit = None
+
+
+def _compiled():
+    # _count_starts compiled on first use, None when numba does not import
+    global _count_starts_jit
+    if _count_starts_jit is None:
+        try:
+            from numba import njit
+        except ImportError:
+            return None
+        _count_starts_jit = njit(cache=True, nogil=True)(_count_starts)
+    return _count_starts_jit
+
+
+BACKENDS = ("numpy", "numba")
+_backend = "numba" if HAVE_NUMBA else "numpy"
+
+
+def get_backend() -> str:
+    return _backend
+
+
+def set_backend(name: str) -> str:
+    """Count cycles with "numba" (when installed) or "numpy".
+
+    numba compiles the edge detection and window counting into one pass
+    over the samples, it is the default when numba is installed. Returns
+    the backend in use before.
+    """
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"backend must be one of {BACKENDS} not {name!r}")
+    if name == "numba" and _compiled() is None:
+        raise ImportError("the numba backend needs numba installed")
+    previous, _backend = _backend, name
+    return previous
+
+
+class CycleCounter:
+    """Cycle counts over time ordered chunks of one long series.
+
+    Carries the last sample of every mode and the counts of the window
+    still open between chunks, so update() on each chunk plus a final
+    flush() gives the same counts as cycle_counts() on the whole series.
+    """
+
+    def __init__(self, window="h", origin=None):
+        self.window = window
+        self.step = window_step(window)
+        self.origin = None if origin is None else pd.Timestamp(origin)
+        self.unit = None
+        self.open_bin = None
+        self.open_counts = {}
+        self.last_modes = {}
+
+    def stamps(self, index: pd.DatetimeIndex) -> tuple:
+        """Nanosecond stamps of the samples and of the origin."""
+        if self.origin is None:
+            self.origin = index[0].normalize()
+        if self.unit is None:
+            self.unit = index.unit
+
+        calendar = _is_calendar(index, self.step)
+        origin = pd.DatetimeIndex([self.origin])
+        return _stamps(index, calendar), _stamps(origin, calendar)[0]
+
+    def bins(self, index: pd.DatetimeIndex) -> np.ndarray:
+        """Window number of every sample counted from the origin."""
+        stamps, origin = self.stamps(index)
+        return (stamps - origin) // self.step
+
+    def window_starts(self, first_bin, periods) -> pd.DatetimeIndex:
+        origin = pd.DatetimeIndex([self.origin])
+        offset = pd.Timedelta(int(first_bin * self.step), unit="ns")
+        if _is_calendar(origin, self.step):
+            start = self.origin.tz_localize(None) + offset
+            return pd.date_range(
+                start, periods=periods, freq=self.window, unit=self.unit,
+            ).tz_localize(self.origin.tz, ambiguous=True,
+                          nonexistent="shift_forward")
+        return pd.date_range(self.origin + offset, periods=periods,
+                             freq=self.window, unit=self.unit)
+
+    def update(self, index: pd.DatetimeIndex, modes: dict) -> pd.DataFrame:
+        """Add the next chunk, returns the counts of the windows it closed."""
+        index = pd.DatetimeIndex(index)
+        if not len(index):
+            return pd.DataFrame(
+                {name: np.zeros(0, dtype=np.int64) for name in modes},
+                index=index)
+        if not index.is_monotonic_increasing:
+            raise ValueError("cycle counts need a time sorted index, "
+                             "sort it with df.sort_index() first")
+
+        stamps, origin = self.stamps(index)
+        sample_bin = (stamps[0] - origin) // self.step
+        last_bin = (stamps[-1] - origin) // self.step
+        if self.open_bin is not None and sample_bin < self.open_bin:
+            raise ValueError("chunk starts before the window the previous "
+                             "chunk ended in, chunks must be time ordered")
+        first_bin = sample_bin if self.open_bin is None else self.open_bin
+        n_bins = int(last_bin - first_bin) + 1
+        continues_window = self.open_bin == sample_bin
+
+        # numba counts straight from the stamps, numpy needs the bins
+        kernel = _compiled() if _backend == "numba" else None
+        bins = None if kernel is not None else (stamps - origin) // self.step
+
+        counts = {}
+        for name, mode in modes.items():
+            mode = np.asarray(mode, dtype=bool)
+            if kernel is not None:
+                count = kernel(
+                    stamps, origin, self.step, mode.view(np.uint8),
+                    first_bin, n_bins, first_bin - 1 if self.open_bin is None
+                    else self.open_bin, self.last_modes.get(name, False))
+            else:
+                edges = rising_edges(mode, bins)
+                if continues_window and self.last_modes[name]:
+                    edges[0] = False
+                count = np.bincount(bins[edges] - first_bin, minlength=n_bins)
+            count[0] += self.open_counts.get(name, 0)
+            counts[name] = count
+
+            self.open_counts[name] = count[-1]
+            self.last_modes[name] = bool(mode[-1])
+
+        self.open_bin = last_bin
+        return pd.DataFrame(
+            {name: count[:-1] for name, count in counts.items()},
+            index=self.window_starts(first_bin, n_bins - 1))
+
+    def flush(self) -> pd.DataFrame:
+        """Counts of the window still open, call at the end of the series."""
+        if self.open_bin is None:
+            return pd.DataFrame(
+                {name: np.zeros(0, dtype=np.int64) for name in self.open_counts},
+                index=pd.DatetimeIndex([], tz=getattr(self.origin, "tz", None)))
+
+        counts = pd.DataFrame(
+            {name: np.array([count], dtype=np.int64)
+             for name, count in self.open_counts.items()},
+            index=self.window_starts(self.open_bin, 1))
+        self.open_bin = None
+        self.open_counts = {}
+        self.last_modes = {}
+        return counts
+
+
+def cycle_counts(index: pd.DatetimeIndex, modes: dict, window="h") -> pd.DataFrame:
+    """Count the starts of each 0/1 mode per time window.
+
+    One rising edge scan over each mode and an integer bincount on the
+    window numbers, the same counts as
+    df[modes].astype(int).resample(window).apply(
+        lambda x: (x.eq(1) & x.shift().ne(1)).sum())
+    without the python function call per bucket and column.
+    """
+    index = pd.DatetimeIndex(index)
+    counter = CycleCounter(window)
+    closed = counter.update(index, modes)
+    if not len(index):
+        return closed
+    return pd.concat([closed, counter.flush()])
+
+
+def cycling_flag(counts: pd.DataFrame, os_max: int, flag: str) -> pd.Series:
+    """1 for every window where any mode started more than os_max times."""
+    return counts.gt(os_max).any(axis=1).astype(int).rename(flag)
@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+
+
+EPISODE_COLUMNS = ["start", "end", "duration", "samples"]
+
+
+def to_timedelta(value) -> pd.Timedelta:
+    """Timedelta from a Timedelta, "10min" or a bare unit like "h"."""
+    if isinstance(value, str):
+        return pd.Timedelta(to_offset(value).nanos, unit="ns")
+    return pd.Timedelta(value)
+
+
+def sample_period(index: pd.DatetimeIndex, default=None) -> pd.Timedelta:
+    """Sample period of an index, its freq or else the median spacing.
+
+    Fewer than two samples without a freq have no spacing, default is
+    returned for them, or without one a ValueError raised.
+    """
+    if index.freq is not None:
+        return to_timedelta(index.freqstr)
+    if len(index) < 2:
+        if default is None:
+            raise ValueError(
+                f"no sample period in {len(index)} sample(s) without a "
+                "freq, pass the period")
+        return to_timedelta(default)
+    spacing = np.diff(index.as_unit("ns").asi8)
+    return pd.Timedelta(int(np.median(spacing)), unit="ns")
+
+
+def to_episodes(flag: pd.Series, min_duration=None, period=None) -> pd.DataFrame:
+    """Run-length encode a 0/1 fault flag into fault episodes.
+
+    One row per run of consecutive flagged samples with the first and
+    last flagged timestamps, the duration (end - start plus one sample
+    period) and the number of samples. period defaults to the flag index
+    sample period, see sample_period(), episodes shorter than
+    min_duration are dropped.
+    """
+    values = np.asarray(flag.to_numpy(), dtype=bool)
+    index = pd.DatetimeIndex(flag.index)
+
+    # +1 where a run starts, -1 one past where it ends
+    edges = np.diff(np.concatenate(([0], values.view(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1) - 1
+
+    if period is not None:
+        period = to_timedelta(period)
+    elif len(starts):
+        period = sample_period(index)
+    else:
+        # no episodes to give a duration
+        period = pd.Timedelta(0)
+
+    episodes = pd.DataFrame({
+        "start": index[starts],
+        "end": index[ends],
+        "samples": ends - starts + 1,
+    })
+    episodes["duration"] = episodes["end"] - episodes["start"] + period
+    episodes = episodes[EPISODE_COLUMNS]
+
+    if min_duration is not None:
+        episodes = episodes[episodes["duration"] >= to_timedelta(min_duration)]
+        episodes = episodes.reset_index(drop=True)
+    return episodes
+
+
+def from_episodes(episodes: pd.DataFrame, index: pd.DatetimeIndex,
+                  name=None) -> pd.Series:
+    """Expand episodes back to a dense 0/1 flag on index.
+
+    Samples from start through end are flagged, on the index the
+    episodes were encoded from this gives back the original flag.
+    """
+    index = pd.DatetimeIndex(index)
+    first = index.searchsorted(pd.DatetimeIndex(episodes["start"]), side="left")
+    last = index.searchsorted(pd.DatetimeIndex(episodes["end"]), side="right")
+
+    counts = np.zeros(len(index) + 1, dtype=np.int64)
+    np.add.at(counts, first, 1)
+    np.add.at(counts, last, -1)
+    flag = np.cumsum(counts[:-1]) > 0
+    return pd.Series(flag.view(np.uint8), index=index, name=name)
+
+
+def flags_to_episodes(results: dict, min_duration=None,
+                      periods: dict = None) -> pd.DataFrame:
+    """Episodes of every flag series in a results dict with a flag column.
+
+    periods maps flag names to their sample period, like
+    BoilerPlantFaults.episode_periods(), the others are inferred.
+    """
+    periods = periods or {}
+    frames = []
+    for flag, series in results.items():
+        episodes = to_episodes(series, min_duration, periods.get(flag))
+        episodes.insert(0, "flag", flag)
+        frames.append(episodes)
+    if not frames:
+        return pd.DataFrame(columns=["flag"] + EPISODE_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+
+def fault_hours(episodes: pd.DataFrame, freq=None):
+    """Total fault hours of the episodes, or per freq period of the start.
+
+    Works on the episodes only, no pass over the flag samples.
+    """
+    # sum the exact durations first, hours last
+    duration = pd.to_timedelta(episodes["duration"])
+    if freq is None:
+        return duration.sum() / pd.Timedelta(hours=1)
+
+    key = [pd.DatetimeIndex(episodes["start"]).floor(freq).rename("start")]
+    if "flag" in episodes.columns:
+        key.insert(0, episodes["flag"])
+    hours = duration.groupby(key).sum() / pd.Timedelta(hours=1)
+    return hours.rename("fault_hours")
@@ -0,0 +1,206 @@
+import os
+import pickle
+from pathlib import Path
+
+import pandas as pd
+
+from faults.cache import fault_params
+from faults.episodes import (
+    EPISODE_COLUMNS, sample_period, to_episodes, to_timedelta)
+from faults.loader import load_trend_log
+from faults.streaming import StreamingFaults
+
+
+STATE_FILE = "state.pkl"
+EPISODES_FILE = "episodes.csv"
+
+
+class IncrementalFaults:
+    """Fault results of an append only trend log kept up to date run to run.
+
+    path is a directory holding the flags (one csv per flag), the closed
+    episodes and a small state: the StreamingFaults carry (the last sample
+    of FC12 - FC14 and the counts of the open window, the persist state),
+    the open episode of every flag and the last timestamp done. update()
+    evaluates only rows after that timestamp and appends to the files, so
+    a run costs the new rows however long the history is. The flags equal
+    a run over the whole history, the window still open and the open
+    episodes are written once they close. A config that does not match
+    the stored state raises ValueError, reset=True starts over.
+    """
+
+    def __init__(self, config, path, reset: bool = False):
+        self.stream = StreamingFaults(config)
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.params = {fault.flag_col: fault_params(fault)
+                       for fault in self.stream.faults.values()}
+        if reset:
+            self.reset()
+        else:
+            self.load()
+
+    def _start(self):
+        self.stream.reset()
+        self.last = None
+        self.periods = {}
+        self.open_episodes = {}
+        self.sizes = {}
+
+    def load(self):
+        self._start()
+        state_path = self.path / STATE_FILE
+        if not state_path.exists():
+            return
+        with open(state_path, "rb") as f:
+            state = pickle.load(f)
+        if state["params"] != self.params:
+            raise ValueError(
+                f"the faults in {self.path} were run with another config, "
+                "reset=True to start over")
+
+        self.stream.counters = state["counters"]
+        self.stream.last_rows = state["last_rows"]
+        self.stream.persist_states = state["persist_states"]
+        self.last = state["last"]
+        self.periods = state["periods"]
+        self.open_episodes = state["open_episodes"]
+        self.sizes = state["sizes"]
+
+        # a run that died after appending but before saving its state
+        # is cut back off the files
+        for name, size in self.sizes.items():
+            file = self.path / name
+            if file.exists() and file.stat().st_size > size:
+                os.truncate(file, size)
+
+    def save(self):
+        state = {
+            "params": self.params,
+            "counters": self.stream.counters,
+            "last_rows": self.stream.last_rows,
+            "persist_states": self.stream.persist_states,
+            "last": self.last,
+            "periods": self.periods,
+            "open_episodes": self.open_episodes,
+            "sizes": self.sizes,
+        }
+        tmp = self.path / (STATE_FILE + ".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(state, f)
+        os.replace(tmp, self.path / STATE_FILE)
+
+    def reset(self):
+        """Delete the stored results and state."""
+        for file in self.path.glob("*_flag.csv"):
+            file.unlink()
+        for name in (EPISODES_FILE, STATE_FILE):
+            (self.path / name).unlink(missing_ok=True)
+        self._start()
+
+    def _append(self, name: str, df: pd.DataFrame, **kwargs):
+        file = self.path / name
+        header = not file.exists() or file.stat().st_size == 0
+        df.to_csv(file, mode="a", header=header, **kwargs)
+        self.sizes[name] = file.stat().st_size
+
+    def _episodes(self, flag: str, series: pd.Series) -> pd.DataFrame:
+        # episodes of the new flags with the open one carried in front,
+        # returns the closed ones and keeps the last if it is still open
+        period = self.periods.get(flag)
+        if period is None:
+            fault = self.stream.faults[flag[:-len("_flag")]]
+            window = fault.episode_period()
+            # a single first row has no spacing yet, its open episode
+            # gets its duration again once the period is inferred
+            period = to_timedelta(window) if window is not None else \
+                sample_period(pd.DatetimeIndex(series.index),
+                              default=pd.Timedelta(0))
+            if period > pd.Timedelta(0):
+                self.periods[flag] = period
+        episodes = to_episodes(series, period=period)
+
+        open_episode = self.open_episodes.pop(flag, None)
+        if open_episode is not None:
+            if len(episodes) and episodes["start"].iloc[0] == series.index[0]:
+                first = episodes.iloc[0]
+                episodes.loc[0, "start"] = open_episode["start"]
+                episodes.loc[0, "samples"] = \
+                    open_episode["samples"] + first["samples"]
+                episodes.loc[0, "duration"] = \
+                    first["end"] - open_episode["start"] + period
+            elif not len(series):
+                self.open_episodes[flag] = open_episode
+            else:
+                episodes = pd.concat(
+                    [pd.DataFrame([open_episode]), episodes], ignore_index=True)
+
+        if len(episodes) and len(series) and series.iloc[-1]:
+            self.open_episodes[flag] = episodes.iloc[-1].to_dict()
+            episodes = episodes.iloc[:-1]
+        return episodes
+
+    def update(self, df: pd.DataFrame) -> dict:
+        """Evaluate the rows after the last run and append their results.
+
+        Rows at or before the last timestamp done are skipped, so the
+        whole log or an overlapping tail can be passed. Returns the new
+        flags, FC12 - FC14 for the windows closed by these rows.
+        """
+        if self.last is not None:
+            df = df[df.index > self.last]
+        if not len(df):
+            return {}
+
+        results = self.stream.update(df)
+        self.last = df.index[-1]
+
+        closed = []
+        for flag, series in results.items():
+            if len(series):
+                self._append(f"{flag}.csv", series.to_frame())
+            episodes = self._episodes(flag, series)
+            if len(episodes):
+                episodes.insert(0, "flag", flag)
+                closed.append(episodes)
+        if closed:
+            self._append(EPISODES_FILE, pd.concat(closed), index=False)
+
+        self.save()
+        return results
+
+    def update_file(self, path, **kwargs) -> dict:
+        """update() with the rows of a trend log after the last run.
+
+        Parquet and feather logs only read the new rows, see
+        faults.loader.load_trend_log(); kwargs go to it.
+        """
+        if self.last is not None:
+            kwargs.setdefault("start", self.last)
+        return self.update(load_trend_log(path, self.stream.faults, **kwargs))
+
+    def flags(self) -> dict:
+        """Flag name to every flag stored so far."""
+        results = {}
+        for fault in self.stream.faults.values():
+            file = self.path / f"{fault.flag_col}.csv"
+            if file.exists():
+                results[fault.flag_col] = pd.read_csv(
+                    file, index_col=0, parse_dates=True)[fault.flag_col]
+        return results
+
+    def episodes(self, include_open: bool = True) -> pd.DataFrame:
+        """Stored episodes of every flag, with the open ones at the end."""
+        frames = []
+        file = self.path / EPISODES_FILE
+        if file.exists():
+            episodes = pd.read_csv(file, parse_dates=["start", "end"])
+            episodes["duration"] = pd.to_timedelta(episodes["duration"])
+            frames.append(episodes)
+        if include_open and self.open_episodes:
+            frames.append(pd.DataFrame(
+                [dict(episode, flag=flag)
+                 for flag, episode in self.open_episodes.items()]))
+        if not frames:
+            return pd.DataFrame(columns=["flag"] + EPISODE_COLUMNS)
+        return pd.concat(frames, ignore_index=True)[["flag"] + EPISODE_COLUMNS]
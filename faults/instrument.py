@@ -0,0 +1,103 @@
+import time
+import tracemalloc
+from collections import namedtuple
+
+import pandas as pd
+
+
+PhaseMetrics = namedtuple(
+    "PhaseMetrics", ["fault", "phase", "seconds", "rows", "peak_bytes"])
+
+
+class _NoPhase:
+    # shared do nothing context, the only cost when instrumentation is off
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NO_PHASE = _NoPhase()
+
+
+def phase(instrument, fault: str, name: str, rows: int):
+    """Context timing one phase of a fault, NO_PHASE when instrument is None."""
+    if instrument is None:
+        return NO_PHASE
+    return _Phase(instrument, fault, name, rows)
+
+
+class _Phase:
+
+    def __init__(self, instrument, fault, name, rows):
+        self.instrument = instrument
+        self.fault = fault
+        self.name = name
+        self.rows = rows
+
+    def __enter__(self):
+        if self.instrument.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            self.start_bytes = tracemalloc.get_traced_memory()[0]
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self.start
+        peak = None
+        if self.instrument.memory:
+            peak = tracemalloc.get_traced_memory()[1] - self.start_bytes
+        self.instrument.callback(PhaseMetrics(
+            self.fault, self.name, seconds, self.rows, peak))
+        return False
+
+
+class Instrument:
+    """Opt-in timing of the phases of the fault conditions.
+
+    Set it on a fault, fault.instrument = Instrument(callback), or pass
+    it to BoilerPlantFaults / StreamingFaults. callback gets one
+    PhaseMetrics per phase: validate, masks, flag, resample and assign.
+    With memory=True the tracemalloc peak of each phase is recorded too,
+    tracemalloc is started on first use and slows numpy allocations down.
+    """
+
+    def __init__(self, callback=None, memory: bool = False):
+        self.memory = memory
+        if callback is not None:
+            self.callback = callback
+
+    def callback(self, metrics: PhaseMetrics):
+        pass
+
+    def stop(self):
+        """Stop tracemalloc if it is running."""
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+class Collector(Instrument):
+    """Instrument keeping every PhaseMetrics in .metrics."""
+
+    def __init__(self, memory: bool = False):
+        super().__init__(memory=memory)
+        self.metrics = []
+
+    def callback(self, metrics: PhaseMetrics):
+        self.metrics.append(metrics)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.metrics, columns=PhaseMetrics._fields)
+
+    def summary(self) -> pd.DataFrame:
+        """Total seconds and rows and the largest peak per fault and phase."""
+        return self.to_frame().groupby(["fault", "phase"], sort=False).agg(
+            seconds=("seconds", "sum"), rows=("rows", "sum"),
+            peak_bytes=("peak_bytes", "max"), calls=("seconds", "size"))
+
+    def clear(self):
+        self.metrics = []
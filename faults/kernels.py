@@ -0,0 +1,281 @@
+import numpy as np
+
+
+class Workspace:
+    """Preallocated arrays reused between kernel calls.
+
+    The fault kernels below take plain arrays and scalars, no pandas,
+    and return their helper masks as boolean arrays. Given a workspace
+    the masks and scratch arrays are allocated once and reused on every
+    call of the same shape, so the masks are only valid until the next
+    call with that workspace. Arrays are 1-D samples or 2-D devices by
+    samples, see FaultCondition.column_arrays().
+    """
+
+    def __init__(self):
+        self.buffers = {}
+
+    def get(self, key, shape, dtype=bool) -> np.ndarray:
+        dtype = np.dtype(dtype)
+        shape = (shape,) if np.ndim(shape) == 0 else tuple(shape)
+        buf = self.buffers.get(key)
+        if buf is None or buf.shape != shape or buf.dtype != dtype:
+            buf = np.empty(shape, dtype=dtype)
+            self.buffers[key] = buf
+        return buf
+
+
+def _buffer(work, key, shape, dtype=bool):
+    if work is None:
+        return np.empty(shape, dtype=dtype)
+    return work.get(key, shape, dtype)
+
+
+# primitives, written like the pandas expressions they replace so the
+# flags are the same bit for bit
+def less_than_offset(a, b, offset, out=None, scratch=None):
+    """a < b - offset"""
+    if scratch is None:
+        scratch = np.empty(np.shape(b), dtype=np.result_type(b, offset))
+    np.subtract(b, offset, out=scratch)
+    return np.less(a, scratch, out=out)
+
+
+def offset_less_than(a, offset, b, out=None, scratch=None):
+    """a + offset < b"""
+    if scratch is None:
+        scratch = np.empty(np.shape(a), dtype=np.result_type(a, offset))
+    np.add(a, offset, out=scratch)
+    return np.less(scratch, b, out=out)
+
+
+def offset_greater_than(a, offset, b, out=None, scratch=None):
+    """a - offset > b"""
+    if scratch is None:
+        scratch = np.empty(np.shape(a), dtype=np.result_type(a, offset))
+    np.subtract(a, offset, out=scratch)
+    return np.greater(scratch, b, out=out)
+
+
+def mixed_temp_mismatch(flow, temp, header, thres, out=None, scratch=None):
+    """abs((flow * temp) / flow - header) > thres
+
+    No flow leaves a nan mixed temp which never trips the fault.
+    """
+    if scratch is None:
+        scratch = np.empty(
+            np.shape(flow), dtype=np.result_type(flow, temp, header, 1.0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.multiply(flow, temp, out=scratch)
+        np.divide(scratch, flow, out=scratch)
+    np.subtract(scratch, header, out=scratch)
+    np.abs(scratch, out=scratch)
+    return np.greater(scratch, thres, out=out)
+
+
+def weighted_temp_mismatch(flow, temp, header, thres, out=None):
+    """abs(sum(flow * temp) / sum(flow) - header) > thres
+
+    flow and temp are devices by samples, the flow weighted mixed temp
+    of all devices is one product summed over the device axis. No flow
+    at all leaves a nan mixed temp which never trips the fault.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mixed = np.einsum("ij,ij->j", flow, temp) / flow.sum(axis=0)
+    return np.greater(np.abs(mixed - header), thres, out=out)
+
+
+def changed(a, out=None):
+    """True where a differs from the previous sample, first is False."""
+    if out is None:
+        out = np.empty(np.shape(a), dtype=bool)
+    if np.shape(a)[-1]:
+        out[..., 0] = False
+        np.not_equal(a[..., 1:], a[..., :-1], out=out[..., 1:])
+    return out
+
+
+def all_of(masks, out=None) -> np.ndarray:
+    """AND the masks together in place into out."""
+    masks = list(masks)
+    if out is None:
+        out = np.empty(np.shape(masks[0]), dtype=bool)
+    np.copyto(out, masks[0])
+    for mask in masks[1:]:
+        np.logical_and(out, mask, out=out)
+    return out
+
+
+# fault condition kernels
+def fc1(pump_diff_press, pump_diff_press_setpoint, pump_status,
+        pump_diff_press_err_thres, work=None) -> dict:
+    """OS1 - Diff pressure too high with pumps off"""
+    n = np.shape(pump_diff_press)
+    return {
+        'pump_diff_press_check': less_than_offset(
+            pump_diff_press, pump_diff_press_setpoint, pump_diff_press_err_thres,
+            out=_buffer(work, "fc1.pump_diff_press_check", n),
+            scratch=_buffer(work, "fc1.scratch", n, np.result_type(
+                pump_diff_press_setpoint, pump_diff_press_err_thres))),
+        'pump_check': np.equal(
+            pump_status, 0, out=_buffer(work, "fc1.pump_check", n)),
+    }
+
+
+def fc2(flow_meter, pump_status, flow_meter_err_thres, work=None, name="fc2") -> dict:
+    """OS1 - Flow meter when pumps are off should be zero"""
+    n = np.shape(flow_meter)
+    return {
+        'flow_meter_check': np.greater(
+            flow_meter, flow_meter_err_thres,
+            out=_buffer(work, name + ".flow_meter_check", n)),
+        'pump_check': np.equal(
+            pump_status, 0, out=_buffer(work, name + ".pump_check", n)),
+    }
+
+
+def fc4(pump_diff_press, pump_diff_press_setpoint, pump_vfd_speed,
+        pump_diff_press_err_thres, vfd_speed_min, work=None) -> dict:
+    """OS2,3 - Pumps not making DP setpoint"""
+    n = np.shape(pump_diff_press)
+    return {
+        'pump_diff_press_check': less_than_offset(
+            pump_diff_press, pump_diff_press_setpoint, pump_diff_press_err_thres,
+            out=_buffer(work, "fc4.pump_diff_press_check", n),
+            scratch=_buffer(work, "fc4.scratch", n, np.result_type(
+                pump_diff_press_setpoint, pump_diff_press_err_thres))),
+        'pump_check': np.greater_equal(
+            pump_vfd_speed, vfd_speed_min,
+            out=_buffer(work, "fc4.pump_check", n)),
+    }
+
+
+def fc5(flow_meter, hot_water_bypass_vlv_cmd, pump_status, flow_min,
+        bypass_vlv_min, work=None) -> dict:
+    """OS2,3 - Low flow with the bypass valve open and pumps on"""
+    n = np.shape(flow_meter)
+    return {
+        'flowmeter_check': np.less(
+            flow_meter, flow_min, out=_buffer(work, "fc5.flowmeter_check", n)),
+        'bypass_vlv_check': np.greater_equal(
+            hot_water_bypass_vlv_cmd, bypass_vlv_min,
+            out=_buffer(work, "fc5.bypass_vlv_check", n)),
+        'pump_check': np.equal(
+            pump_status, 1, out=_buffer(work, "fc5.pump_check", n)),
+    }
+
+
+def fc6(hot_water_supply_temp, hot_water_supply_temp_spt, pump_status,
+        hot_water_temp_err_thres, work=None) -> dict:
+    """OS2,3 - Hot water system not meeting supply setpoint"""
+    n = np.shape(hot_water_supply_temp)
+    return {
+        'hw_spt_check': offset_less_than(
+            hot_water_supply_temp, hot_water_temp_err_thres,
+            hot_water_supply_temp_spt,
+            out=_buffer(work, "fc6.hw_spt_check", n),
+            scratch=_buffer(work, "fc6.scratch", n, np.result_type(
+                hot_water_supply_temp, hot_water_temp_err_thres))),
+        'pump_check': np.equal(
+            pump_status, 1, out=_buffer(work, "fc6.pump_check", n)),
+    }
+
+
+def fc7(hot_water_sys_gauge_pres, pump_status, gauge_pres_min, work=None) -> dict:
+    """OS1,2,3 - Hot water system static/gauge pressure low"""
+    n = np.shape(hot_water_sys_gauge_pres)
+    return {
+        'hw_sys_static_press_check': np.less(
+            hot_water_sys_gauge_pres, gauge_pres_min,
+            out=_buffer(work, "fc7.hw_sys_static_press_check", n)),
+        'pump_check': np.equal(
+            pump_status, 1, out=_buffer(work, "fc7.pump_check", n)),
+    }
+
+
+def fc8(hot_water_return_temp, pump_status, hot_water_temp_err_thres,
+        boiler_condensing_temp, work=None) -> dict:
+    """OS2,3 - Hot return temp too high for a condensing boiler"""
+    n = np.shape(hot_water_return_temp)
+    return {
+        'boiler_condensing_check': offset_greater_than(
+            hot_water_return_temp, hot_water_temp_err_thres,
+            boiler_condensing_temp,
+            out=_buffer(work, "fc8.boiler_condensing_check", n),
+            scratch=_buffer(work, "fc8.scratch", n, np.result_type(
+                hot_water_return_temp, hot_water_temp_err_thres))),
+        'pump_check': np.equal(
+            pump_status, 1, out=_buffer(work, "fc8.pump_check", n)),
+    }
+
+
+def fc9(hot_water_return_temp, pump_status, hot_water_temp_err_thres,
+        boiler_condensing_temp, work=None) -> dict:
+    """OS2,3 - Hot return temp too low for a NON condensing boiler"""
+    n = np.shape(hot_water_return_temp)
+    return {
+        'boiler_condensing_check': offset_less_than(
+            hot_water_return_temp, hot_water_temp_err_thres,
+            boiler_condensing_temp,
+            out=_buffer(work, "fc9.boiler_condensing_check", n),
+            scratch=_buffer(work, "fc9.scratch", n, np.result_type(
+                hot_water_return_temp, hot_water_temp_err_thres))),
+        'pump_check': np.equal(
+            pump_status, 1, out=_buffer(work, "fc9.pump_check", n)),
+    }
+
+
+def fc10(flow_meter, boiler_temp, header_temp, boiler_status,
+         hot_water_temp_err_thres, work=None, name="fc10",
+         weighted=False) -> dict:
+    """OS2 - Boiler temp and common hot water header temp mismatch
+
+    weighted compares the flow weighted mix of the boiler temps with the
+    header, flow_meter and boiler_temp are then devices by samples.
+    """
+    n = np.shape(flow_meter)
+    if weighted:
+        mismatch = weighted_temp_mismatch(
+            flow_meter, boiler_temp, header_temp, hot_water_temp_err_thres,
+            out=_buffer(work, name + ".boiler_vs_header_check", n))
+    else:
+        mismatch = mixed_temp_mismatch(
+            flow_meter, boiler_temp, header_temp, hot_water_temp_err_thres,
+            out=_buffer(work, name + ".boiler_vs_header_check", n),
+            scratch=_buffer(work, name + ".scratch", n, np.result_type(
+                flow_meter, boiler_temp, header_temp, 1.0)))
+    return {
+        'boiler_vs_header_check': mismatch,
+        'boiler_check': np.equal(
+            boiler_status, 1, out=_buffer(work, name + ".boiler_check", n)),
+    }
+
+
+def fc12(pump_vfd_speed, work=None) -> dict:
+    """OS1,2,3 - Loop pump on and off modes"""
+    n = np.shape(pump_vfd_speed)
+    return {
+        'loop_pumps_on_mode': np.greater(
+            pump_vfd_speed, .01, out=_buffer(work, "fc12.on", n)),
+        'loop_pumps_off_mode': np.equal(
+            pump_vfd_speed, 0.0, out=_buffer(work, "fc12.off", n)),
+    }
+
+
+def fc13(boiler_status, work=None) -> dict:
+    """OS2,3 - Boiler on and off modes"""
+    n = np.shape(boiler_status)
+    return {
+        'boiler_on_mode': np.equal(
+            boiler_status, 1, out=_buffer(work, "fc13.on", n)),
+        'boiler_off_mode': np.equal(
+            boiler_status, 0, out=_buffer(work, "fc13.off", n)),
+    }
+
+
+def fc14(boiler_stage, work=None) -> dict:
+    """OS1,2,3 - Boiler stage changes"""
+    return {
+        'boiler_stage_change': changed(
+            boiler_stage, out=_buffer(work, "fc14.change", np.shape(boiler_stage))),
+    }
@@ -0,0 +1,207 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from faults.conditions import expand_checks
+from faults.plant import build_faults
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+except ImportError:  # parquet and arrow files need pyarrow
+    pa = None
+    ds = None
+
+
+# dtype per column check kind, sensors and setpoints without a check
+# stay float64
+CHECK_DTYPES = {
+    "float": np.float64,
+    "int": np.uint8,
+    "int_only": np.int16,
+}
+
+# compact: float32 analog and sensor data, stages fit an int8
+COMPACT_DTYPES = {
+    "float": np.float32,
+    "int": np.uint8,
+    "int_only": np.int8,
+}
+
+_FORMATS = {
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "ipc",
+    ".feather": "ipc",
+    ".ipc": "ipc",
+    ".csv": "csv",
+}
+
+
+def _faults(config) -> list:
+    # a plant config, list of instances or a BoilerPlantFaults
+    return list(build_faults(getattr(config, "faults", config)).values())
+
+
+def required_columns(config) -> list:
+    """Every column the configured faults read, in config order."""
+    cols = []
+    for fault in _faults(config):
+        for col in fault.columns():
+            if col not in cols:
+                cols.append(col)
+    return cols
+
+
+def column_dtypes(config, compact: bool = False) -> dict:
+    """Column to the dtype the fault column checks expect.
+
+    Analog outputs are float64, status points uint8, boiler stages
+    int16 and every other column read float64. compact uses float32
+    for the analog and sensor columns and int8 for the stages.
+    """
+    kinds = COMPACT_DTYPES if compact else CHECK_DTYPES
+    dtypes = {col: np.dtype(kinds["float"])
+              for col in required_columns(config)}
+    for fault in _faults(config):
+        for kind, col in expand_checks(fault.checks()):
+            dtypes[col] = np.dtype(kinds[kind])
+    return dtypes
+
+
+def _time_column(schema, index_col):
+    if index_col is not None:
+        return index_col
+    # a dataframe index written by pandas, else the first column
+    meta = schema.pandas_metadata or {}
+    for col in meta.get("index_columns", []):
+        if isinstance(col, str):
+            return col
+    return schema.names[0]
+
+
+def _cast_table(table, dtypes: dict):
+    # cast in arrow before to_pandas, columns with nulls or values the
+    # cast would change are left for the column checks to report
+    for i, name in enumerate(table.column_names):
+        dtype = dtypes.get(name)
+        column = table.column(i)
+        if dtype is None or column.null_count:
+            continue
+        try:
+            table = table.set_column(
+                i, name, column.cast(pa.from_numpy_dtype(dtype)))
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            pass
+    return table
+
+
+def _cast_frame(df: pd.DataFrame, dtypes: dict) -> pd.DataFrame:
+    # ints only when no value changes, floats to the float width asked
+    for col, dtype in dtypes.items():
+        values = df[col]
+        if values.dtype == dtype:
+            continue
+        if dtype.kind == "f":
+            if pd.api.types.is_numeric_dtype(values):
+                df[col] = values.astype(dtype)
+            continue
+        if values.isna().any():
+            continue
+        cast = values.astype(dtype)
+        if (cast == values).all():
+            df[col] = cast
+    return df
+
+
+def compact_frame(df: pd.DataFrame, config) -> pd.DataFrame:
+    """Copy of the columns the faults read in the compact dtypes.
+
+    float32 sensors and analog outputs, uint8 status and int8 stages,
+    status or stage columns that do not fit are left for the column
+    checks to report.
+    """
+    cols = required_columns(config)
+    return _cast_frame(df[cols].copy(), column_dtypes(config, compact=True))
+
+
+def _bound(value, tz) -> pd.Timestamp:
+    # start / end in the time zone of the time column, naive bounds are
+    # taken as wall times there
+    value = pd.Timestamp(value)
+    if tz is None:
+        return value
+    if value.tz is None:
+        return value.tz_localize(tz)
+    return value.tz_convert(tz)
+
+
+def _read_arrow(path, fmt, cols, dtypes, start, end, index_col):
+    if ds is None:
+        raise ImportError(f"reading {fmt} files needs pyarrow")
+
+    dataset = ds.dataset(path, format=fmt)
+    time_col = _time_column(dataset.schema, index_col)
+
+    # the time range is pushed down to skip whole row groups, the
+    # bounds as scalars of the column's own type and time zone
+    time_type = dataset.schema.field(time_col).type
+    tz = getattr(time_type, "tz", None)
+
+    def scalar(value):
+        return pa.scalar(_bound(value, tz), type=time_type)
+
+    where = None
+    if start is not None:
+        where = ds.field(time_col) >= scalar(start)
+    if end is not None:
+        before = ds.field(time_col) < scalar(end)
+        where = before if where is None else where & before
+
+    table = dataset.to_table(columns=[time_col] + cols, filter=where)
+    df = _cast_table(table, dtypes).to_pandas()
+    # to_pandas already restores an index pandas wrote
+    if time_col in df.columns:
+        df = df.set_index(time_col)
+    return df[cols]
+
+
+def _read_csv(path, cols, dtypes, start, end, index_col):
+    if not isinstance(index_col, str):
+        index_col = pd.read_csv(path, nrows=0).columns[index_col or 0]
+
+    df = pd.read_csv(path, usecols=[index_col] + cols, index_col=index_col,
+                     parse_dates=True)
+    df = df[cols]
+    tz = getattr(df.index, "tz", None)
+    if start is not None:
+        df = df[df.index >= _bound(start, tz)]
+    if end is not None:
+        df = df[df.index < _bound(end, tz)]
+    return _cast_frame(df, dtypes)
+
+
+def load_trend_log(path, config, start=None, end=None, index_col=None,
+                   format=None, dtypes=True, compact=False) -> pd.DataFrame:
+    """Read only the columns and time range the configured faults need.
+
+    config is a plant config, a list of FaultConditionN instances or a
+    BoilerPlantFaults. Parquet and Arrow IPC (feather) files or
+    directories are read with pyarrow, projecting the columns and
+    filtering start <= time < end while reading, csv files are read with
+    usecols. The time column is the index pandas wrote or index_col,
+    else the first column. With dtypes the columns are cast to the
+    column_dtypes() the fault checks expect, compact for the compact
+    float32 / uint8 / int8 dtypes.
+    """
+    cols = required_columns(config)
+    cast = column_dtypes(config, compact) if dtypes else {}
+
+    if format is None:
+        format = _FORMATS.get(Path(path).suffix.lower(), "parquet")
+    if format == "csv":
+        return _read_csv(path, cols, cast, start, end, index_col)
+    if format in ("parquet", "ipc"):
+        return _read_arrow(path, format, cols, cast, start, end, index_col)
+    raise ValueError(f"unknown trend log format {format!r}")
@@ -0,0 +1,118 @@
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from faults import kernels
+from faults.conditions import CyclingFaultCondition
+from faults.cycling import window_step
+from faults.episodes import to_timedelta
+from faults.persistence import PersistState
+from faults.plant import build_faults, reject_devices
+
+
+class OnlineFault:
+    """One fault condition updated a sample at a time.
+
+    update() costs the same for every sample and keeps only the previous
+    sample, so memory does not grow with the run time. FC1 - FC11 flag
+    each sample like evaluate() does, including persist and clear.
+    FC12 - FC14 count starts over a rolling window ending at the sample
+    instead of fixed clock windows, in a ring of the last os_max + 1
+    start times per mode. The flag is 1 while more than os_max starts
+    fall within the window. No column checks are run on the samples.
+    """
+
+    def __init__(self, fault):
+        reject_devices({fault.flag_col[:-len("_flag")]: fault})
+        self.fault = fault
+        self.cols = fault.columns()
+        self.cycling = isinstance(fault, CyclingFaultCondition)
+        if self.cycling:
+            self.window = window_step(fault.window)
+        if fault.persist is not None:
+            self.on_ns = to_timedelta(fault.persist).value
+            self.off_ns = 0 if fault.clear is None else \
+                to_timedelta(fault.clear).value
+        self.work = kernels.Workspace()
+        self.reset()
+
+    def reset(self):
+        # [previous, current] value of every column the fault reads
+        self.values = {col: np.zeros(2) for col in self.cols}
+        self.samples = 0
+        self.modes = {}
+        self.starts = {}
+        self.persist_state = None
+
+    def _masks(self, sample) -> dict:
+        first = not self.samples
+        for col, values in self.values.items():
+            values[0] = values[1]
+            values[1] = sample[col]
+            if first:
+                # the first sample is its own previous, no stage change
+                values[0] = values[1]
+        masks = self.fault.kernel_masks(self.values, self.work)
+        self.samples += 1
+        return {name: bool(mask[-1]) for name, mask in masks.items()}
+
+    def update(self, timestamp, sample) -> int:
+        """The flag after the sample, a dict or row of column values."""
+        now = pd.Timestamp(timestamp).value
+        masks = self._masks(sample)
+
+        if self.cycling:
+            return self._update_cycling(now, masks)
+
+        flag = all(masks.values())
+        if self.fault.persist is not None:
+            flag = self._persist(now, flag)
+        return int(flag)
+
+    def _persist(self, now: int, flag: bool) -> bool:
+        # persist_flag() for one sample
+        state = self.persist_state
+        if state is None:
+            state = PersistState(False, now, False)
+        since = state.since if flag == state.flag else now
+        latched = state.latched
+        if now - since >= (self.on_ns if flag else self.off_ns):
+            latched = flag
+        self.persist_state = PersistState(flag, since, latched)
+        return latched
+
+    def _update_cycling(self, now: int, masks: dict) -> int:
+        os_max = self.fault.os_max
+        flag = 0
+        for name, mode in masks.items():
+            starts = self.starts.get(name)
+            if starts is None:
+                starts = self.starts[name] = deque(maxlen=os_max + 1)
+            if mode and not self.modes.get(name, False):
+                starts.append(now)
+            self.modes[name] = mode
+
+            # expire starts that left the window
+            while starts and starts[0] <= now - self.window:
+                starts.popleft()
+            if len(starts) > os_max:
+                flag = 1
+        return flag
+
+
+class OnlineFaults:
+    """Every fault of a plant config updated a sample at a time."""
+
+    def __init__(self, config):
+        self.faults = {fault.flag_col: OnlineFault(fault)
+                       for fault in build_faults(config).values()}
+
+    def reset(self):
+        for fault in self.faults.values():
+            fault.reset()
+
+    def update(self, timestamp, sample) -> dict:
+        """Flag name to the flag after the sample."""
+        return {flag: fault.update(timestamp, sample)
+                for flag, fault in self.faults.items()}
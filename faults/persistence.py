@@ -0,0 +1,61 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from faults.episodes import to_timedelta
+
+
+# the last sample of a chunk: its raw flag, when its run of equal raw
+# flags started (ns) and whether the fault was being reported
+PersistState = namedtuple("PersistState", ["flag", "since", "latched"])
+
+
+def persist_flag(flag, index, on_delay, off_delay=None, state=None):
+    """Report a fault only after it persists, clear it with hysteresis.
+
+    The fault is reported from the first sample where the raw flag has
+    been 1 for at least on_delay ("10min") and, with off_delay, stays
+    reported until the raw flag has been 0 for at least off_delay, else
+    it clears on the first 0. Times come from the index so irregular
+    timestamps work, the index must be sorted. One O(n) pass finds the
+    runs of the raw flag, the delays are a searchsorted per run and no
+    rolling windows. Pass the returned PersistState with the next chunk
+    of the same series. Returns (flag as uint8 array, state).
+    """
+    flag = np.asarray(flag, dtype=bool)
+    stamps = pd.DatetimeIndex(index).as_unit("ns").asi8
+    on_ns = to_timedelta(on_delay).value
+    off_ns = 0 if off_delay is None else to_timedelta(off_delay).value
+
+    n = len(flag)
+    if not n:
+        return np.zeros(0, dtype=np.uint8), state
+    if state is None:
+        state = PersistState(False, stamps[0], False)
+
+    # runs of equal raw flags, only the run boundaries are looked at
+    starts = np.flatnonzero(flag[1:] != flag[:-1]) + 1
+    ends = np.append(starts, n)
+    starts = np.insert(starts, 0, 0)
+    values = flag[starts]
+    since = stamps[starts]
+    if values[0] == state.flag:
+        # the first run started in an earlier chunk
+        since[0] = state.since
+
+    # the sample each run reports on (1 runs) or clears (0 runs) at,
+    # runs too short for their delay have no event
+    delay = np.where(values, on_ns, off_ns)
+    events = np.searchsorted(stamps, since + delay, side="left")
+    np.maximum(events, starts, out=events)
+    has_event = events < ends
+    events = events[has_event]
+
+    # hold each event until the next, the state before the first
+    held = np.insert(values[has_event], 0, state.latched)
+    lengths = np.diff(events, prepend=0, append=n)
+    out = np.repeat(held.view(np.uint8), lengths)
+
+    return out, PersistState(
+        bool(values[-1]), int(since[-1]), bool(out[-1]))
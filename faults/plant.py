@@ -0,0 +1,403 @@
+import numpy as np
+import pandas as pd
+
+from faults.conditions import (
+    check_columns,
+    FaultConditionOne,
+    FaultConditionTwo,
+    FaultConditionThree,
+    FaultConditionFour,
+    FaultConditionFive,
+    FaultConditionSix,
+    FaultConditionSeven,
+    FaultConditionEight,
+    FaultConditionNine,
+    FaultConditionTen,
+    FaultConditionEleven,
+    FaultConditionTwelve,
+    FaultConditionThirteen,
+    FaultConditionFourteen,
+)
+from faults import kernels
+from faults.cycling import cycle_counts, cycling_flag
+from faults.instrument import phase
+from faults.persistence import persist_flag
+from faults.schema import column_stats
+
+
+FAULT_CONDITIONS = {
+    "fc1": FaultConditionOne,
+    "fc2": FaultConditionTwo,
+    "fc3": FaultConditionThree,
+    "fc4": FaultConditionFour,
+    "fc5": FaultConditionFive,
+    "fc6": FaultConditionSix,
+    "fc7": FaultConditionSeven,
+    "fc8": FaultConditionEight,
+    "fc9": FaultConditionNine,
+    "fc10": FaultConditionTen,
+    "fc11": FaultConditionEleven,
+    "fc12": FaultConditionTwelve,
+    "fc13": FaultConditionThirteen,
+    "fc14": FaultConditionFourteen,
+}
+
+
+# mask expressions on the column arrays, the same NumPy kernel
+# primitives the fault classes use so the fused plan gives the same
+# flags bit for bit
+def _lt_sub(cols, a, b, thres):
+    return kernels.less_than_offset(cols(a), cols(b), thres)
+
+
+def _add_lt(cols, a, thres, b):
+    return kernels.offset_less_than(cols(a), thres, cols(b))
+
+
+def _add_lt_const(cols, a, thres, value):
+    return kernels.offset_less_than(cols(a), thres, value)
+
+
+def _sub_gt_const(cols, a, thres, value):
+    return kernels.offset_greater_than(cols(a), thres, value)
+
+
+def _eq(cols, a, value):
+    return np.equal(cols(a), value)
+
+
+def _gt(cols, a, value):
+    return np.greater(cols(a), value)
+
+
+def _lt(cols, a, value):
+    return np.less(cols(a), value)
+
+
+def _ge(cols, a, value):
+    return np.greater_equal(cols(a), value)
+
+
+def _mix_gt(cols, flow, temp, header, thres):
+    return kernels.mixed_temp_mismatch(cols(flow), cols(temp), cols(header), thres)
+
+
+def _changed(cols, a):
+    return kernels.changed(cols(a))
+
+
+_MASK_OPS = {
+    "lt_sub": _lt_sub,
+    "add_lt": _add_lt,
+    "add_lt_const": _add_lt_const,
+    "sub_gt_const": _sub_gt_const,
+    "eq": _eq,
+    "gt": _gt,
+    "lt": _lt,
+    "ge": _ge,
+    "mix_gt": _mix_gt,
+    "changed": _changed,
+}
+
+
+# plan builders, one per fault condition, return the masks that are
+# AND'ed into the flag and for the cycling faults the max number of
+# starts/stops and the window they are counted in
+def _plan_fc1(fc):
+    return (
+        [("lt_sub", fc.pump_diff_press_col, fc.pump_diff_press_setpoint_col,
+          fc.pump_diff_press_err_thres),
+         ("eq", fc.pump_status_bool_col, 0)],
+        None,
+    )
+
+
+def _plan_fc2(fc):
+    return (
+        [("gt", fc.flow_meter_col, fc.flow_meter_err_thres),
+         ("eq", fc.pump_status_bool_col, 0)],
+        None,
+    )
+
+
+def _plan_fc4(fc):
+    return (
+        [("lt_sub", fc.pump_diff_press_col, fc.pump_diff_press_setpoint_col,
+          fc.pump_diff_press_err_thres),
+         ("ge", fc.pump_vfd_speed_col,
+          fc.vfd_speed_percent_max - fc.vfd_speed_percent_err_thres)],
+        None,
+    )
+
+
+def _plan_fc5(fc):
+    return (
+        [("lt", fc.flow_meter_col,
+          fc.hot_water_min_flow_stp - fc.flow_meter_err_thres),
+         ("ge", fc.hot_water_bypass_vlv_cmd_col,
+          .99 - fc.hot_water_bypass_vlv_err_thres),
+         ("eq", fc.pump_status_bool_col, 1)],
+        None,
+    )
+
+
+def _plan_fc6(fc):
+    return (
+        [("add_lt", fc.hot_water_supply_temp_col, fc.hot_water_temp_err_thres,
+          fc.hot_water_supply_temp_spt_col),
+         ("eq", fc.pump_status_bool_col, 1)],
+        None,
+    )
+
+
+def _plan_fc7(fc):
+    return (
+        [("lt", fc.hot_water_sys_gauge_pres_col,
+          fc.expansion_tank_press_stp * .9),
+         ("eq", fc.pump_status_bool_col, 1)],
+        None,
+    )
+
+
+def _plan_fc8(fc):
+    return (
+        [("sub_gt_const", fc.hot_water_return_temp_col,
+          fc.hot_water_temp_err_thres, fc.boiler_condensing_temp),
+         ("eq", fc.pump_status_bool_col, 1)],
+        None,
+    )
+
+
+def _plan_fc9(fc):
+    return (
+        [("add_lt_const", fc.hot_water_return_temp_col,
+          fc.hot_water_temp_err_thres, fc.boiler_condensing_temp),
+         ("eq", fc.pump_status_bool_col, 1)],
+        None,
+    )
+
+
+def _plan_fc10(fc):
+    return (
+        [("mix_gt", fc.flow_meter_col, fc.boiler_leaving_temp_col,
+          fc.hot_water_supply_temp_col, fc.hot_water_temp_err_thres),
+         ("eq", fc.boiler_status_bool_col, 1)],
+        None,
+    )
+
+
+def _plan_fc11(fc):
+    return (
+        [("mix_gt", fc.flow_meter_col, fc.boiler_enter_temp_col,
+          fc.hot_water_return_temp_col, fc.hot_water_temp_err_thres),
+         ("eq", fc.boiler_status_bool_col, 1)],
+        None,
+    )
+
+
+def _plan_fc12(fc):
+    return (
+        [("gt", fc.pump_vfd_speed_col, .01),
+         ("eq", fc.pump_vfd_speed_col, 0.0)],
+        (fc.plant_os_max, fc.window),
+    )
+
+
+def _plan_fc13(fc):
+    return (
+        [("eq", fc.boiler_status_bool_col, 1),
+         ("eq", fc.boiler_status_bool_col, 0)],
+        (fc.boiler_os_max, fc.window),
+    )
+
+
+def _plan_fc14(fc):
+    return (
+        [("changed", fc.boiler_stage_int_col)],
+        (fc.boiler_stage_os_max, fc.window),
+    )
+
+
+_PLANNERS = {
+    FaultConditionOne: _plan_fc1,
+    FaultConditionTwo: _plan_fc2,
+    FaultConditionThree: _plan_fc2,
+    FaultConditionFour: _plan_fc4,
+    FaultConditionFive: _plan_fc5,
+    FaultConditionSix: _plan_fc6,
+    FaultConditionSeven: _plan_fc7,
+    FaultConditionEight: _plan_fc8,
+    FaultConditionNine: _plan_fc9,
+    FaultConditionTen: _plan_fc10,
+    FaultConditionEleven: _plan_fc11,
+    FaultConditionTwelve: _plan_fc12,
+    FaultConditionThirteen: _plan_fc13,
+    FaultConditionFourteen: _plan_fc14,
+}
+
+
+def build_faults(config) -> dict:
+    """Fault id to FaultConditionN instance from a plant config.
+
+    Config values are either the keyword arguments of the matching
+    FaultConditionN class or an instance of it. A list of instances is
+    keyed by their flag column, fc1_flag gives fc1.
+    """
+    if not isinstance(config, dict):
+        config = {fault.flag_col[:-len("_flag")]: fault for fault in config}
+
+    faults = {}
+    for fault_id, fault in config.items():
+        if fault_id not in FAULT_CONDITIONS:
+            raise ValueError(f"unknown fault condition {fault_id!r}")
+        if isinstance(fault, dict):
+            fault = FAULT_CONDITIONS[fault_id](**fault)
+        elif not isinstance(fault, FAULT_CONDITIONS[fault_id]):
+            raise TypeError(
+                f"{fault_id} must be a dict of arguments or a "
+                f"{FAULT_CONDITIONS[fault_id].__name__}")
+        faults[fault_id] = fault
+    return faults
+
+
+def reject_devices(faults: dict):
+    """ValueError for faults with lists of device columns.
+
+    Only the FaultConditionN classes evaluate devices, the plant wide
+    runners take one column per argument.
+    """
+    for fault_id, fault in faults.items():
+        if fault.devices() is not None:
+            raise ValueError(
+                f"{fault_id} has lists of device columns, run it with "
+                f"{type(fault).__name__}.evaluate() or apply()")
+
+
+def validate_plant_schema(df: pd.DataFrame, config) -> dict:
+    """Check every column the configured faults read in one reduction.
+
+    config is a plant config like BoilerPlantFaults takes or a list of
+    FaultConditionN instances. Raises the same TypeError as the first
+    failing fault would and returns the dtype, min and max of each
+    column. Pass them as stats to the faults' evaluate(), apply() or
+    episodes() on the same, unmodified df to skip their own checks.
+    """
+    checks = []
+    for fault in build_faults(config).values():
+        for check in fault.checks():
+            if check not in checks:
+                checks.append(check)
+
+    stats = column_stats(df, [col for _, col in checks])
+    check_columns(df, checks, stats)
+    return stats
+
+
+class BoilerPlantFaults:
+    """Run any of FC1 - FC14 together in one pass over the data.
+
+    The config maps fault ids ("fc1" ... "fc14") to either the keyword
+    arguments of the matching FaultConditionN class or an instance of it.
+    Column checks and masks that are shared between faults, like the
+    pump status check, are only computed once. instrument is an optional
+    faults.instrument.Instrument timing the phases of apply() under the
+    fault name "plant". flag_dtype is the dtype of the flags, np.uint8
+    or bool for compact results.
+    """
+
+    def __init__(self, config: dict, instrument=None, flag_dtype=int):
+        self.faults = build_faults(config)
+        self.instrument = instrument
+        self.flag_dtype = flag_dtype
+        self.compile()
+
+    def compile(self):
+        """Build the plan, dedupe column checks and masks across faults."""
+        self.checks = []
+        self.masks = []
+        self.flags = {}
+        self.cycling = {}
+        self.persistence = {}
+        reject_devices(self.faults)
+        for fault_id, fault in self.faults.items():
+            masks, cycling = _PLANNERS[type(fault)](fault)
+            for check in fault.checks():
+                if check not in self.checks:
+                    self.checks.append(check)
+            for mask in masks:
+                if mask not in self.masks:
+                    self.masks.append(mask)
+            if cycling is None:
+                self.flags[fault_id + "_flag"] = masks
+                if fault.persist is not None:
+                    self.persistence[fault_id + "_flag"] = (
+                        fault.persist, fault.clear)
+            else:
+                self.cycling[fault_id + "_flag"] = (masks,) + cycling
+
+    @property
+    def columns(self) -> list:
+        """Every column in the dataframe the plan reads."""
+        cols = []
+        for mask in self.masks:
+            for arg in mask[1:]:
+                if isinstance(arg, str) and arg not in cols:
+                    cols.append(arg)
+        return cols
+
+    def validate(self, df: pd.DataFrame):
+        stats = column_stats(df, [col for _, col in self.checks])
+        check_columns(df, self.checks, stats)
+
+    def compute_masks(self, df: pd.DataFrame) -> dict:
+        """Every mask of the plan on the columns of df, each computed once."""
+        arrays = {}
+
+        def cols(col):
+            if col not in arrays:
+                arrays[col] = df[col].to_numpy()
+            return arrays[col]
+
+        return {mask: np.asarray(_MASK_OPS[mask[0]](cols, *mask[1:]))
+                for mask in self.masks}
+
+    def episode_periods(self) -> dict:
+        """Flag name to the length of one flag sample, None to infer it."""
+        return {fault.flag_col: fault.episode_period()
+                for fault in self.faults.values()}
+
+    def apply(self, df: pd.DataFrame) -> dict:
+        """Return a dict of flag name to flag series.
+
+        FC1 - FC11 flags are on the dataframe index, FC12 - FC14 flags
+        are per cycling window like the results of the individual classes.
+        The dataframe passed in is not modified.
+        """
+        def timed(name):
+            return phase(self.instrument, "plant", name, len(df))
+
+        with timed("validate"):
+            self.validate(df)
+
+        with timed("masks"):
+            computed = self.compute_masks(df)
+
+        results = {}
+        with timed("flag"):
+            for flag, masks in self.flags.items():
+                out = kernels.all_of(computed[mask] for mask in masks)
+                if flag in self.persistence:
+                    out, _ = persist_flag(
+                        out, df.index, *self.persistence[flag])
+                results[flag] = pd.Series(
+                    out.astype(self.flag_dtype), index=df.index, name=flag)
+
+        with timed("resample"):
+            for flag, (masks, os_max, window) in self.cycling.items():
+                # count the starts and stops of each mode per window
+                counts = cycle_counts(
+                    df.index, {mask: computed[mask] for mask in masks}, window)
+                results[flag] = cycling_flag(counts, os_max, flag).astype(
+                    self.flag_dtype)
+
+        return results
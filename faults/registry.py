@@ -0,0 +1,98 @@
+'''
+Fault ids, arguments and descriptions without importing the fault code.
+
+The FaultConditionN signatures are read from the source of
+faults.conditions with ast, so listing the faults and checking a plant
+config stay fast enough for the command line.
+'''
+import ast
+from pathlib import Path
+
+FAULT_CLASSES = {
+    "fc1": "FaultConditionOne",
+    "fc2": "FaultConditionTwo",
+    "fc3": "FaultConditionThree",
+    "fc4": "FaultConditionFour",
+    "fc5": "FaultConditionFive",
+    "fc6": "FaultConditionSix",
+    "fc7": "FaultConditionSeven",
+    "fc8": "FaultConditionEight",
+    "fc9": "FaultConditionNine",
+    "fc10": "FaultConditionTen",
+    "fc11": "FaultConditionEleven",
+    "fc12": "FaultConditionTwelve",
+    "fc13": "FaultConditionThirteen",
+    "fc14": "FaultConditionFourteen",
+}
+
+_SPECS = None
+
+
+def _init_args(node: ast.ClassDef):
+    for item in node.body:
+        if isinstance(item, ast.FunctionDef) and item.name == "__init__":
+            args = [arg.arg for arg in item.args.args[1:]]
+            n_required = len(args) - len(item.args.defaults)
+            return args[:n_required], args[n_required:]
+    return None
+
+
+def fault_specs() -> dict:
+    """Fault id to {"class", "description", "required", "optional"}."""
+    global _SPECS
+    if _SPECS is None:
+        source = Path(__file__).with_name("conditions.py").read_text()
+        classes = {node.name: node for node in ast.parse(source).body
+                   if isinstance(node, ast.ClassDef)}
+
+        _SPECS = {}
+        for fault_id, name in FAULT_CLASSES.items():
+            node = classes[name]
+            doc = ast.get_docstring(node) or ""
+            # FC3 and FC9 take the arguments of the class they extend
+            args = _init_args(node)
+            while args is None:
+                node = classes[node.bases[0].id]
+                args = _init_args(node)
+            _SPECS[fault_id] = {
+                "class": name,
+                "description": " ".join(doc.split()),
+                "required": args[0],
+                "optional": args[1],
+            }
+    return _SPECS
+
+
+def check_config(config) -> list:
+    """Problems with a plant config as messages, empty when it is good.
+
+    Checks the fault ids, that every argument is one the class takes,
+    that none are missing and that the column arguments are names. The
+    data itself is not looked at.
+    """
+    if not isinstance(config, dict):
+        return ["a plant config is a json object of fault id to arguments"]
+
+    specs = fault_specs()
+    errors = []
+    for fault_id, args in config.items():
+        spec = specs.get(fault_id)
+        if spec is None:
+            errors.append(f"unknown fault condition {fault_id!r}")
+            continue
+        if not isinstance(args, dict):
+            errors.append(f"{fault_id} arguments must be a json object")
+            continue
+
+        known = spec["required"] + spec["optional"]
+        for name in args:
+            if name not in known:
+                errors.append(
+                    f"{fault_id} ({spec['class']}) has no argument {name!r}")
+        for name in spec["required"]:
+            if name not in args:
+                errors.append(f"{fault_id} is missing {name!r}")
+        for name, value in args.items():
+            if name.endswith("_col") and not isinstance(value, str):
+                errors.append(f"{fault_id} {name} must be a column name")
+    return errors
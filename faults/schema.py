@@ -0,0 +1,24 @@
+from collections import namedtuple
+
+import pandas as pd
+import pandas.api.types as pdtypes
+
+
+ColumnStats = namedtuple("ColumnStats", ["dtype", "min", "max"])
+
+
+def column_stats(df: pd.DataFrame, cols: list) -> dict:
+    """dtype, min and max of every column in one reduction over df[cols]."""
+    cols = list(dict.fromkeys(cols))
+    numeric = [col for col in cols if pdtypes.is_numeric_dtype(df[col])]
+    mins = df[numeric].min() if numeric else pd.Series(dtype=float)
+    maxs = df[numeric].max() if numeric else pd.Series(dtype=float)
+
+    stats = {}
+    for col in cols:
+        stats[col] = ColumnStats(
+            df[col].dtype,
+            mins.get(col),
+            maxs.get(col),
+        )
+    return stats
@@ -0,0 +1,209 @@
+import asyncio
+import json
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from faults.streaming import StreamingFaults
+
+
+_END = object()
+
+
+def frame_samples(df: pd.DataFrame):
+    """(timestamp, {point: value}) of every row, like a gateway sends them."""
+    for timestamp, sample in zip(df.index, df.to_dict("records")):
+        yield timestamp, sample
+
+
+async def iter_source(samples, interval: float = None):
+    """Local stand-in for the gateway, yields (timestamp, sample) pairs.
+
+    samples is any iterable of pairs or a dataframe, interval sleeps
+    between samples to play a trend log back in real time.
+    """
+    if isinstance(samples, pd.DataFrame):
+        samples = frame_samples(samples)
+    for timestamp, sample in samples:
+        yield timestamp, sample
+        await asyncio.sleep(interval or 0)
+
+
+async def json_lines_source(reader: asyncio.StreamReader):
+    """Samples from a socket stand-in sending one json object per line.
+
+    {"timestamp": "2023-01-01T00:00:00", "points": {"hws": 180.1, ...}}
+    """
+    while True:
+        line = await reader.readline()
+        if not line:
+            return
+        if line.strip():
+            message = json.loads(line)
+            yield pd.Timestamp(message["timestamp"]), message["points"]
+
+
+class PipelineMetrics:
+    """Counters of a FaultPipeline, read them while it runs."""
+
+    def __init__(self, latency_samples: int = 10_000):
+        self.samples = 0
+        self.batches = 0
+        self.errors = 0
+        self.last_error = None
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.blocked_puts = 0
+        # seconds from a sample arriving to its flags going to the sink
+        self.latencies = deque(maxlen=latency_samples)
+
+    def latency(self, q: float = 0.5) -> float:
+        """Quantile of the recent end to end latencies in seconds."""
+        if not self.latencies:
+            return 0.0
+        return float(np.quantile(np.fromiter(self.latencies, float), q))
+
+    def snapshot(self) -> dict:
+        return {
+            "samples": self.samples,
+            "batches": self.batches,
+            "errors": self.errors,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "blocked_puts": self.blocked_puts,
+            "latency_p50": self.latency(0.5),
+            "latency_p99": self.latency(0.99),
+        }
+
+
+class FaultPipeline:
+    """Run the faults of a plant config on an async stream of samples.
+
+    Samples are queued and grouped into micro batches of up to max_batch
+    samples or max_delay seconds after the first one, each batch is
+    evaluated by StreamingFaults in an executor so the event loop keeps
+    taking samples. The queue holds max_queue samples, put() waits while
+    it is full so a source faster than the evaluation is slowed down
+    instead of growing memory. sink gets the flags dict of every batch,
+    a plain or async function.
+    """
+
+    def __init__(self, config, sink=None, max_batch: int = 1000,
+                 max_delay: float = 1.0, max_queue: int = 10_000,
+                 executor=None):
+        self.stream = StreamingFaults(config)
+        self.sink = sink
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.executor = executor
+        self.max_queue = max_queue
+        # made on first use inside the running event loop
+        self.queue = None
+        self.metrics = PipelineMetrics()
+
+    def _queue(self) -> asyncio.Queue:
+        if self.queue is None:
+            self.queue = asyncio.Queue(maxsize=self.max_queue)
+        return self.queue
+
+    async def put(self, timestamp, sample: dict):
+        """Queue one sample, waits while the queue is full."""
+        loop = asyncio.get_running_loop()
+        if self._queue().full():
+            self.metrics.blocked_puts += 1
+        await self.queue.put((timestamp, sample, loop.time()))
+        self._track_depth()
+
+    async def close(self):
+        """Evaluate what is queued, then stop consume()."""
+        await self._queue().put(_END)
+
+    def _drain(self):
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+    def _track_depth(self):
+        depth = self.queue.qsize()
+        self.metrics.queue_depth = depth
+        self.metrics.max_queue_depth = max(self.metrics.max_queue_depth, depth)
+
+    async def _next_batch(self):
+        # wait for a first sample, then fill up to max_batch or max_delay
+        loop = asyncio.get_running_loop()
+        item = await self.queue.get()
+        if item is _END:
+            return [], True
+
+        batch = [item]
+        deadline = loop.time() + self.max_delay
+        while len(batch) < self.max_batch:
+            if self.queue.empty():
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            else:
+                item = self.queue.get_nowait()
+            if item is _END:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def _emit(self, results: dict):
+        if self.sink is not None:
+            result = self.sink(results)
+            if asyncio.iscoroutine(result):
+                await result
+
+    async def _evaluate(self, batch: list):
+        loop = asyncio.get_running_loop()
+        index = pd.DatetimeIndex([timestamp for timestamp, _, _ in batch])
+        chunk = pd.DataFrame([sample for _, sample, _ in batch], index=index)
+        try:
+            results = await loop.run_in_executor(
+                self.executor, self.stream.update, chunk)
+        except Exception as e:
+            # a bad batch is counted and skipped, the service keeps going
+            self.metrics.errors += 1
+            self.metrics.last_error = f"{type(e).__name__}: {e}"
+            return
+
+        await self._emit(results)
+        done = loop.time()
+        self.metrics.latencies.extend(done - arrived for _, _, arrived in batch)
+        self.metrics.samples += len(batch)
+        self.metrics.batches += 1
+
+    async def consume(self):
+        """Evaluate batches until close(), then flush the open windows."""
+        self.stream.reset()
+        self._queue()
+        ended = False
+        while not ended:
+            batch, ended = await self._next_batch()
+            self._track_depth()
+            if batch:
+                await self._evaluate(batch)
+        await self._emit(self.stream.flush())
+
+    async def run(self, source):
+        """Feed an async source of (timestamp, sample) through the faults."""
+        consumer = asyncio.ensure_future(self.consume())
+        # a failed consumer empties the queue so put() does not wait forever
+        consumer.add_done_callback(lambda _: self._drain())
+        try:
+            async for timestamp, sample in source:
+                if consumer.done():
+                    break
+                await self.put(timestamp, sample)
+            if not consumer.done():
+                await self.close()
+            await consumer
+        finally:
+            if not consumer.done():
+                consumer.cancel()
+        return self.metrics
@@ -0,0 +1,125 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from faults import kernels
+from faults.cycling import CycleCounter, cycling_flag
+from faults.instrument import phase
+from faults.persistence import persist_flag
+from faults.plant import BoilerPlantFaults
+
+
+# samples before a shard its masks look back on. The cycling edges
+# need the mode of the previous sample, and for FC14 that mode is
+# itself a change from the sample before it
+HALO = 2
+
+
+def shard_bounds(n: int, shards: int) -> list:
+    """(start, stop) row positions of shards of about equal length."""
+    edges = np.linspace(0, n, max(min(shards, n), 1) + 1).astype(int)
+    return [(int(start), int(stop))
+            for start, stop in zip(edges[:-1], edges[1:]) if stop > start]
+
+
+def _apply_shard(plant, df: pd.DataFrame, halo: int, origin) -> tuple:
+    # flags before persist and the cycle counts of one shard, the first
+    # halo rows belong to the shard before and are only looked back on
+    plant.validate(df)
+    computed = plant.compute_masks(df)
+
+    flags = {flag: kernels.all_of(computed[mask] for mask in masks)[halo:]
+             for flag, masks in plant.flags.items()}
+
+    counts = {}
+    for flag, (masks, _, window) in plant.cycling.items():
+        counter = CycleCounter(window, origin)
+        modes = {mask: computed[mask] for mask in masks}
+        if halo:
+            counter.update(df.index[:halo],
+                           {mask: mode[:halo] for mask, mode in modes.items()})
+            # the halo's starts were counted by the shard before, only
+            # its window and last mode carry over
+            counter.open_counts = {}
+        closed = counter.update(
+            df.index[halo:], {mask: mode[halo:] for mask, mode in modes.items()})
+        counts[flag] = pd.concat([closed, counter.flush()])
+    return flags, counts
+
+
+class ShardedPlantFaults(BoilerPlantFaults):
+    """BoilerPlantFaults.apply() on time shards of one long series in parallel.
+
+    The dataframe is split by time into shards, each evaluated with HALO
+    samples before it so the previous sample comparisons of FC12 - FC14
+    are right at the shard edges. Cycle counts of a window split between
+    two shards are added together and persist runs over the stitched
+    flags, so the results are the same as a serial apply(). pool is
+    "process" or "thread", the comparisons release the GIL so threads
+    avoid pickling the shards when the data is large. workers=0 runs
+    the shards in this process. shards defaults to workers.
+    """
+
+    def __init__(self, config: dict, workers: int = None, shards: int = None,
+                 pool: str = "process", instrument=None, flag_dtype=int):
+        if pool not in ("process", "thread"):
+            raise ValueError(f"pool must be 'process' or 'thread' not {pool!r}")
+        super().__init__(config, instrument=instrument, flag_dtype=flag_dtype)
+        self.workers = workers
+        self.shards = shards
+        self.pool = pool
+
+    def _executor(self):
+        if self.pool == "thread":
+            return ThreadPoolExecutor(max_workers=self.workers)
+        return ProcessPoolExecutor(max_workers=self.workers)
+
+    def _run_shards(self, df: pd.DataFrame) -> list:
+        shards = self.shards or self.workers or os.cpu_count() or 1
+        # windows are anchored on midnight of the first day of the
+        # whole series, not of each shard
+        origin = df.index[0].normalize() if len(df) else None
+        jobs = []
+        for start, stop in shard_bounds(len(df), shards):
+            halo = min(HALO, start)
+            jobs.append((df.iloc[start - halo:stop], halo))
+
+        if self.workers == 0 or len(jobs) < 2:
+            return [_apply_shard(self, shard, halo, origin)
+                    for shard, halo in jobs]
+        with self._executor() as pool:
+            futures = [pool.submit(_apply_shard, self, shard, halo, origin)
+                       for shard, halo in jobs]
+            return [future.result() for future in futures]
+
+    def apply(self, df: pd.DataFrame) -> dict:
+        """Return a dict of flag name to flag series, like the serial apply()."""
+        def timed(name):
+            return phase(self.instrument, "plant", name, len(df))
+
+        df = df[self.columns]
+        with timed("shards"):
+            parts = self._run_shards(df) if len(df) else []
+        if not parts:
+            return super().apply(df)
+
+        results = {}
+        with timed("merge"):
+            for flag in self.flags:
+                out = np.concatenate([flags[flag] for flags, _ in parts])
+                if flag in self.persistence:
+                    out, _ = persist_flag(
+                        out, df.index, *self.persistence[flag])
+                results[flag] = pd.Series(
+                    out.astype(self.flag_dtype), index=df.index, name=flag)
+
+            for flag, (_, os_max, window) in self.cycling.items():
+                # a window split between shards is in both, add them up
+                counts = pd.concat([part[flag] for _, part in parts])
+                counts = counts.groupby(level=0, sort=False).sum()
+                counts.index = pd.DatetimeIndex(counts.index, freq=window)
+                results[flag] = cycling_flag(counts, os_max, flag).astype(
+                    self.flag_dtype)
+        return results
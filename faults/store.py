@@ -0,0 +1,238 @@
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from faults.episodes import EPISODE_COLUMNS, flags_to_episodes
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS flags (
+    site TEXT NOT NULL,
+    flag TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    value INTEGER NOT NULL,
+    PRIMARY KEY (site, flag, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS episodes (
+    site TEXT NOT NULL,
+    flag TEXT NOT NULL,
+    start INTEGER NOT NULL,
+    end INTEGER NOT NULL,
+    duration INTEGER NOT NULL,
+    samples INTEGER NOT NULL,
+    PRIMARY KEY (site, flag, start)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS episodes_by_flag ON episodes (flag, start, end);
+CREATE INDEX IF NOT EXISTS flags_by_flag ON flags (flag, ts);
+"""
+
+
+def _flag_name(fault: str) -> str:
+    # "fc6" or "fc6_flag", device flags are stored by their full name
+    return fault if "_flag" in fault else f"{fault}_flag"
+
+
+def _ns(stamps) -> np.ndarray:
+    # nanoseconds since the epoch, UTC for tz aware times
+    return pd.DatetimeIndex(stamps).as_unit("ns").asi8
+
+
+def _time(value) -> int:
+    return int(_ns([pd.Timestamp(value)])[0])
+
+
+def _chunks(rows, size: int):
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+def result_span(results: dict) -> dict:
+    """flags, start and end of a results dict for write_episodes()."""
+    starts = [series.index[0] for series in results.values() if len(series)]
+    ends = [series.index[-1] for series in results.values() if len(series)]
+    return {"flags": list(results),
+            "start": min(starts) if starts else None,
+            "end": max(ends) if ends else None}
+
+
+class FaultStore:
+    """Fault flags and episodes of many sites in one SQLite file.
+
+    Times are stored as integer nanoseconds since the epoch (UTC for tz
+    aware data), durations as nanoseconds. Flags are keyed by site, flag
+    and time and episodes by site, flag and start, with a second index
+    on flag and time so time window queries across sites use an index.
+    Writing a site again replaces its stored rows of the written flags
+    over the written time span. Writes go in batches of batch_size rows
+    per executemany inside one transaction per call.
+    """
+
+    def __init__(self, path, batch_size: int = 50_000):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.conn = sqlite3.connect(self.path)
+        # write ahead log, readers do not block the batch writer
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _replace(self, table: str, time_cols: tuple, spans: list, rows: list):
+        # the old rows of every (site, flag, start, end) span go in the
+        # same transaction the new rows come in, a re-run leaves nothing
+        # of the run before it in the spans it covers
+        marks = ", ".join("?" * len(rows[0])) if rows else ""
+        start_col, end_col = time_cols
+        with self.conn:
+            self.conn.executemany(
+                f"DELETE FROM {table} WHERE site = ? AND flag = ? "
+                f"AND {end_col} >= ? AND {start_col} <= ?", spans)
+            for chunk in _chunks(rows, self.batch_size):
+                self.conn.executemany(
+                    f"INSERT OR REPLACE INTO {table} VALUES ({marks})", chunk)
+
+    def write_flags(self, site: str, results: dict, all_samples: bool = False):
+        """Store flag series, by default only the flagged samples.
+
+        results maps flag names to series, like BoilerPlantFaults.apply()
+        returns. Stored samples of the site and flags between the first
+        and last time of each series are replaced. Returns the number of
+        rows written.
+        """
+        rows, spans = [], []
+        for flag, series in results.items():
+            values = np.asarray(series.to_numpy(), dtype=np.int64)
+            stamps = _ns(series.index)
+            if len(stamps):
+                spans.append((site, flag, int(stamps.min()), int(stamps.max())))
+            if not all_samples:
+                keep = values != 0
+                values, stamps = values[keep], stamps[keep]
+            rows.extend(zip([site] * len(values), [flag] * len(values),
+                            stamps.tolist(), values.tolist()))
+        self._replace("flags", ("ts", "ts"), spans, rows)
+        return len(rows)
+
+    def write_episodes(self, site: str, episodes: pd.DataFrame, flags=None,
+                       start=None, end=None):
+        """Store episodes with a flag column, see flags_to_episodes().
+
+        Stored episodes of the site and flags (by default the flags in
+        episodes) overlapping [start, end] are replaced, pass the flags
+        and time span that were evaluated so a re-run with fewer or
+        shorter episodes removes the old ones. start and end default to
+        the span of the episodes. Returns the number of rows written.
+        """
+        starts, ends = _ns(episodes["start"]), _ns(episodes["end"])
+        if flags is None:
+            flags = episodes["flag"].astype(str).unique().tolist()
+        start = _time(start) if start is not None else \
+            int(starts.min()) if len(starts) else None
+        end = _time(end) if end is not None else \
+            int(ends.max()) if len(ends) else None
+        spans = [] if start is None or end is None else \
+            [(site, flag, start, end) for flag in flags]
+
+        rows = list(zip(
+            [site] * len(episodes), episodes["flag"].astype(str).tolist(),
+            starts.tolist(), ends.tolist(),
+            pd.to_timedelta(episodes["duration"]).to_numpy()
+            .astype("m8[ns]").astype(np.int64).tolist(),
+            episodes["samples"].astype(np.int64).tolist()))
+        self._replace("episodes", ("start", "end"), spans, rows)
+        return len(rows)
+
+    def write_results(self, site: str, results: dict, flags: bool = False,
+                      periods: dict = None):
+        """Store the episodes of a results dict, and its flags with flags.
+
+        Replaces what is stored for the site and flags over the time
+        span of the results. periods is passed to flags_to_episodes().
+        """
+        written = self.write_episodes(
+            site, flags_to_episodes(results, periods=periods),
+            **result_span(results))
+        if flags:
+            written += self.write_flags(site, results)
+        return written
+
+    def _where(self, site=None, fault=None, start=None, end=None,
+               start_col="start", end_col="end") -> tuple:
+        clauses, params = [], []
+        if site is not None:
+            clauses.append("site = ?")
+            params.append(site)
+        if fault is not None:
+            clauses.append("flag = ?")
+            params.append(_flag_name(fault))
+        # overlapping the window [start, end)
+        if start is not None:
+            clauses.append(f"{end_col} >= ?")
+            params.append(_time(start))
+        if end is not None:
+            clauses.append(f"{start_col} < ?")
+            params.append(_time(end))
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        return where, params
+
+    def _frame(self, sql: str, params: list) -> pd.DataFrame:
+        return pd.read_sql_query(sql, self.conn, params=params)
+
+    def episodes(self, site=None, fault=None, start=None, end=None,
+                 tz=None) -> pd.DataFrame:
+        """Episodes overlapping [start, end), of one site or fault or all."""
+        where, params = self._where(site, fault, start, end)
+        episodes = self._frame(
+            "SELECT site, flag, start, end, duration, samples FROM episodes"
+            f"{where} ORDER BY start, site, flag", params)
+        for col in ("start", "end"):
+            episodes[col] = pd.to_datetime(episodes[col], unit="ns", utc=tz is not None)
+            if tz is not None:
+                episodes[col] = episodes[col].dt.tz_convert(tz)
+        episodes["duration"] = pd.to_timedelta(episodes["duration"], unit="ns")
+        return episodes[["site", "flag"] + EPISODE_COLUMNS]
+
+    def flags(self, site: str, fault: str, start=None, end=None,
+              tz=None) -> pd.Series:
+        """Stored flag samples of one site and fault in [start, end)."""
+        where, params = self._where(site, fault, start, end,
+                                    start_col="ts", end_col="ts")
+        rows = self._frame(f"SELECT ts, value FROM flags{where} ORDER BY ts",
+                           params)
+        index = pd.to_datetime(rows["ts"], unit="ns", utc=tz is not None)
+        if tz is not None:
+            index = index.dt.tz_convert(tz)
+        return pd.Series(rows["value"].to_numpy(), index=pd.DatetimeIndex(index),
+                         name=_flag_name(fault))
+
+    def sites_with(self, fault: str, start=None, end=None) -> list:
+        """Sites with an episode of the fault overlapping [start, end)."""
+        where, params = self._where(fault=fault, start=start, end=end)
+        rows = self.conn.execute(
+            f"SELECT DISTINCT site FROM episodes{where} ORDER BY site", params)
+        return [site for site, in rows]
+
+    def top_offenders(self, fault=None, start=None, end=None, n: int = 10,
+                      by: str = "hours") -> pd.DataFrame:
+        """The n site and flag pairs with the most fault hours or episodes.
+
+        Counts every episode overlapping [start, end) in full.
+        """
+        if by not in ("hours", "episodes"):
+            raise ValueError(f"by must be 'hours' or 'episodes' not {by!r}")
+        where, params = self._where(fault=fault, start=start, end=end)
+        return self._frame(
+            "SELECT site, flag, COUNT(*) AS episodes, "
+            "SUM(duration) / 3.6e12 AS hours FROM episodes"
+            f"{where} GROUP BY site, flag ORDER BY {by} DESC, site LIMIT ?",
+            params + [n])
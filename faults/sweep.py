@@ -0,0 +1,223 @@
+import copy
+
+import numpy as np
+import pandas as pd
+
+from faults.conditions import (
+    CyclingFaultCondition,
+    FaultConditionOne,
+    FaultConditionTwo,
+    FaultConditionThree,
+    FaultConditionFour,
+    FaultConditionFive,
+    FaultConditionSix,
+    FaultConditionSeven,
+    FaultConditionEight,
+    FaultConditionNine,
+    FaultConditionTen,
+    FaultConditionEleven,
+)
+from faults import kernels
+from faults.cycling import cycle_counts
+from faults.episodes import sample_period, to_timedelta
+from faults.plant import reject_devices
+
+
+def _mix_margin(flow, temp, header):
+    # abs((flow * temp) / flow - header), nan without flow
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.abs((flow * temp) / flow - header)
+
+
+# fault class -> swept argument -> (helper mask the argument is in,
+# comparison, margin(fault, column arrays), threshold transform). A row
+# with the other helper masks true is flagged when margin <op> value.
+_SWEEPS = {
+    FaultConditionOne: {
+        "pump_diff_press_err_thres": (
+            "pump_diff_press_check", ">",
+            lambda f, c: c[f.pump_diff_press_setpoint_col] -
+            c[f.pump_diff_press_col], None),
+    },
+    FaultConditionTwo: {
+        "flow_meter_err_thres": (
+            "flow_meter_check", ">", lambda f, c: c[f.flow_meter_col], None),
+    },
+    FaultConditionFour: {
+        "pump_diff_press_err_thres": (
+            "pump_diff_press_check", ">",
+            lambda f, c: c[f.pump_diff_press_setpoint_col] -
+            c[f.pump_diff_press_col], None),
+        "vfd_speed_percent_err_thres": (
+            "pump_check", "<=",
+            lambda f, c: f.vfd_speed_percent_max - c[f.pump_vfd_speed_col],
+            None),
+    },
+    FaultConditionFive: {
+        "flow_meter_err_thres": (
+            "flowmeter_check", ">",
+            lambda f, c: f.hot_water_min_flow_stp - c[f.flow_meter_col], None),
+        "hot_water_min_flow_stp": (
+            "flowmeter_check", "<",
+            lambda f, c: c[f.flow_meter_col] + f.flow_meter_err_thres, None),
+        "hot_water_bypass_vlv_err_thres": (
+            "bypass_vlv_check", "<=",
+            lambda f, c: .99 - c[f.hot_water_bypass_vlv_cmd_col], None),
+    },
+    FaultConditionSix: {
+        "hot_water_temp_err_thres": (
+            "hw_spt_check", ">",
+            lambda f, c: c[f.hot_water_supply_temp_spt_col] -
+            c[f.hot_water_supply_temp_col], None),
+    },
+    FaultConditionSeven: {
+        "expansion_tank_press_stp": (
+            "hw_sys_static_press_check", "<",
+            lambda f, c: c[f.hot_water_sys_gauge_pres_col],
+            lambda values: values * .9),
+    },
+    FaultConditionEight: {
+        "hot_water_temp_err_thres": (
+            "boiler_condensing_check", ">",
+            lambda f, c: c[f.hot_water_return_temp_col] -
+            f.boiler_condensing_temp, None),
+        "boiler_condensing_temp": (
+            "boiler_condensing_check", ">",
+            lambda f, c: c[f.hot_water_return_temp_col] -
+            f.hot_water_temp_err_thres, None),
+    },
+    FaultConditionNine: {
+        "hot_water_temp_err_thres": (
+            "boiler_condensing_check", ">",
+            lambda f, c: f.boiler_condensing_temp -
+            c[f.hot_water_return_temp_col], None),
+        "boiler_condensing_temp": (
+            "boiler_condensing_check", "<",
+            lambda f, c: c[f.hot_water_return_temp_col] +
+            f.hot_water_temp_err_thres, None),
+    },
+    FaultConditionTen: {
+        "hot_water_temp_err_thres": (
+            "boiler_vs_header_check", ">",
+            lambda f, c: _mix_margin(
+                c[f.flow_meter_col], c[f.boiler_leaving_temp_col],
+                c[f.hot_water_supply_temp_col]), None),
+    },
+    FaultConditionEleven: {
+        "hot_water_temp_err_thres": (
+            "boiler_vs_header_check", ">",
+            lambda f, c: _mix_margin(
+                c[f.flow_meter_col], c[f.boiler_enter_temp_col],
+                c[f.hot_water_return_temp_col]), None),
+    },
+}
+_SWEEPS[FaultConditionThree] = _SWEEPS[FaultConditionTwo]
+
+
+def sweep_params(fault) -> list:
+    """The constructor arguments sweep() can vary for this fault."""
+    if isinstance(fault, CyclingFaultCondition):
+        return [_os_max_param(fault)]
+    return list(_SWEEPS[type(fault)])
+
+
+def _os_max_param(fault) -> str:
+    return [name for name in vars(fault) if name.endswith("os_max")][0]
+
+
+def count_where(sorted_margin: np.ndarray, op: str, values) -> np.ndarray:
+    """How many of the sorted margins are <op> each value."""
+    n = len(sorted_margin)
+    if op == ">":
+        return n - np.searchsorted(sorted_margin, values, side="right")
+    if op == ">=":
+        return n - np.searchsorted(sorted_margin, values, side="left")
+    if op == "<":
+        return np.searchsorted(sorted_margin, values, side="left")
+    if op == "<=":
+        return np.searchsorted(sorted_margin, values, side="right")
+    raise ValueError(f"unknown comparison {op!r}")
+
+
+def _near_threshold(margin: np.ndarray, thresholds, arrays: dict) -> tuple:
+    # the margins are rewrites of the kernel comparisons, a - b > t for
+    # b < a - t, and round differently only within a few ulps of the
+    # operands. The band is bounded generously, the rows in it are checked
+    # again with the kernel itself
+    scale = [1.0, np.max(np.abs(thresholds), initial=0)]
+    for values in [margin, *arrays.values()]:
+        values = np.abs(np.asarray(values, dtype=float))
+        scale.append(np.max(values[np.isfinite(values)], initial=0))
+    tol = 1e-9 * max(scale)
+    return (np.searchsorted(margin, thresholds - tol, side="left"),
+            np.searchsorted(margin, thresholds + tol, side="right"))
+
+
+def _exact_counts(fault, param, mask_name, arrays, rows, values, lo, hi):
+    # flags of the rows sorted lo:hi with the kernel at each value
+    counts = np.zeros(len(values), dtype=np.int64)
+    fault = copy.copy(fault)
+    for i in np.flatnonzero(hi > lo):
+        near = rows[lo[i]:hi[i]]
+        setattr(fault, param, values[i])
+        mask = fault.kernel_masks(
+            {col: array[near] for col, array in arrays.items()})[mask_name]
+        counts[i] = np.count_nonzero(mask)
+    return counts
+
+
+def sweep(fault, df: pd.DataFrame, param: str, values,
+          hours: bool = False) -> pd.Series:
+    """Fault counts for every value of one threshold in one pass.
+
+    The margin each row has to the threshold is computed and sorted
+    once, then the count for all values is a searchsorted, so a 1,000
+    value sweep costs about one evaluation. Rows whose margin is within
+    rounding of a value are flagged again with the fault's own kernel,
+    so the counts are the same as evaluate() at each value. Counts are
+    flagged samples, or for FC12 - FC14 (sweeping os_max) flagged
+    windows; hours gives fault hours instead. Flags are before persist
+    and clear. Returns a series indexed by the values.
+    """
+    reject_devices({fault.flag_col[:-len("_flag")]: fault})
+    fault.validate(df)
+    values = np.asarray(values, dtype=float)
+    params = sweep_params(fault)
+    if param not in params:
+        raise ValueError(
+            f"{type(fault).__name__} can sweep {params} not {param!r}")
+
+    if isinstance(fault, CyclingFaultCondition):
+        # whole window counts, no rounding
+        counts = cycle_counts(df.index, fault.helper_masks(df), fault.window)
+        margin = counts.to_numpy().max(axis=1, initial=0)
+        margin = np.sort(margin)
+        result = count_where(margin, ">", values)
+        period = to_timedelta(fault.window)
+    else:
+        mask_name, op, margin_fn, transform = _SWEEPS[type(fault)][param]
+        arrays = {col: df[col].to_numpy() for col in fault.columns()}
+        others = [mask for name, mask in fault.kernel_masks(arrays).items()
+                  if name != mask_name]
+        margin = np.asarray(margin_fn(fault, arrays), dtype=float)
+        margin = np.broadcast_to(margin, (len(df),))
+        keep = ~np.isnan(margin)
+        if others:
+            keep &= kernels.all_of(others)
+        rows = np.flatnonzero(keep)
+        order = np.argsort(margin[rows], kind="stable")
+        rows, margin = rows[order], margin[rows[order]]
+
+        thresholds = values if transform is None else transform(values)
+        lo, hi = _near_threshold(margin, thresholds, arrays)
+        # outside the band the margin decides, inside the kernel does
+        result = len(margin) - hi if op in (">", ">=") else lo
+        result = result + _exact_counts(
+            fault, param, mask_name, arrays, rows, values, lo, hi)
+        period = sample_period(df.index)
+
+    result = pd.Series(result, index=pd.Index(values, name=param),
+                       name=fault.flag_col)
+    if hours:
+        return result * (period / pd.Timedelta(hours=1))
+    return result
@@ -0,0 +1,172 @@
+import numpy as np
+import pandas as pd
+
+from faults.episodes import to_timedelta
+
+
+# plant config for the synthetic columns, same keyword arguments as the
+# fault condition classes
+PLANT_CONFIG = {
+    "fc1": dict(pump_diff_press_err_thres=0.5, pump_diff_press_col="pump_dp",
+                pump_status_bool_col="pump_status",
+                pump_diff_press_setpoint_col="pump_dp_spt"),
+    "fc2": dict(flow_meter_err_thres=1.0, flow_meter_col="flow",
+                pump_status_bool_col="pump_status"),
+    "fc3": dict(flow_meter_err_thres=2.0, flow_meter_col="flow",
+                pump_status_bool_col="pump_status"),
+    "fc4": dict(vfd_speed_percent_err_thres=0.05, vfd_speed_percent_max=0.99,
+                pump_diff_press_err_thres=0.5, pump_diff_press_col="pump_dp",
+                pump_vfd_speed_col="pump_vfd",
+                pump_diff_press_setpoint_col="pump_dp_spt"),
+    "fc5": dict(flow_meter_err_thres=1.0, hot_water_min_flow_stp=20.0,
+                hot_water_bypass_vlv_err_thres=0.05, flow_meter_col="flow",
+                hot_water_bypass_vlv_cmd_col="bypass_vlv",
+                pump_status_bool_col="pump_status"),
+    "fc6": dict(hot_water_temp_err_thres=2.0, hot_water_supply_temp_col="hws",
+                hot_water_supply_temp_spt_col="hws_spt",
+                pump_status_bool_col="pump_status"),
+    "fc7": dict(expansion_tank_press_stp=12.0,
+                hot_water_sys_gauge_pres_col="gauge_press",
+                pump_status_bool_col="pump_status"),
+    "fc8": dict(hot_water_temp_err_thres=2.0, boiler_condensing_temp=130.0,
+                hot_water_return_temp_col="hwr",
+                pump_status_bool_col="pump_status"),
+    "fc9": dict(hot_water_temp_err_thres=2.0, boiler_condensing_temp=130.0,
+                hot_water_return_temp_col="hwr",
+                pump_status_bool_col="pump_status"),
+    "fc10": dict(hot_water_temp_err_thres=2.0, flow_meter_col="flow",
+                 boiler_leaving_temp_col="boiler_lwt",
+                 hot_water_supply_temp_col="hws",
+                 boiler_status_bool_col="boiler_status"),
+    "fc11": dict(hot_water_temp_err_thres=2.0, flow_meter_col="flow",
+                 boiler_enter_temp_col="boiler_ewt",
+                 hot_water_return_temp_col="hwr",
+                 boiler_status_bool_col="boiler_status"),
+    "fc12": dict(plant_os_max=6, pump_vfd_speed_col="pump_vfd"),
+    "fc13": dict(boiler_os_max=6, boiler_status_bool_col="boiler_status"),
+    "fc14": dict(boiler_stage_os_max=6, boiler_stage_int_col="boiler_stage"),
+}
+
+FAULT_IDS = list(PLANT_CONFIG)
+
+
+def _normal_plant(rng, n: int, minutes: np.ndarray) -> dict:
+    # a plant running fine, pumps and boiler on with slow load swings
+    load = 0.5 + 0.3 * np.sin(2 * np.pi * minutes / 1440.0)
+    load = np.clip(load + rng.normal(0.0, 0.02, n), 0.2, 0.9)
+    flow = 20.0 + 40.0 * load + rng.normal(0.0, 0.5, n)
+    hws_spt = np.full(n, 180.0)
+    hws = hws_spt + rng.normal(0.0, 0.3, n)
+    hwr = 130.0 + rng.normal(0.0, 0.3, n)
+    return {
+        "pump_dp": 10.0 + rng.normal(0.0, 0.1, n),
+        "pump_dp_spt": np.full(n, 10.0),
+        "pump_status": np.ones(n, dtype=np.int64),
+        "pump_vfd": load,
+        "flow": flow,
+        "bypass_vlv": np.clip(rng.normal(0.05, 0.02, n), 0.0, 0.5),
+        "hws": hws,
+        "hws_spt": hws_spt,
+        "hwr": hwr,
+        "gauge_press": 14.0 + rng.normal(0.0, 0.2, n),
+        "boiler_lwt": hws + rng.normal(0.0, 0.3, n),
+        "boiler_ewt": hwr + rng.normal(0.0, 0.3, n),
+        "boiler_status": np.ones(n, dtype=np.int64),
+        # one stage step up or down every few hours
+        "boiler_stage": 1 + (minutes // 240).astype(np.int64) % 3,
+    }
+
+
+def _inject(fault_id: str, data: dict, at: np.ndarray):
+    # make the fault condition true at the sample positions in at, the
+    # other faults stay quiet
+    if fault_id == "fc1":
+        data["pump_status"][at] = 0
+        data["pump_dp"][at] = 0.0
+        data["flow"][at] = 0.0
+    elif fault_id in ("fc2", "fc3"):
+        data["pump_status"][at] = 0
+    elif fault_id == "fc4":
+        data["pump_vfd"][at] = 1.0
+        data["pump_dp"][at] = 5.0
+    elif fault_id == "fc5":
+        data["flow"][at] = 5.0
+        data["bypass_vlv"][at] = 1.0
+    elif fault_id == "fc6":
+        data["hws"][at] = data["hws_spt"][at] - 10.0
+        data["boiler_lwt"][at] = data["hws"][at]
+    elif fault_id == "fc7":
+        data["gauge_press"][at] = 6.0
+    elif fault_id == "fc8":
+        data["hwr"][at] = 145.0
+        data["boiler_ewt"][at] = 145.0
+    elif fault_id == "fc9":
+        data["hwr"][at] = 115.0
+        data["boiler_ewt"][at] = 115.0
+    elif fault_id == "fc10":
+        data["boiler_lwt"][at] = data["hws"][at] + 10.0
+    elif fault_id == "fc11":
+        data["boiler_ewt"][at] = data["hwr"][at] - 10.0
+    elif fault_id == "fc12":
+        data["pump_vfd"][at[::2]] = 0.0
+    elif fault_id == "fc13":
+        data["boiler_status"][at[::2]] = 0
+    elif fault_id == "fc14":
+        # a step every other sample, back to back changes are one start
+        up = np.concatenate((at[::4], at[1::4]))
+        data["boiler_stage"][up] = 3 - data["boiler_stage"][up] % 2
+    else:
+        raise ValueError(f"unknown fault {fault_id!r}")
+
+
+def _episode_positions(rng, n: int, rate: float, length: int) -> np.ndarray:
+    # random fault episodes of length samples covering about rate of n
+    episodes = int(n * rate) // length
+    if not episodes or length > n:
+        return np.zeros(0, dtype=np.int64)
+    starts = np.sort(rng.choice(n - length + 1, episodes, replace=False))
+    return np.unique((starts[:, None] + np.arange(length)).ravel())
+
+
+def synthetic_plant(n: int = 10_000, freq="1min", start="2023-01-01",
+                    seed: int = 0, faults=FAULT_IDS, fault_rate: float = 0.01,
+                    fault_length: int = 30, offset: int = 0,
+                    return_injected: bool = False):
+    """Deterministic boiler plant trend log with injected faults.
+
+    Columns are the ones PLANT_CONFIG expects. Every fault id in faults
+    gets random episodes of fault_length samples covering about
+    fault_rate of the rows, with return_injected a dict of fault id to
+    the injected timestamps is returned too. The same arguments always
+    give the same data.
+    offset starts the index offset samples after start, used by
+    iter_synthetic_plant() for the chunks of one long log.
+    """
+    rng = np.random.default_rng([seed, offset])
+    step = to_timedelta(freq)
+    minutes = (offset + np.arange(n)) * (step / pd.Timedelta(minutes=1))
+    data = _normal_plant(rng, n, minutes)
+
+    injected = {}
+    for fault_id in faults:
+        at = _episode_positions(rng, n, fault_rate, fault_length)
+        _inject(fault_id, data, at)
+        injected[fault_id] = at
+
+    index = pd.date_range(pd.Timestamp(start) + offset * step, periods=n,
+                          freq=step)
+    df = pd.DataFrame(data, index=index)
+    if return_injected:
+        return df, {fault_id: index[at] for fault_id, at in injected.items()}
+    return df
+
+
+def iter_synthetic_plant(n: int, chunksize: int = 1_000_000, **kwargs):
+    """synthetic_plant() of n rows in chunks, for logs too large for memory.
+
+    Deterministic for the same n, chunksize and arguments, the chunks
+    continue one index.
+    """
+    for offset in range(0, n, chunksize):
+        yield synthetic_plant(min(chunksize, n - offset), offset=offset,
+                              **kwargs)
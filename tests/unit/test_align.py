@@ -0,0 +1,107 @@
+from faults.align import align_points, points_from_long
+from faults.plant import BoilerPlantFaults
+import numpy as np
+import pandas as pd
+import pytest
+
+from tests.unit.test_boiler_plant import CONFIG, plant_df
+
+'''
+to see print statements in pytest run with
+$ pytest tests/unit/test_align.py -rP
+
+points trended at their own rates are aligned asof onto one timeline
+'''
+
+FC2_FC13 = {"fc2": CONFIG["fc2"], "fc13": CONFIG["fc13"]}
+
+
+def multi_rate_points(df):
+    # flow every 5 samples, statuses only when they change
+    points = {"flow": df["flow"].iloc[::5]}
+    for col in ("pump_status", "boiler_status"):
+        points[col] = df[col][df[col].ne(df[col].shift())]
+    return points
+
+
+class TestAlignPoints(object):
+
+    def test_same_as_merge_asof(self):
+        df = plant_df(n=600)
+        points = multi_rate_points(df)
+        aligned = align_points(points, FC2_FC13, freq="2min")
+
+        grid = pd.DataFrame(index=pd.date_range(
+            "2023-01-01", df.index[-1], freq="2min"))
+        for col, series in points.items():
+            expected = pd.merge_asof(grid, series.to_frame(), left_index=True,
+                                     right_index=True)[col]
+            assert (aligned[col].to_numpy() == expected.to_numpy()).all()
+        assert list(aligned.columns) == ["flow", "pump_status", "boiler_status"]
+        assert aligned["pump_status"].dtype == np.uint8
+
+    def test_event_timeline(self):
+        df = plant_df(n=600)
+        points = multi_rate_points(df)
+        aligned = align_points(points, FC2_FC13)
+
+        # every sample any point logged, the change of value points
+        # give back the dense series
+        assert aligned.index.isin(points["flow"].index).any()
+        dense = df.loc[aligned.index]
+        assert (aligned["boiler_status"] == dense["boiler_status"]).all()
+        BoilerPlantFaults(FC2_FC13).apply(aligned)
+
+    @pytest.mark.parametrize("freq", [None, "5min"])
+    def test_tz_aware_bounds(self, freq):
+        df = plant_df(n=600)
+        naive = align_points(multi_rate_points(df), FC2_FC13, freq=freq,
+                             start="2023-01-01 01:00",
+                             end="2023-01-01 05:00")
+        points = multi_rate_points(df.tz_localize("UTC"))
+
+        # naive bounds are wall times in the points' zone
+        aligned = align_points(points, FC2_FC13, freq=freq,
+                               start="2023-01-01 01:00",
+                               end="2023-01-01 05:00")
+        assert aligned.index.tz is not None
+        assert (aligned.index.tz_localize(None) == naive.index).all()
+        assert (aligned.to_numpy() == naive.to_numpy()).all()
+
+        # aware bounds in another zone, and only one of them given
+        central = pd.Timestamp("2023-01-01 05:00", tz="UTC").tz_convert(
+            "US/Central")
+        aligned = align_points(points, FC2_FC13, freq=freq, end=central)
+        assert aligned.index[-1] < central
+        aligned = align_points(points, FC2_FC13, freq=freq,
+                               start="2023-01-01 01:00")
+        assert aligned.index[0] == pd.Timestamp("2023-01-01 01:00", tz="UTC")
+
+    def test_stale_rows_dropped(self):
+        df = plant_df(n=600)
+        points = multi_rate_points(df)
+        # flow logger drops out for an hour
+        flow = points["flow"]
+        points["flow"] = flow[(flow.index < "2023-01-01 03:00") |
+                              (flow.index >= "2023-01-01 04:00")]
+
+        aligned, stale = align_points(points, FC2_FC13, freq="1min",
+                                      max_age={"flow": "10min"},
+                                      return_stale=True)
+        gap = (stale.index >= "2023-01-01 03:06") & \
+            (stale.index < "2023-01-01 04:00")
+        assert stale["flow"][gap].all()
+        assert not stale["boiler_status"].any()
+        assert not aligned.index.isin(stale.index[gap]).any()
+        assert len(aligned) == len(stale) - stale["flow"].sum()
+
+    def test_long_format_and_missing(self):
+        df = plant_df(n=100)
+        long = df[["flow", "pump_status"]].stack().rename("value") \
+            .rename_axis(["timestamp", "point"]).reset_index()
+        points = points_from_long(long)
+        aligned = align_points(points, {"fc2": CONFIG["fc2"]})
+        assert (aligned["flow"] == df["flow"]).all()
+
+        with pytest.raises(KeyError):
+            align_points(points, {"fc13": CONFIG["fc13"]})
@@ -0,0 +1,87 @@
+from faults.batch import load_manifest, run_batch, throughput
+import json
+import pandas as pd
+
+from tests.unit.test_boiler_plant import CONFIG, plant_df
+
+'''
+to see print statements in pytest run with
+$ pytest tests/unit/test_batch.py -rP
+
+multi site batch runs isolate bad sites and write results as they finish
+'''
+
+
+def write_manifest(tmp_path):
+    good = plant_df(seed=1)
+    good.to_csv(tmp_path / "site_a.csv")
+
+    # a second site with its own column names and threshold
+    renamed = plant_df(seed=2).rename(columns={"flow": "hw_flow"})
+    renamed.to_csv(tmp_path / "site_b.csv")
+
+    bad = plant_df(seed=3)
+    bad["pump_status"] = bad["pump_status"] * 0.5
+    bad.to_csv(tmp_path / "site_c.csv")
+
+    manifest = {
+        "defaults": {"fc2": CONFIG["fc2"], "fc13": CONFIG["fc13"]},
+        "sites": [
+            {"site": "site_a", "path": "site_a.csv"},
+            {"site": "site_b", "path": "site_b.csv",
+             "config": {"fc2": {"flow_meter_col": "hw_flow",
+                                "flow_meter_err_thres": 5.0}}},
+            {"site": "site_c", "path": "site_c.csv"},
+        ],
+    }
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps(manifest))
+    return path
+
+
+class TestManifest(object):
+
+    def test_site_overrides_defaults(self, tmp_path):
+        sites = load_manifest(write_manifest(tmp_path))
+        fc2 = sites[1]["config"]["fc2"]
+        assert fc2["flow_meter_col"] == "hw_flow"
+        assert fc2["flow_meter_err_thres"] == 5.0
+        assert fc2["pump_status_bool_col"] == "pump_status"
+        assert sites[0]["config"]["fc2"]["flow_meter_col"] == "flow"
+
+
+class TestRunBatch(object):
+
+    def test_process_pool(self, tmp_path):
+        out_dir = tmp_path / "out"
+        results = run_batch(write_manifest(tmp_path), out_dir, workers=2)
+        by_site = {r["site"]: r for r in results}
+
+        assert by_site["site_a"]["error"] is None
+        assert by_site["site_b"]["error"] is None
+        assert by_site["site_c"]["error"].startswith("TypeError")
+        assert by_site["site_a"]["rows"] == 600
+
+        flags = pd.read_csv(out_dir / "site_b.flags.csv", index_col=0)
+        assert list(flags.columns) == ["fc2_flag"]
+        assert (out_dir / "site_b.cycling.csv").exists()
+        assert not (out_dir / "site_c.flags.csv").exists()
+
+        log = (out_dir / "batch_log.jsonl").read_text().splitlines()
+        assert len(log) == 4
+
+        rates = throughput(results)
+        assert all(rate >= 0 for rate in rates.values())
+
+        # the run ends with the totals and the rate of every worker
+        summary = json.loads(log[-1])["summary"]
+        assert summary["sites"] == 3
+        assert summary["errors"] == 1
+        assert summary["rows"] == sum(r["rows"] for r in results)
+        assert summary["rows_per_second_per_worker"] == {
+            str(pid): rate for pid, rate in rates.items()}
+
+    def test_in_process(self, tmp_path):
+        results = run_batch(write_manifest(tmp_path), tmp_path / "out",
+                            workers=0)
+        assert [r["site"] for r in results] == ["site_a", "site_b", "site_c"]
@@ -4,26 +4,22 @@ import pytest
 
 '''
 to see print statements in pytest run with
-$ pytest tests/unit/test_ahu_fc1.py -rP
+$ pytest tests/unit/test_boiler_fc1.py -rP
 
-duct static pressure low when fan at full speed
+pump diff pressure below setpoint with the pumps off
 '''
 
-TEST_VFD_ERR_THRESHOLD = 0.05
-TEST_VFD_SPEED_MAX = 0.7
-TEST_DUCT_STATIC_ERR_THRESHOLD = 0.1
-TEST_DUCT_STATIC_COL = "duct_static"
-TEST_DUCT_STATIC_SETPOINT_COL = "duct_static_setpoint"
-TEST_SUPPLY_VFD_SPEED_COL = "supply_vfd_speed"
+TEST_DIFF_PRESS_ERR_THRESHOLD = 0.5
+TEST_DIFF_PRESS_COL = "pump_dp"
+TEST_DIFF_PRESS_SETPOINT_COL = "pump_dp_spt"
+TEST_PUMP_STATUS_COL = "pump_status"
 
 
 fc1 = FaultConditionOne(
-    TEST_VFD_ERR_THRESHOLD,
-    TEST_VFD_SPEED_MAX,
-    TEST_DUCT_STATIC_ERR_THRESHOLD,
-    TEST_DUCT_STATIC_COL,
-    TEST_SUPPLY_VFD_SPEED_COL,
-    TEST_DUCT_STATIC_SETPOINT_COL,
+    TEST_DIFF_PRESS_ERR_THRESHOLD,
+    TEST_DIFF_PRESS_COL,
+    TEST_PUMP_STATUS_COL,
+    TEST_DIFF_PRESS_SETPOINT_COL,
 )
 
 
@@ -31,9 +27,9 @@ class TestNoFault(object):
 
     def no_fault_df(self) -> pd.DataFrame:
         data = {
-            TEST_DUCT_STATIC_COL: [1.1],
-            TEST_DUCT_STATIC_SETPOINT_COL: [1.0],
-            TEST_SUPPLY_VFD_SPEED_COL: [0.80],
+            TEST_DIFF_PRESS_COL: [10.1],
+            TEST_DIFF_PRESS_SETPOINT_COL: [10.0],
+            TEST_PUMP_STATUS_COL: [1],
         }
         return pd.DataFrame(data)
 
@@ -49,9 +45,9 @@ class TestFault(object):
 
     def fault_df(self) -> pd.DataFrame:
         data = {
-            TEST_DUCT_STATIC_COL: [.8],
-            TEST_DUCT_STATIC_SETPOINT_COL: [1.0],
-            TEST_SUPPLY_VFD_SPEED_COL: [0.99],
+            TEST_DIFF_PRESS_COL: [8.0],
+            TEST_DIFF_PRESS_SETPOINT_COL: [10.0],
+            TEST_PUMP_STATUS_COL: [0],
         }
         return pd.DataFrame(data)
 
@@ -63,33 +59,33 @@ class TestFault(object):
         assert actual == expected, message
 
 
-class TestFaultOnInt(object):
+class TestFaultOnFloatStatus(object):
 
-    def fault_df_on_output_int(self) -> pd.DataFrame:
+    def fault_df_on_float_status(self) -> pd.DataFrame:
         data = {
-            TEST_DUCT_STATIC_COL: [.8],
-            TEST_DUCT_STATIC_SETPOINT_COL: [1.0],
-            TEST_SUPPLY_VFD_SPEED_COL: [99],
+            TEST_DIFF_PRESS_COL: [8.0],
+            TEST_DIFF_PRESS_SETPOINT_COL: [10.0],
+            TEST_PUMP_STATUS_COL: [0.0],
         }
         return pd.DataFrame(data)
 
-    def test_fault_on_int(self):
-        with pytest.raises(TypeError, 
-                           match=HelperUtils().float_int_check_err(TEST_SUPPLY_VFD_SPEED_COL)):
-            fc1.apply(self.fault_df_on_output_int())
+    def test_fault_on_float_status(self):
+        with pytest.raises(TypeError,
+                           match=HelperUtils().int_check_err(TEST_PUMP_STATUS_COL)):
+            fc1.apply(self.fault_df_on_float_status())
 
 
-class TestFaultOnFloatGreaterThanOne(object):
+class TestFaultOnStatusGreaterThanOne(object):
 
-    def fault_df_on_output_greater_than_one(self) -> pd.DataFrame:
+    def fault_df_on_status_greater_than_one(self) -> pd.DataFrame:
         data = {
-            TEST_DUCT_STATIC_COL: [.8],
-            TEST_DUCT_STATIC_SETPOINT_COL: [1.0],
-            TEST_SUPPLY_VFD_SPEED_COL: [99.0],
+            TEST_DIFF_PRESS_COL: [8.0],
+            TEST_DIFF_PRESS_SETPOINT_COL: [10.0],
+            TEST_PUMP_STATUS_COL: [2],
         }
         return pd.DataFrame(data)
 
-    def test_fault_on_float_greater_than_one(self):
+    def test_fault_on_status_greater_than_one(self):
         with pytest.raises(TypeError,
-                           match=HelperUtils().float_max_check_err(TEST_SUPPLY_VFD_SPEED_COL)):
-            fc1.apply(self.fault_df_on_output_greater_than_one())
+                           match=HelperUtils().int_max_check_err(TEST_PUMP_STATUS_COL)):
+            fc1.apply(self.fault_df_on_status_greater_than_one())
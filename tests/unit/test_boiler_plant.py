@@ -0,0 +1,139 @@
+from faults import HelperUtils
+from faults.plant import BoilerPlantFaults, FAULT_CONDITIONS
+import numpy as np
+import pandas as pd
+import pytest
+
+'''
+to see print statements in pytest run with
+$ pytest tests/unit/test_boiler_plant.py -rP
+
+fused plant evaluator must give the same flags as the individual classes
+'''
+
+CONFIG = {
+    "fc1": dict(pump_diff_press_err_thres=0.5, pump_diff_press_col="dp",
+                pump_status_bool_col="pump_status",
+                pump_diff_press_setpoint_col="dp_spt"),
+    "fc2": dict(flow_meter_err_thres=1.0, flow_meter_col="flow",
+                pump_status_bool_col="pump_status"),
+    "fc3": dict(flow_meter_err_thres=2.0, flow_meter_col="flow",
+                pump_status_bool_col="pump_status"),
+    "fc4": dict(vfd_speed_percent_err_thres=0.05, vfd_speed_percent_max=0.99,
+                pump_diff_press_err_thres=0.5, pump_diff_press_col="dp",
+                pump_vfd_speed_col="pump_vfd",
+                pump_diff_press_setpoint_col="dp_spt"),
+    "fc5": dict(flow_meter_err_thres=1.0, hot_water_min_flow_stp=20.0,
+                hot_water_bypass_vlv_err_thres=0.05, flow_meter_col="flow",
+                hot_water_bypass_vlv_cmd_col="bypass_vlv",
+                pump_status_bool_col="pump_status"),
+    "fc6": dict(hot_water_temp_err_thres=2.0, hot_water_supply_temp_col="hws",
+                hot_water_supply_temp_spt_col="hws_spt",
+                pump_status_bool_col="pump_status"),
+    "fc7": dict(expansion_tank_press_stp=12.0,
+                hot_water_sys_gauge_pres_col="gauge_press",
+                pump_status_bool_col="pump_status"),
+    "fc8": dict(hot_water_temp_err_thres=2.0, boiler_condensing_temp=130.0,
+                hot_water_return_temp_col="hwr",
+                pump_status_bool_col="pump_status"),
+    "fc9": dict(hot_water_temp_err_thres=2.0, boiler_condensing_temp=130.0,
+                hot_water_return_temp_col="hwr",
+                pump_status_bool_col="pump_status"),
+    "fc10": dict(hot_water_temp_err_thres=2.0, flow_meter_col="flow",
+                 boiler_leaving_temp_col="boiler_lwt",
+                 hot_water_supply_temp_col="hws",
+                 boiler_status_bool_col="boiler_status"),
+    "fc11": dict(hot_water_temp_err_thres=2.0, flow_meter_col="flow",
+                 boiler_enter_temp_col="boiler_ewt",
+                 hot_water_return_temp_col="hwr",
+                 boiler_status_bool_col="boiler_status"),
+    "fc12": dict(plant_os_max=13, pump_vfd_speed_col="pump_vfd"),
+    "fc13": dict(boiler_os_max=15, boiler_status_bool_col="boiler_status"),
+    "fc14": dict(boiler_stage_os_max=10, boiler_stage_int_col="boiler_stage"),
+}
+
+
+def plant_df(n=600, seed=0) -> pd.DataFrame:
+    rng = np.random.RandomState(seed)
+    flow = rng.uniform(0.0, 40.0, n)
+    flow[::17] = 0.0
+    vfd = rng.uniform(0.0, 1.0, n)
+    vfd[rng.rand(n) < 0.3] = 0.0
+    data = {
+        "dp": rng.uniform(5.0, 15.0, n),
+        "dp_spt": np.full(n, 10.0),
+        "pump_status": rng.randint(0, 2, n),
+        "pump_vfd": vfd,
+        "flow": flow,
+        "bypass_vlv": rng.uniform(0.0, 1.0, n),
+        "hws": rng.uniform(150.0, 185.0, n),
+        "hws_spt": np.full(n, 180.0),
+        "hwr": rng.uniform(110.0, 150.0, n),
+        "gauge_press": rng.uniform(8.0, 15.0, n),
+        "boiler_lwt": rng.uniform(150.0, 185.0, n),
+        "boiler_ewt": rng.uniform(110.0, 150.0, n),
+        "boiler_status": rng.randint(0, 2, n),
+        "boiler_stage": rng.randint(0, 4, n),
+    }
+    index = pd.date_range("2023-01-01", periods=n, freq="1min")
+    return pd.DataFrame(data, index=index)
+
+
+class TestMatchesIndividualClasses(object):
+
+    @pytest.mark.parametrize("fault_id", list(CONFIG))
+    def test_flag_matches_class(self, fault_id):
+        df = plant_df()
+        results = BoilerPlantFaults(CONFIG).apply(df)
+
+        flag = fault_id + "_flag"
+        expected = FAULT_CONDITIONS[fault_id](**CONFIG[fault_id]).apply(
+            df.copy())[flag]
+        actual = results[flag]
+        message = f"{flag} fused plan does not match {fault_id} class"
+        assert actual.index.equals(expected.index), message
+        assert (actual.to_numpy() == expected.to_numpy()).all(), message
+
+    def test_input_not_modified(self):
+        df = plant_df()
+        before = df.copy()
+        BoilerPlantFaults(CONFIG).apply(df)
+        pd.testing.assert_frame_equal(df, before)
+
+
+class TestPlan(object):
+
+    def test_shared_masks_computed_once(self):
+        plan = BoilerPlantFaults(CONFIG)
+        pump_off = ("eq", "pump_status", 0)
+        pump_on = ("eq", "pump_status", 1)
+        assert plan.masks.count(pump_off) == 1
+        assert plan.masks.count(pump_on) == 1
+        assert plan.checks.count(("int", "pump_status")) == 1
+
+    def test_subset_config(self):
+        plan = BoilerPlantFaults({"fc2": CONFIG["fc2"]})
+        results = plan.apply(plant_df())
+        assert list(results) == ["fc2_flag"]
+        assert plan.columns == ["flow", "pump_status"]
+
+    def test_unknown_fault(self):
+        with pytest.raises(ValueError):
+            BoilerPlantFaults({"fc99": {}})
+
+
+class TestValidation(object):
+
+    def test_float_status_raises(self):
+        df = plant_df()
+        df["pump_status"] = df["pump_status"].astype(float)
+        with pytest.raises(TypeError,
+                           match=HelperUtils().int_check_err("pump_status")):
+            BoilerPlantFaults(CONFIG).apply(df)
+
+    def test_vfd_percent_raises(self):
+        df = plant_df()
+        df["pump_vfd"] = df["pump_vfd"] * 100.0
+        with pytest.raises(TypeError,
+                           match=HelperUtils().float_max_check_err("pump_vfd")):
+            BoilerPlantFaults(CONFIG).apply(df)
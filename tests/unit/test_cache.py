@@ -0,0 +1,114 @@
+from faults.cache import ResultCache
+from faults.episodes import to_episodes
+from faults.plant import build_faults
+import faults.cache
+import pandas as pd
+import pytest
+
+from tests.unit.test_boiler_plant import CONFIG, plant_df
+
+'''
+to see print statements in pytest run with
+$ pytest tests/unit/test_cache.py -rP
+
+cached flags and episodes must match a fresh run and only miss
+for the faults whose data or thresholds changed
+'''
+
+
+class TestResultCache(object):
+
+    def test_hits_match_fresh_run(self, tmp_path):
+        df = plant_df()
+        cache = ResultCache(tmp_path)
+        first = cache.evaluate(CONFIG, df)
+        assert (cache.hits, cache.misses) == (0, len(CONFIG))
+
+        second = cache.evaluate(CONFIG, df)
+        assert (cache.hits, cache.misses) == (len(CONFIG), len(CONFIG))
+        for fault in build_faults(CONFIG).values():
+            expected = fault.evaluate(df)
+            pd.testing.assert_series_equal(
+                second[fault.flag_col]["flag"], expected)
+            pd.testing.assert_series_equal(
+                first[fault.flag_col]["flag"], expected)
+            pd.testing.assert_frame_equal(
+                second[fault.flag_col]["episodes"],
+                to_episodes(expected, period=fault.episode_period()))
+
+    def test_corrupt_entry_is_a_miss(self, tmp_path):
+        df = plant_df()
+        cache = ResultCache(tmp_path)
+        cache.evaluate(CONFIG, df)
+        entries = sorted(tmp_path.glob("*.pkl"))
+        entries[0].write_bytes(b"not a pickle")
+        entries[1].write_bytes(entries[1].read_bytes()[:40])
+
+        results = cache.evaluate(CONFIG, df)
+        assert (cache.hits, cache.misses) == (len(CONFIG) - 2,
+                                              len(CONFIG) + 2)
+        for fault in build_faults(CONFIG).values():
+            pd.testing.assert_series_equal(
+                results[fault.flag_col]["flag"], fault.evaluate(df))
+        # the recomputed entries replaced the bad ones
+        cache.evaluate(CONFIG, df)
+        assert cache.misses == len(CONFIG) + 2
+
+    def test_threshold_change_misses_one_fault(self, tmp_path):
+        df = plant_df()
+        cache = ResultCache(tmp_path)
+        cache.evaluate(CONFIG, df)
+        config = dict(CONFIG, fc6=dict(CONFIG["fc6"],
+                                       hot_water_temp_err_thres=3.0))
+        cache.evaluate(config, df)
+        assert cache.misses == len(CONFIG) + 1
+
+    def test_data_change_misses_readers(self, tmp_path):
+        df = plant_df()
+        cache = ResultCache(tmp_path)
+        cache.evaluate(CONFIG, df)
+        changed = df.copy()
+        changed["hwr"] = changed["hwr"] + 1.0
+        cache.evaluate(CONFIG, changed)
+        # fc8, fc9 and fc11 read hwr
+        assert cache.misses == len(CONFIG) + 3
+
+    def test_file_hits_skip_reading(self, tmp_path, monkeypatch):
+        path = tmp_path / "plant.csv"
+        plant_df().to_csv(path)
+        cache = ResultCache(tmp_path / "cache")
+        first = cache.evaluate_file(CONFIG, path)
+
+        def no_reading(*args, **kwargs):
+            raise AssertionError("read the trend log on a cache hit")
+
+        monkeypatch.setattr(faults.cache, "load_trend_log", no_reading)
+        second = cache.evaluate_file(CONFIG, path)
+        assert list(second) == list(first)
+        for flag, result in first.items():
+            pd.testing.assert_series_equal(second[flag]["flag"],
+                                           result["flag"])
+
+        with pytest.raises(AssertionError, match="cache hit"):
+            cache.evaluate_file(CONFIG, path, start="2023-01-01 01:00")
+
+    def test_lru_eviction(self, tmp_path):
+        df = plant_df()
+        cache = ResultCache(tmp_path)
+        cache.evaluate({"fc1": CONFIG["fc1"]}, df)
+        entry_size = sum(p.stat().st_size for p in tmp_path.glob("*.pkl"))
+
+        cache.max_bytes = int(entry_size * 2.5)
+        for thres in (0.1, 0.2, 0.3):
+            config = {"fc1": dict(CONFIG["fc1"],
+                                  pump_diff_press_err_thres=thres)}
+            cache.evaluate(config, df)
+        assert len(list(tmp_path.glob("*.pkl"))) == 2
+        assert sum(p.stat().st_size
+                   for p in tmp_path.glob("*.pkl")) <= cache.max_bytes
+
+        # the newest entries are kept
+        misses = cache.misses
+        cache.evaluate({"fc1": dict(CONFIG["fc1"],
+                                    pump_diff_press_err_thres=0.3)}, df)
+        assert cache.misses == misses
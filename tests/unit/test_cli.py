@@ -0,0 +1,114 @@
+from faults.__main__ import main
+from faults.plant import BoilerPlantFaults, FAULT_CONDITIONS
+from faults.registry import FAULT_CLASSES, check_config, fault_specs
+import inspect
+import json
+import subprocess
+import sys
+import pandas as pd
+
+from tests.unit.test_boiler_plant import CONFIG, plant_df
+
+'''
+to see print statements in pytest run with
+$ pytest tests/unit/test_cli.py -rP
+
+python -m faults lists, validates and runs plant configs, and starts
+without importing pandas
+'''
+
+
+def write_config(tmp_path, config=CONFIG):
+    path = tmp_path / "plant.json"
+    path.write_text(json.dumps(config))
+    return path
+
+
+class TestRegistry(object):
+
+    def test_matches_the_classes(self):
+        assert {fault_id: cls.__name__ for fault_id, cls
+                in FAULT_CONDITIONS.items()} == FAULT_CLASSES
+        for fault_id, spec in fault_specs().items():
+            params = inspect.signature(FAULT_CONDITIONS[fault_id]).parameters
+            required = [name for name, p in params.items()
+                        if p.default is inspect.Parameter.empty]
+            assert spec["required"] == required
+            assert spec["required"] + spec["optional"] == list(params)
+
+    def test_check_config(self):
+        assert check_config(CONFIG) == []
+        bad = {"fc1": dict(CONFIG["fc1"], pump_dp_col="dp"),
+               "fc6": {k: v for k, v in CONFIG["fc6"].items()
+                       if k != "hot_water_supply_temp_col"},
+               "fc99": {}}
+        errors = check_config(bad)
+        assert len(errors) == 3
+        assert "pump_dp_col" in errors[0]
+        assert "hot_water_supply_temp_col" in errors[1]
+        assert "fc99" in errors[2]
+
+
+class TestCli(object):
+
+    def test_list(self, capsys):
+        assert main(["list"]) == 0
+        lines = capsys.readouterr().out.splitlines()
+        assert len(lines) == 14
+        assert lines[0].startswith("fc1 ")
+
+    def test_validate(self, tmp_path, capsys):
+        assert main(["validate", str(write_config(tmp_path))]) == 0
+        path = write_config(tmp_path, {"fc2": {"flow_meter_col": "flow"}})
+        assert main(["validate", str(path)]) == 2
+        assert "flow_meter_err_thres" in capsys.readouterr().err
+
+    def test_run_flags(self, tmp_path):
+        df = plant_df()
+        df.to_csv(tmp_path / "site.csv")
+        out = tmp_path / "out"
+        code = main(["run", str(write_config(tmp_path)),
+                     str(tmp_path / "site.csv"), "-o", str(out),
+                     "--faults", "fc1,fc6,fc13"])
+        assert code == 0
+
+        flags = pd.read_csv(out / "site.flags.csv", index_col=0,
+                            parse_dates=True)
+        assert list(flags.columns) == ["fc1_flag", "fc6_flag"]
+        expected = BoilerPlantFaults(
+            {"fc1": CONFIG["fc1"], "fc6": CONFIG["fc6"]}).apply(df)
+        assert (flags["fc1_flag"].to_numpy() ==
+                expected["fc1_flag"].to_numpy()).all()
+        assert (out / "site.cycling.csv").exists()
+
+    def test_run_episodes(self, tmp_path, capsys):
+        plant_df().to_csv(tmp_path / "site.csv")
+        (tmp_path / "broken.csv").write_text("not,a\ntrend,log\n")
+        out = tmp_path / "out"
+        code = main(["run", str(write_config(tmp_path)),
+                     str(tmp_path / "site.csv"), str(tmp_path / "broken.csv"),
+                     "-o", str(out), "--episodes", "--faults", "fc1"])
+
+        # the broken file fails alone
+        assert code == 1
+        assert "broken.csv" in capsys.readouterr().err
+        episodes = pd.read_csv(out / "site.episodes.csv")
+        assert set(episodes["flag"]) == {"fc1_flag"}
+
+    def test_run_store(self, tmp_path):
+        from faults.store import FaultStore
+
+        plant_df().to_csv(tmp_path / "site.csv")
+        code = main(["run", str(write_config(tmp_path)),
+                     str(tmp_path / "site.csv"), "-o", str(tmp_path),
+                     "--faults", "fc1", "--store", str(tmp_path / "f.db")])
+        assert code == 0
+        with FaultStore(tmp_path / "f.db") as store:
+            assert store.sites_with("fc1") == ["site"]
+
+    def test_startup_skips_pandas(self):
+        code = ("import sys, faults, faults.__main__\n"
+                "assert 'pandas' not in sys.modules\n"
+                "faults.FaultConditionOne\n"
+                "assert 'pandas' in sys.modules\n")
+        subprocess.run([sys.executable, "-c", code], check=True)
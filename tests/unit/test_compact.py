@@ -0,0 +1,62 @@
+from faults import FaultConditionOne, FaultConditionTwelve, kernels
+from faults.loader import compact_frame, load_trend_log
+from faults.plant import BoilerPlantFaults, build_faults
+import numpy as np
+import pandas as pd
+
+from tests.unit.test_boiler_plant import CONFIG, plant_df
+
+'''
+to see print statements in pytest run with
+$ pytest tests/unit/test_compact.py -rP
+
+compact dtypes must give the same flags in less memory
+'''
+
+
+class TestCompact(object):
+
+    def test_compact_frame(self):
+        df = plant_df()
+        compact = compact_frame(df, CONFIG)
+        assert compact["hws"].dtype == np.float32
+        assert compact["pump_vfd"].dtype == np.float32
+        assert compact["pump_status"].dtype == np.uint8
+        assert compact["boiler_stage"].dtype == np.int8
+        assert df.memory_usage(index=False).sum() > \
+            2 * compact.memory_usage(index=False).sum()
+
+    def test_same_flags(self):
+        df = plant_df()
+        compact = compact_frame(df, CONFIG)
+        expected = BoilerPlantFaults(CONFIG).apply(df)
+        results = BoilerPlantFaults(CONFIG, flag_dtype=np.uint8).apply(compact)
+        for flag, series in expected.items():
+            assert results[flag].dtype == np.uint8
+            np.testing.assert_array_equal(results[flag], series)
+
+    def test_fault_flag_dtype(self):
+        df = compact_frame(plant_df(), CONFIG)
+        for fault in (FaultConditionOne(**CONFIG["fc1"]),
+                      FaultConditionTwelve(**CONFIG["fc12"])):
+            fault.flag_dtype = bool
+            assert fault.apply(df.copy())[fault.flag_col].dtype == bool
+            assert fault.evaluate(df).dtype == np.uint8
+
+    def test_kernels_stay_float32(self):
+        df = compact_frame(plant_df(), CONFIG)
+        for fault in build_faults(CONFIG).values():
+            work = kernels.Workspace()
+            masks = fault.kernel_masks(
+                {col: df[col].to_numpy() for col in fault.columns()}, work)
+            assert all(mask.dtype == bool for mask in masks.values())
+            assert all(buf.dtype != np.float64
+                       for buf in work.buffers.values())
+
+    def test_load_compact(self, tmp_path):
+        path = tmp_path / "plant.csv"
+        plant_df().to_csv(path)
+        df = load_trend_log(path, CONFIG, compact=True)
+        pd.testing.assert_frame_equal(
+            df, compact_frame(plant_df(), CONFIG),
+            check_freq=False, check_names=False)
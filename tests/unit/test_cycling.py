@@ -0,0 +1,172 @@
+from faults import FaultConditionThirteen
+from faults import cycling
+from faults.cycling import cycle_counts, rising_edges, window_bins
+from faults.streaming import StreamingFaults
+import numpy as np
+import pandas as pd
+import pytest
+import subprocess
+import sys
+
+'''
+to see print statements in pytest run with
+$ pytest tests/unit/test_cycling.py -rP
+
+vectorized cycling counts must match the resample lambda they replace
+'''
+
+
+def resample_counts(index, modes, window):
+    df = pd.DataFrame(modes, index=index).astype(int)
+    return df.resample(window).apply(
+        lambda x: (x.eq(1) & x.shift().ne(1)).sum())
+
+
+def status_series(n, freq, seed=0, tz=None):
+    rng = np.random.RandomState(seed)
+    index = pd.date_range("2023-03-01 07:13", periods=n, freq=freq, tz=tz)
+    # drop a chunk to leave empty windows in the middle
+    keep = np.ones(n, dtype=bool)
+    keep[n // 3:n // 2] = False
+    status = (rng.rand(n) < 0.4).astype(int)
+    return index[keep], status[keep]
+
+
+class TestMatchesResample(object):
+
+    @pytest.mark.parametrize("window", ["15min", "h", "1D"])
+    @pytest.mark.parametrize("tz", [None, "US/Central"])
+    def test_counts_match_resample(self, window, tz):
+        index, status = status_series(5000, "1min", tz=tz)
+        modes = {"on": status == 1, "off": status == 0}
+
+        expected = resample_counts(index, modes, window)
+        actual = cycle_counts(index, modes, window)
+
+        assert actual.index.equals(expected.index)
+        assert (actual.to_numpy() == expected.to_numpy()).all()
+
+    def test_empty_index(self):
+        index = pd.DatetimeIndex([])
+        counts = cycle_counts(index, {"on": np.zeros(0, dtype=bool)})
+        assert len(counts) == 0
+
+    def test_unsorted_index(self):
+        index, status = status_series(300, "1min")
+        modes = {"on": status[::-1] == 1}
+        with pytest.raises(ValueError, match="sort"):
+            cycle_counts(index[::-1], modes)
+
+    def test_chunks_out_of_order(self):
+        index, status = status_series(300, "1min")
+        counter = cycling.CycleCounter("h")
+        counter.update(index[200:], {"on": status[200:] == 1})
+        with pytest.raises(ValueError, match="time ordered"):
+            counter.update(index[:100], {"on": status[:100] == 1})
+
+
+class TestRisingEdges(object):
+
+    def test_edges_restart_each_window(self):
+        mode = np.array([1, 1, 0, 1, 1, 1], dtype=bool)
+        bins = np.array([0, 0, 0, 0, 1, 1])
+        actual = rising_edges(mode, bins).tolist()
+        assert actual == [True, False, False, True, True, False]
+
+    def test_window_bins_anchor_on_midnight(self):
+        index = pd.date_range("2023-03-01 07:50", periods=4, freq="20min")
+        bins, start = window_bins(index, "h")
+        assert bins.tolist() == [0, 1, 1, 1]
+        assert start == pd.Timestamp("2023-03-01 07:00")
+
+    def test_bad_window(self):
+        with pytest.raises(ValueError):
+            window_bins(pd.date_range("2023", periods=2, freq="h"), "0min")
+
+
+class TestFaultWindow(object):
+
+    def test_fc13_daily_window(self):
+        index, status = status_series(3000, "1min")
+        df = pd.DataFrame({"boiler_status": status}, index=index)
+        fc13 = FaultConditionThirteen(200, "boiler_status", window="1D")
+        results = fc13.apply(df)
+
+        counts = resample_counts(
+            index, {"on": status == 1, "off": status == 0}, "1D")
+        expected = counts.gt(200).any(axis=1).astype(int)
+        assert (results["fc13_flag"].to_numpy() == expected.to_numpy()).all()
+        assert results["fc13_flag"].sum() > 0
+        assert "boiler_on_mode" not in df.columns
+
+    def test_troubleshoot_stays_positional(self):
+        # window comes after troubleshoot, older positional calls keep
+        # meaning troubleshoot
+        fc13 = FaultConditionThirteen(200, "boiler_status", True)
+        assert fc13.troubleshoot is True
+        assert fc13.window == "h"
+
+
+@pytest.fixture
+def loop_backend(monkeypatch):
+    # the numba loop run as plain python, so it is checked without numba
+    monkeypatch.setattr(cycling, "_count_starts_jit", cycling._count_starts)
+    monkeypatch.setattr(cycling, "_backend", "numba")
+
+
+class TestCompiledBackend(object):
+
+    @pytest.mark.parametrize("window,tz", [
+        ("h", None), ("15min", None), ("D", "US/Central")])
+    def test_loop_matches_numpy(self, loop_backend, window, tz):
+        index, status = status_series(3000, "1min", tz=tz)
+        modes = {"on": status == 1, "off": status == 0}
+        looped = cycle_counts(index, modes, window)
+        cycling.set_backend("numpy")
+        pd.testing.assert_frame_equal(looped, cycle_counts(index, modes, window))
+
+    def test_loop_across_chunks(self, loop_backend):
+        index, status = status_series(3000, "1min", seed=3)
+        df = pd.DataFrame({"boiler_status": status}, index=index)
+        fc = FaultConditionThirteen(3, "boiler_status")
+        chunks = [df.iloc[i:i + 37] for i in range(0, len(df), 37)]
+        looped = StreamingFaults([fc]).evaluate(chunks)["fc13_flag"]
+        cycling.set_backend("numpy")
+        expected = fc.evaluate(df)
+        assert (looped.to_numpy() == expected.to_numpy()).all()
+
+    def test_loop_unsorted_index(self, loop_backend):
+        # the loop only moves to later windows, it must not see these
+        index, status = status_series(300, "1min")
+        with pytest.raises(ValueError, match="sort"):
+            cycle_counts(index[::-1], {"on": status[::-1] == 1})
+
+    def test_numba_not_imported_with_faults(self):
+        code = ("import sys, faults.conditions, faults.cycling; "
+                "print('numba' in sys.modules)")
+        out = subprocess.run([sys.executable, "-c", code], check=True,
+                             capture_output=True, text=True).stdout
+        assert out.strip() == "False"
+
+    def test_set_backend(self):
+        previous = cycling.get_backend()
+        with pytest.raises(ValueError):
+            cycling.set_backend("cuda")
+        if not cycling.HAVE_NUMBA:
+            assert previous == "numpy"
+            with pytest.raises(ImportError):
+                cycling.set_backend("numba")
+        assert cycling.set_backend("numpy") == previous
+        cycling.set_backend(previous)
+
+    def test_numba_matches_numpy(self):
+        pytest.importorskip("numba")
+        index, status = status_series(5000, "1min", seed=5)
+        modes = {"on": status == 1, "off": status == 0}
+        previous = cycling.set_backend("numba")
+        try:
+            compiled = cycle_counts(index, modes, "h")
+        finally:
+            cycling.set_backend("numpy")
+        pd.testing.assert_frame_equal(compiled, cycle_counts(index, modes, "h"))
+        cycling.set_backend(previous)
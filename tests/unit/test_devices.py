@@ -0,0 +1,138 @@
+from faults import (
+    FaultConditionEight,
+    FaultConditionTen,
+    FaultConditionThirteen,
+    FaultConditionFourteen,
+)
+from faults.cache import ResultCache
+from faults.incremental import IncrementalFaults
+from faults.loader import column_dtypes
+from faults.online import OnlineFault, OnlineFaults
+from faults.plant import BoilerPlantFaults
+from faults.streaming import StreamingFaults
+from faults.sweep import sweep
+from faults.threaded import ThreadedFaults
+import numpy as np
+import pytest
+
+from tests.unit.test_boiler_plant import plant_df
+
+'''
+to see print statements in pytest run with
+$ pytest tests/unit/test_devices.py -rP
+
+lists of device columns are flagged in one 2-D pass per fault
+'''
+
+BOILERS = ["b1", "b2", "b3"]
+
+
+def devices_df(n=600, seed=0):
+    df = plant_df(n=n, seed=seed)
+    rng = np.random.RandomState(seed + 10)
+    for b in BOILERS:
+        df[f"{b}_status"] = rng.randint(0, 2, n)
+        df[f"{b}_stage"] = rng.randint(0, 4, n)
+        df[f"{b}_lwt"] = rng.uniform(150.0, 185.0, n)
+        df[f"{b}_flow"] = rng.uniform(0.0, 20.0, n)
+    df.loc[df.index[::7], "b2_flow"] = 0.0
+    return df
+
+
+def cols(suffix):
+    return [f"{b}_{suffix}" for b in BOILERS]
+
+
+class TestDeviceFaults(object):
+
+    def test_cycling_same_as_one_per_device(self):
+        df = devices_df()
+        for cls, suffix in ((FaultConditionThirteen, "status"),
+                            (FaultConditionFourteen, "stage")):
+            flags = cls(4, cols(suffix)).evaluate(df)
+            assert list(flags.columns) == [
+                f"{cls.flag_col}_{col}" for col in cols(suffix)]
+            for col in cols(suffix):
+                one = cls(4, col).evaluate(df)
+                assert (flags[f"{cls.flag_col}_{col}"].to_numpy() ==
+                        one.to_numpy()).all()
+
+    def test_shared_columns_broadcast(self):
+        df = devices_df()
+        fc = FaultConditionTen(2.0, "flow", cols("lwt"), "hws", cols("status"),
+                               persist="3min")
+        flags = fc.evaluate(df)
+        for b in BOILERS:
+            one = FaultConditionTen(2.0, "flow", f"{b}_lwt", "hws",
+                                    f"{b}_status", persist="3min")
+            assert (flags[f"fc10_flag_{b}_lwt"] == one.evaluate(df)).all()
+
+        fc8 = FaultConditionEight(2.0, 130.0, "hwr", cols("status"))
+        assert fc8.evaluate(df).shape == (len(df), 3)
+
+    def test_flow_weighted_header(self):
+        df = devices_df()
+        fc = FaultConditionTen(2.0, cols("flow"), cols("lwt"), "hws",
+                               cols("status"))
+        flags = fc.evaluate(df)
+
+        flow = df[cols("flow")].to_numpy()
+        temp = df[cols("lwt")].to_numpy()
+        mixed = (flow * temp).sum(axis=1) / flow.sum(axis=1)
+        mismatch = np.abs(mixed - df["hws"].to_numpy()) > 2.0
+        for b in BOILERS:
+            expected = mismatch & (df[f"{b}_status"].to_numpy() == 1)
+            assert (flags[f"fc10_flag_{b}_flow"].to_numpy() == expected).all()
+
+    def test_apply_and_episodes(self):
+        df = devices_df()
+        fc = FaultConditionThirteen(4, cols("status"))
+        result = fc.apply(df.copy())
+        assert list(result.columns) == fc.flag_columns()
+
+        fc10 = FaultConditionTen(2.0, "flow", cols("lwt"), "hws",
+                                 cols("status"))
+        out = fc10.apply(df.copy())
+        assert set(fc10.flag_columns()) <= set(out.columns)
+        episodes = fc10.episodes(df)
+        assert set(episodes["flag"]) == set(fc10.flag_columns())
+
+    def test_checks_and_errors(self):
+        df = devices_df()
+        df["b3_status"] = df["b3_status"] * 2
+        fc = FaultConditionThirteen(4, cols("status"))
+        with pytest.raises(TypeError, match="b3_status"):
+            fc.evaluate(df)
+        assert column_dtypes([fc])["b1_status"] == np.uint8
+
+        bad = FaultConditionTen(2.0, "flow", cols("lwt")[:2], "hws",
+                                cols("status"))
+        with pytest.raises(ValueError):
+            bad.evaluate(devices_df())
+        with pytest.raises(ValueError):
+            BoilerPlantFaults([fc])
+
+    @pytest.mark.parametrize("runner", [
+        BoilerPlantFaults, ThreadedFaults, StreamingFaults, OnlineFaults])
+    def test_plant_runners_reject_devices(self, runner):
+        fc = FaultConditionThirteen(4, cols("status"))
+        with pytest.raises(ValueError, match="fc13 has lists of device"):
+            runner([fc])
+
+    def test_incremental_and_cache_reject_devices(self, tmp_path):
+        fc = FaultConditionThirteen(4, cols("status"))
+        with pytest.raises(ValueError, match="fc13 has lists of device"):
+            IncrementalFaults([fc], tmp_path / "state")
+        with pytest.raises(ValueError, match="fc13 has lists of device"):
+            ResultCache(tmp_path / "cache").evaluate([fc], devices_df())
+        with pytest.raises(ValueError, match="fc13 has lists of device"):
+            OnlineFault(fc)
+
+    @pytest.mark.parametrize("fault, param", [
+        (FaultConditionThirteen(5, cols("status")), "boiler_os_max"),
+        (FaultConditionEight(2.0, 130.0, ["hwr", "hwr"], "pump_status"),
+         "hot_water_temp_err_thres"),
+    ])
+    def test_sweep_rejects_devices(self, fault, param):
+        with pytest.raises(ValueError, match="lists of device"):
+            sweep(fault, devices_df(), param, [1.0, 2.0])
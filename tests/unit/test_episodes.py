@@ -0,0 +1,104 @@
+from faults import FaultConditionOne, FaultConditionTwelve
+from faults.episodes import (fault_hours, flags_to_episodes, from_episodes,
+                             sample_period, to_episodes)
+from faults.plant import BoilerPlantFaults
+import numpy as np
+import pandas as pd
+import pytest
+
+from tests.unit.test_boiler_plant import CONFIG, plant_df
+
+'''
+to see print statements in pytest run with
+$ pytest tests/unit/test_episodes.py -rP
+
+episodes must expand back to the same flag they were encoded from
+'''
+
+
+def gappy_flag():
+    index = pd.date_range("2024-01-01", periods=12, freq="5min")
+    index = index.delete([4, 5, 9])
+    values = [0, 1, 1, 1, 0, 1, 1, 1, 1]
+    return pd.Series(values, index=index, name="fc1_flag")
+
+
+class TestEpisodes(object):
+
+    def test_runs(self):
+        episodes = to_episodes(gappy_flag(), period="5min")
+        assert episodes["samples"].tolist() == [3, 4]
+        assert episodes["start"].tolist() == [
+            pd.Timestamp("2024-01-01 00:05"), pd.Timestamp("2024-01-01 00:35")]
+        assert episodes["duration"].tolist() == [
+            pd.Timedelta("15min"), pd.Timedelta("25min")]
+
+    def test_round_trip(self):
+        flag = gappy_flag()
+        episodes = to_episodes(flag)
+        back = from_episodes(episodes, flag.index, name=flag.name)
+        pd.testing.assert_series_equal(back, flag.astype(np.uint8))
+
+    def test_round_trip_plant(self):
+        df = plant_df()
+        flag = FaultConditionOne(**CONFIG["fc1"]).evaluate(df)
+        back = from_episodes(to_episodes(flag), df.index, name=flag.name)
+        pd.testing.assert_series_equal(back, flag)
+
+    def test_min_duration(self):
+        episodes = to_episodes(gappy_flag(), min_duration="20min",
+                               period="5min")
+        assert episodes["samples"].tolist() == [4]
+        assert episodes.index.tolist() == [0]
+
+    def test_empty(self):
+        flag = pd.Series(np.zeros(5, dtype=np.uint8),
+                         index=pd.date_range("2024-01-01", periods=5, freq="min"))
+        assert to_episodes(flag).empty
+        assert fault_hours(to_episodes(flag)) == 0.0
+        assert (from_episodes(to_episodes(flag), flag.index) == 0).all()
+
+    def test_single_sample_period(self):
+        # one sample without a freq has no spacing to infer
+        index = pd.DatetimeIndex(["2024-01-01 03:00"])
+        flag = pd.Series([1], index=index, name="fc12_flag")
+        with pytest.raises(ValueError, match="sample period"):
+            to_episodes(flag)
+        assert sample_period(index, default="h") == pd.Timedelta("1h")
+
+        episodes = flags_to_episodes({"fc12_flag": flag},
+                                     periods={"fc12_flag": "h"})
+        assert episodes["duration"].tolist() == [pd.Timedelta("1h")]
+        assert fault_hours(episodes) == 1.0
+        assert to_episodes(flag * 0).empty
+
+    def test_fault_hours(self):
+        df = plant_df()
+        flag = FaultConditionOne(**CONFIG["fc1"]).evaluate(df)
+        expected = flag.sum() * pd.Timedelta("1min") / pd.Timedelta(hours=1)
+        assert fault_hours(to_episodes(flag)) == expected
+
+    def test_fault_condition_episodes(self):
+        df = plant_df()
+        fault = FaultConditionTwelve(**CONFIG["fc12"])
+        episodes = fault.episodes(df)
+        assert (episodes["duration"] ==
+                episodes["samples"] * pd.Timedelta("1h")).all()
+        assert episodes["samples"].sum() == fault.evaluate(df).sum()
+
+        # a single window is one window long, not zero
+        one = df[df.index < df.index[0] + pd.Timedelta("1h")]
+        one.index.freq = None
+        episodes = FaultConditionTwelve(0, CONFIG["fc12"]["pump_vfd_speed_col"]
+                                        ).episodes(one)
+        assert episodes["duration"].tolist() == [pd.Timedelta("1h")]
+
+    def test_plant_results(self):
+        results = BoilerPlantFaults(CONFIG).apply(plant_df())
+        episodes = flags_to_episodes(results)
+        per_flag = episodes.groupby("flag")["samples"].sum()
+        for flag, series in results.items():
+            assert per_flag.get(flag, 0) == series.sum()
+
+        hours = fault_hours(episodes, freq="D")
+        assert hours.index.names == ["flag", "start"]
@@ -0,0 +1,63 @@
+from faults.plant import FAULT_CONDITIONS
+import numpy as np
+import pandas as pd
+import pytest
+
+from tests.unit.test_boiler_plant import CONFIG, plant_df
+
+'''
+to see print statements in pytest run with
+$ pytest tests/unit/test_evaluate.py -rP
+
+evaluate() returns compact flags and never writes into the dataframe
+'''
+
+
+def read_only_df() -> pd.DataFrame:
+    df = plant_df()
+    for col in df.columns:
+        df[col].to_numpy().flags.writeable = False
+    return df
+
+
+class TestEvaluate(object):
+
+    @pytest.mark.parametrize("fault_id", list(CONFIG))
+    def test_matches_apply(self, fault_id):
+        df = read_only_df()
+        before = df.copy()
+        fault = FAULT_CONDITIONS[fault_id](**CONFIG[fault_id])
+        flag = fault.evaluate(df)
+
+        pd.testing.assert_frame_equal(df, before)
+        assert flag.dtype == np.uint8
+        assert flag.name == fault_id + "_flag"
+
+        expected = fault.apply(df.copy())[fault_id + "_flag"]
+        assert flag.index.equals(expected.index)
+        assert (flag.to_numpy() == expected.to_numpy()).all()
+
+    def test_helper_masks_only_on_troubleshoot(self):
+        df = read_only_df()
+        fc1 = FAULT_CONDITIONS["fc1"](**CONFIG["fc1"], troubleshoot=True)
+        result = fc1.evaluate(df)
+
+        assert list(result.columns) == [
+            "pump_diff_press_check", "pump_check", "fc1_flag"]
+        assert result["pump_check"].dtype == bool
+        assert "pump_check" not in df.columns
+
+    def test_cycling_counts_on_troubleshoot(self):
+        df = read_only_df()
+        fc13 = FAULT_CONDITIONS["fc13"](**CONFIG["fc13"], troubleshoot=True)
+        result = fc13.evaluate(df)
+
+        assert list(result.columns) == [
+            "boiler_on_mode", "boiler_off_mode", "fc13_flag"]
+        assert len(result) == 10
+
+    def test_validation_still_runs(self):
+        df = plant_df()
+        df["pump_status"] = df["pump_status"].astype(float)
+        with pytest.raises(TypeError):
+            FAULT_CONDITIONS["fc2"](**CONFIG["fc2"]).evaluate(df)
@@ -0,0 +1,86 @@
+from faults.episodes import to_episodes
+from faults.incremental import IncrementalFaults
+from faults.streaming import StreamingFaults
+import pytest
+
+from tests.unit.test_boiler_plant import CONFIG, plant_df
+
+'''
+to see print statements in pytest run with
+$ pytest tests/unit/test_incremental.py -rP
+
+appended rows are evaluated alone and merged into the stored results
+'''
+
+
+def incremental_config():
+    config = dict(CONFIG)
+    config["fc6"] = dict(CONFIG["fc6"], persist="3min", clear="2min")
+    return config
+
+
+def run_appends(tmp_path, df, cuts):
+    for start, stop in zip([0] + cuts, cuts + [len(df)]):
+        # a new object per run, like a nightly job
+        IncrementalFaults(incremental_config(), tmp_path).update(
+            df.iloc[:stop])
+    return IncrementalFaults(incremental_config(), tmp_path)
+
+
+class TestIncrementalFaults(object):
+
+    def test_same_as_whole_history(self, tmp_path):
+        df = plant_df(n=1500)
+        inc = run_appends(tmp_path, df, [100, 101, 700, 1234])
+        expected = StreamingFaults(incremental_config()).evaluate([df])
+
+        flags = inc.flags()
+        assert list(flags) == list(expected)
+        for flag, series in flags.items():
+            full = expected[flag]
+            if flag in ("fc12_flag", "fc13_flag", "fc14_flag"):
+                # the last window is still open
+                full = full.iloc[:-1]
+            assert (series.index == full.index).all()
+            assert (series.to_numpy() == full.to_numpy()).all()
+
+    def test_episodes_carry_across_runs(self, tmp_path):
+        df = plant_df(n=1500)
+        inc = run_appends(tmp_path, df, [300, 301, 950])
+        expected = StreamingFaults(incremental_config()).evaluate([df])
+
+        episodes = inc.episodes()
+        for flag in ("fc1_flag", "fc6_flag"):
+            got = episodes[episodes["flag"] == flag].reset_index(drop=True)
+            want = to_episodes(expected[flag])
+            assert len(got) == len(want)
+            assert (got["start"] == want["start"]).all()
+            assert (got["duration"] == want["duration"]).all()
+            assert (got["samples"] == want["samples"]).all()
+
+    def test_skips_rows_already_done(self, tmp_path):
+        df = plant_df(n=400)
+        inc = IncrementalFaults(CONFIG, tmp_path)
+        inc.update(df.iloc[:200])
+        assert inc.update(df.iloc[:200]) == {}
+        inc.update(df)
+        assert len(inc.flags()["fc1_flag"]) == 400
+
+    def test_interrupted_run_is_cut_back(self, tmp_path):
+        df = plant_df(n=400)
+        IncrementalFaults(CONFIG, tmp_path).update(df.iloc[:200])
+        with open(tmp_path / "fc1_flag.csv", "a") as f:
+            f.write("2023-01-01 03:20:00,1\n")
+        inc = IncrementalFaults(CONFIG, tmp_path)
+        inc.update(df)
+        flag = inc.flags()["fc1_flag"]
+        assert flag.index.is_unique and len(flag) == 400
+
+    def test_config_change(self, tmp_path):
+        IncrementalFaults(CONFIG, tmp_path).update(plant_df(n=100))
+        changed = dict(CONFIG, fc1=dict(CONFIG["fc1"],
+                                        pump_diff_press_err_thres=0.1))
+        with pytest.raises(ValueError):
+            IncrementalFaults(changed, tmp_path)
+        inc = IncrementalFaults(changed, tmp_path, reset=True)
+        assert inc.flags() == {}
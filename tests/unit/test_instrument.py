@@ -0,0 +1,69 @@
+from faults import FaultConditionOne, FaultConditionTwelve
+from faults.instrument import Collector, Instrument
+from faults.plant import BoilerPlantFaults
+from faults.streaming import StreamingFaults
+import pandas as pd
+
+from tests.unit.test_boiler_plant import CONFIG, plant_df
+
+'''
+to see print statements in pytest run with
+$ pytest tests/unit/test_instrument.py -rP
+
+instrumentation reports every phase and leaves the flags alone
+'''
+
+
+class TestInstrument(object):
+
+    def test_fault_phases(self):
+        df = plant_df()
+        collector = Collector()
+        fault = FaultConditionOne(**CONFIG["fc1"])
+        expected = fault.evaluate(df)
+
+        fault.instrument = collector
+        pd.testing.assert_series_equal(fault.evaluate(df), expected)
+        fault.apply(df)
+
+        frame = collector.to_frame()
+        assert frame["phase"].tolist() == [
+            "validate", "masks", "flag", "validate", "masks", "flag", "assign"]
+        assert (frame["fault"] == "fc1").all()
+        assert (frame["rows"] == len(df)).all()
+        assert frame["peak_bytes"].isna().all()
+
+    def test_cycling_phases(self):
+        collector = Collector()
+        fault = FaultConditionTwelve(**CONFIG["fc12"])
+        fault.instrument = collector
+        fault.apply(plant_df())
+        assert [m.phase for m in collector.metrics] == [
+            "validate", "masks", "resample", "assign"]
+
+    def test_memory(self):
+        collector = Collector(memory=True)
+        try:
+            BoilerPlantFaults(CONFIG, instrument=collector).apply(
+                plant_df(n=5000))
+        finally:
+            collector.stop()
+        summary = collector.summary()
+        assert list(summary.index.get_level_values("phase")) == [
+            "validate", "masks", "flag", "resample"]
+        assert summary.loc[("plant", "masks"), "peak_bytes"] > 0
+
+    def test_callback_and_streaming(self):
+        seen = []
+        df = plant_df()
+        stream = StreamingFaults(CONFIG, instrument=Instrument(seen.append))
+        stream.evaluate(df.iloc[i:i + 200] for i in range(0, len(df), 200))
+        faults = {m.fault for m in seen}
+        assert faults == set(CONFIG)
+        assert sum(m.rows for m in seen
+                   if m.fault == "fc1" and m.phase == "masks") == len(df)
+
+    def test_off_by_default(self):
+        fault = FaultConditionOne(**CONFIG["fc1"])
+        assert fault.instrument is None
+        assert "instrument" not in fault.columns()
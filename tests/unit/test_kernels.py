@@ -0,0 +1,77 @@
+from faults import kernels
+from faults.plant import build_faults
+import numpy as np
+import pytest
+
+from tests.unit.test_boiler_plant import CONFIG, plant_df
+
+'''
+to see print statements in pytest run with
+$ pytest tests/unit/test_kernels.py -rP
+
+numpy kernels on plain arrays give the same flags as the fault classes
+'''
+
+ROW_FAULTS = [f"fc{i}" for i in range(1, 12)]
+
+
+def column_arrays(df):
+    return {col: np.ascontiguousarray(df[col].to_numpy()) for col in df.columns}
+
+
+class TestFlagArray(object):
+
+    @pytest.mark.parametrize("fault_id", ROW_FAULTS)
+    def test_matches_evaluate(self, fault_id):
+        df = plant_df()
+        fault = build_faults(CONFIG)[fault_id]
+        expected = fault.evaluate(df).to_numpy().astype(bool)
+
+        actual = fault.flag_array(column_arrays(df))
+        assert actual.dtype == bool
+        assert (actual == expected).all()
+
+    @pytest.mark.parametrize("fault_id", ROW_FAULTS)
+    def test_workspace_reuses_buffers(self, fault_id):
+        fault = build_faults(CONFIG)[fault_id]
+        work = kernels.Workspace()
+        out = np.empty(60, dtype=bool)
+
+        df = plant_df()
+        first = fault.flag_array(column_arrays(df.iloc[:60]), out, work)
+        buffers = {k: id(v) for k, v in work.buffers.items()}
+        second = fault.flag_array(column_arrays(df.iloc[60:120]), out, work)
+
+        assert first is out and second is out
+        assert {k: id(v) for k, v in work.buffers.items()} == buffers
+        expected = fault.evaluate(df.iloc[60:120]).to_numpy().astype(bool)
+        assert (second == expected).all()
+
+
+class TestPrimitives(object):
+
+    def test_float32_stays_float32(self):
+        a = np.array([1.0, 2.0, 3.0], dtype=np.float32)
+        b = np.array([2.5, 2.5, 2.5], dtype=np.float32)
+        scratch = np.empty(3, dtype=np.result_type(b, 0.5))
+        assert scratch.dtype == np.float32
+        actual = kernels.less_than_offset(a, b, 0.5, scratch=scratch)
+        assert actual.tolist() == [True, False, False]
+
+    def test_mixed_temp_no_flow(self):
+        flow = np.array([0.0, 10.0])
+        temp = np.array([180.0, 180.0])
+        header = np.array([170.0, 170.0])
+        actual = kernels.mixed_temp_mismatch(flow, temp, header, 2.0)
+        assert actual.tolist() == [False, True]
+
+    def test_changed(self):
+        actual = kernels.changed(np.array([1, 1, 2, 2, 3]))
+        assert actual.tolist() == [False, False, True, False, True]
+        assert len(kernels.changed(np.array([], dtype=int))) == 0
+
+    def test_all_of_into_out(self):
+        out = np.empty(3, dtype=bool)
+        masks = [np.array([True, True, False]), np.array([True, False, True])]
+        assert kernels.all_of(masks, out) is out
+        assert out.tolist() == [True, False, False]
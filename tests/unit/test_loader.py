@@ -0,0 +1,121 @@
+from faults import FaultConditionOne, FaultConditionFourteen
+from faults.loader import column_dtypes, load_trend_log, required_columns
+from faults.plant import BoilerPlantFaults
+import numpy as np
+import pandas as pd
+import pytest
+
+from tests.unit.test_boiler_plant import CONFIG, plant_df
+
+'''
+to see print statements in pytest run with
+$ pytest tests/unit/test_loader.py -rP
+
+loader reads only the columns and time range the faults need
+'''
+
+START = "2023-01-01 02:00"
+END = "2023-01-01 05:00"
+
+
+def wide_df():
+    # plant points plus unrelated BAS points
+    df = plant_df()
+    for i in range(20):
+        df[f"vav_{i}_zone_temp"] = np.linspace(68.0, 75.0, len(df))
+    return df
+
+
+class TestColumns(object):
+
+    def test_required_columns(self):
+        faults = [FaultConditionOne(**CONFIG["fc1"]),
+                  FaultConditionFourteen(**CONFIG["fc14"])]
+        assert required_columns(faults) == [
+            "dp", "pump_status", "dp_spt", "boiler_stage"]
+        assert set(required_columns(CONFIG)) == set(plant_df().columns)
+
+    def test_column_dtypes(self):
+        dtypes = column_dtypes(BoilerPlantFaults(CONFIG))
+        assert dtypes["pump_status"] == np.uint8
+        assert dtypes["boiler_status"] == np.uint8
+        assert dtypes["boiler_stage"] == np.int16
+        assert dtypes["pump_vfd"] == np.float64
+        assert dtypes["hws"] == np.float64
+
+
+class TestLoad(object):
+
+    def expected(self, df):
+        expected = df.loc[(df.index >= START) & (df.index < END),
+                          required_columns(CONFIG)]
+        return expected.astype(column_dtypes(CONFIG))
+
+    def test_csv(self, tmp_path):
+        df = wide_df()
+        path = tmp_path / "plant.csv"
+        df.to_csv(path)
+        loaded = load_trend_log(path, CONFIG, start=START, end=END)
+        pd.testing.assert_frame_equal(loaded, self.expected(df),
+                                      check_freq=False, check_names=False)
+
+    @pytest.mark.parametrize("index_name", [None, "timestamp"])
+    def test_parquet(self, tmp_path, index_name):
+        pytest.importorskip("pyarrow")
+        df = wide_df().rename_axis(index_name)
+        path = tmp_path / "plant.parquet"
+        df.to_parquet(path, row_group_size=100)
+        loaded = load_trend_log(path, CONFIG, start=START, end=END)
+        pd.testing.assert_frame_equal(loaded, self.expected(df),
+                                      check_freq=False, check_index_type=False)
+
+    def test_feather(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        df = wide_df()
+        path = tmp_path / "plant.feather"
+        df.rename_axis("timestamp").reset_index().to_feather(path)
+        loaded = load_trend_log(path, CONFIG, start=START, end=END)
+        pd.testing.assert_frame_equal(
+            loaded, self.expected(df).rename_axis("timestamp"),
+            check_freq=False, check_index_type=False)
+
+    @pytest.mark.parametrize("fmt", ["csv", "parquet"])
+    def test_bounds_against_tz_aware_times(self, tmp_path, fmt):
+        if fmt == "parquet":
+            pytest.importorskip("pyarrow")
+        df = wide_df().tz_localize("UTC")
+        path = tmp_path / f"plant.{fmt}"
+        getattr(df, f"to_{fmt}")(path)
+
+        expected = self.expected(df.tz_localize(None)).tz_localize("UTC")
+        # naive bounds are wall times in the column's zone
+        loaded = load_trend_log(path, CONFIG, start=START, end=END)
+        pd.testing.assert_frame_equal(
+            loaded, expected, check_freq=False, check_names=False,
+            check_index_type=False)
+        # aware bounds in another zone are converted
+        loaded = load_trend_log(
+            path, CONFIG,
+            start=pd.Timestamp(START, tz="UTC").tz_convert("US/Central"),
+            end=pd.Timestamp(END, tz="UTC").tz_convert("US/Central"))
+        assert len(loaded) == len(expected)
+
+    def test_flags_unchanged(self, tmp_path):
+        df = plant_df()
+        path = tmp_path / "plant.csv"
+        df.to_csv(path)
+        plant = BoilerPlantFaults(CONFIG)
+        loaded = plant.apply(load_trend_log(path, plant))
+        for flag, series in plant.apply(df).items():
+            pd.testing.assert_series_equal(loaded[flag], series,
+                                           check_freq=False)
+
+    def test_bad_status_left_for_checks(self, tmp_path):
+        df = plant_df()
+        df["pump_status"] = df["pump_status"] * 0.5
+        path = tmp_path / "plant.csv"
+        df.to_csv(path)
+        loaded = load_trend_log(path, CONFIG)
+        assert loaded["pump_status"].dtype == np.float64
+        with pytest.raises(TypeError):
+            BoilerPlantFaults(CONFIG).apply(loaded)
@@ -0,0 +1,78 @@
+from faults.online import OnlineFault, OnlineFaults
+from faults.plant import build_faults
+import numpy as np
+import pandas as pd
+import pytest
+
+from tests.unit.test_boiler_plant import CONFIG, plant_df
+
+'''
+to see print statements in pytest run with
+$ pytest tests/unit/test_online.py -rP
+
+sample at a time updates must match the batch flags
+'''
+
+ROW_FAULTS = ["fc%d" % i for i in range(1, 12)]
+# os_max argument of the cycling faults
+CYCLING_FAULTS = {"fc12": "plant_os_max", "fc13": "boiler_os_max",
+                  "fc14": "boiler_stage_os_max"}
+
+
+def run_online(fault, df):
+    online = OnlineFault(fault)
+    return np.array([online.update(t, row) for t, row in
+                     zip(df.index, df.to_dict("records"))])
+
+
+def rolling_reference(fault, df, os_max):
+    # starts in the window ending at every sample, the slow way
+    stamps = df.index.as_unit("ns").asi8
+    window = pd.Timedelta(fault.window).value
+    flag = np.zeros(len(df), dtype=int)
+    for mode in fault.helper_masks(df).values():
+        mode = np.asarray(mode, dtype=bool)
+        starts = stamps[mode & ~np.concatenate(([False], mode[:-1]))]
+        for i, now in enumerate(stamps):
+            count = ((starts > now - window) & (starts <= now)).sum()
+            flag[i] |= count > os_max
+    return flag
+
+
+class TestOnline(object):
+
+    @pytest.mark.parametrize("fault_id", ROW_FAULTS)
+    def test_row_faults(self, fault_id):
+        df = plant_df(n=300)
+        fault = build_faults(CONFIG)[fault_id]
+        np.testing.assert_array_equal(run_online(fault, df),
+                                      fault.evaluate(df).to_numpy())
+
+    @pytest.mark.parametrize("fault_id", ["fc1", "fc6"])
+    def test_persist(self, fault_id):
+        df = plant_df(n=300)
+        config = {fault_id: dict(CONFIG[fault_id], persist="2min",
+                                 clear="3min")}
+        fault = build_faults(config)[fault_id]
+        np.testing.assert_array_equal(run_online(fault, df),
+                                      fault.evaluate(df).to_numpy())
+
+    @pytest.mark.parametrize("fault_id", CYCLING_FAULTS)
+    def test_cycling_rolling_window(self, fault_id):
+        df = plant_df(n=300)
+        config = {fault_id: dict(CONFIG[fault_id], window="20min",
+                                 **{CYCLING_FAULTS[fault_id]: 4})}
+        fault = build_faults(config)[fault_id]
+        expected = rolling_reference(fault, df, fault.os_max)
+        assert expected.sum() > 0
+        np.testing.assert_array_equal(run_online(fault, df), expected)
+
+    def test_bounded_memory(self):
+        df = plant_df(n=600)
+        online = OnlineFaults(CONFIG)
+        for t, row in zip(df.index, df.to_dict("records")):
+            flags = online.update(t, row)
+        assert set(flags) == {fault_id + "_flag" for fault_id in CONFIG}
+        for fault in online.faults.values():
+            for starts in fault.starts.values():
+                assert len(starts) <= fault.fault.os_max + 1
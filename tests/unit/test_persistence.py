@@ -0,0 +1,117 @@
+from faults import FaultConditionOne
+from faults.persistence import persist_flag
+from faults.plant import FAULT_CONDITIONS, BoilerPlantFaults
+from faults.streaming import StreamingFaults
+import inspect
+import numpy as np
+import pandas as pd
+import pytest
+
+from tests.unit.test_boiler_plant import CONFIG, plant_df
+
+'''
+to see print statements in pytest run with
+$ pytest tests/unit/test_persistence.py -rP
+
+vectorized persistence must match a sample by sample latch
+'''
+
+
+def reference(flag, index, on_delay, off_delay=None):
+    on_delay = pd.Timedelta(on_delay)
+    off_delay = pd.Timedelta(off_delay or 0)
+    out, latched, prev = [], False, False
+    true_since = false_since = index[0]
+    for t, value in zip(index, flag):
+        if value and not prev:
+            true_since = t
+        if not value and prev:
+            false_since = t
+        if value and t - true_since >= on_delay:
+            latched = True
+        elif not value and t - false_since >= off_delay:
+            latched = False
+        out.append(int(latched))
+        prev = value
+    return np.array(out, dtype=np.uint8)
+
+
+def irregular(n=2000, seed=0):
+    rng = np.random.RandomState(seed)
+    steps = rng.choice([15, 30, 60, 60, 60, 300], n)
+    index = pd.Timestamp("2023-01-01") + pd.to_timedelta(np.cumsum(steps), "s")
+    # long and short runs of faults
+    flag = np.repeat(rng.rand(n // 10) < 0.4, 10) & (rng.rand(n) < 0.9)
+    return flag, pd.DatetimeIndex(index)
+
+
+class TestPersistFlag(object):
+
+    @pytest.mark.parametrize("on_delay, off_delay", [
+        ("0min", None), ("5min", None), ("10min", "3min"), ("2min", "10min")])
+    def test_matches_reference(self, on_delay, off_delay):
+        flag, index = irregular()
+        out, _ = persist_flag(flag, index, on_delay, off_delay)
+        np.testing.assert_array_equal(
+            out, reference(flag, index, on_delay, off_delay))
+
+    def test_chunks(self):
+        flag, index = irregular(seed=1)
+        whole, _ = persist_flag(flag, index, "5min", "2min")
+        state, pieces = None, []
+        for i in range(0, len(flag), 137):
+            out, state = persist_flag(
+                flag[i:i + 137], index[i:i + 137], "5min", "2min", state)
+            pieces.append(out)
+        np.testing.assert_array_equal(np.concatenate(pieces), whole)
+
+    def test_single_sample_spike(self):
+        index = pd.date_range("2023-01-01", periods=30, freq="1min")
+        flag = np.zeros(30, dtype=bool)
+        flag[3] = True
+        flag[10:25] = True
+        out, _ = persist_flag(flag, index, "10min")
+        assert out[:20].sum() == 0
+        assert out[20:25].tolist() == [1] * 5
+        assert out[25:].sum() == 0
+
+
+class TestFaultPersist(object):
+
+    def test_fault_condition(self):
+        df = plant_df()
+        raw = FaultConditionOne(**CONFIG["fc1"]).evaluate(df)
+        flag = FaultConditionOne(**CONFIG["fc1"], persist="2min").evaluate(df)
+        expected, _ = persist_flag(raw.to_numpy(), df.index, "2min")
+        np.testing.assert_array_equal(flag.to_numpy(), expected)
+        assert 0 < flag.sum() < raw.sum()
+
+    def test_plant_and_streaming(self):
+        config = dict(CONFIG, fc1=dict(CONFIG["fc1"], persist="2min"),
+                      fc6=dict(CONFIG["fc6"], persist="1min", clear="3min"))
+        df = plant_df()
+        results = BoilerPlantFaults(config).apply(df)
+        for fault_id in ("fc1", "fc6"):
+            fault = BoilerPlantFaults(config).faults[fault_id]
+            pd.testing.assert_series_equal(
+                results[fault_id + "_flag"],
+                fault.evaluate(df).astype(int))
+
+        streamed = StreamingFaults(config).evaluate(
+            df.iloc[i:i + 77] for i in range(0, len(df), 77))
+        for fault_id in ("fc1", "fc6"):
+            pd.testing.assert_series_equal(
+                streamed[fault_id + "_flag"].astype(int),
+                results[fault_id + "_flag"], check_freq=False)
+
+    @pytest.mark.parametrize("fault_id", [f"fc{i}" for i in range(1, 12)])
+    def test_troubleshoot_stays_positional(self, fault_id):
+        # persist and clear come after troubleshoot, older positional
+        # calls keep meaning troubleshoot
+        cls = FAULT_CONDITIONS[fault_id]
+        params = list(inspect.signature(cls).parameters)
+        args = [CONFIG[fault_id][name]
+                for name in params[:params.index("troubleshoot")]]
+        fault = cls(*args, True)
+        assert fault.troubleshoot is True
+        assert fault.persist is None and fault.clear is None
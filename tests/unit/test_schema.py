@@ -0,0 +1,63 @@
+from faults import FaultConditionFour, HelperUtils
+from faults.plant import validate_plant_schema
+import pytest
+
+from tests.unit.test_boiler_plant import CONFIG, plant_df
+
+'''
+to see print statements in pytest run with
+$ pytest tests/unit/test_schema.py -rP
+
+plant schema is validated once and reused by the fault classes
+'''
+
+
+class TestValidatePlantSchema(object):
+
+    def test_stats_for_referenced_columns(self):
+        df = plant_df()
+        stats = validate_plant_schema(df, CONFIG)
+
+        assert set(stats) == {"pump_status", "pump_vfd", "bypass_vlv",
+                              "boiler_status", "boiler_stage"}
+        assert stats["boiler_stage"].min == 0
+        assert stats["boiler_stage"].max == 3
+        assert stats["pump_vfd"].max == df["pump_vfd"].max()
+
+    def test_list_of_faults(self):
+        df = plant_df()
+        stats = validate_plant_schema(
+            df, [FaultConditionFour(**CONFIG["fc4"])])
+        assert list(stats) == ["pump_vfd"]
+
+    def test_raises_like_the_fault(self):
+        df = plant_df()
+        df["pump_vfd"] = df["pump_vfd"] * 100.0
+        with pytest.raises(TypeError,
+                           match=HelperUtils().float_max_check_err("pump_vfd")):
+            validate_plant_schema(df, CONFIG)
+
+
+class TestPassedStats(object):
+
+    def test_faults_use_passed_stats(self):
+        df = plant_df()
+        stats = validate_plant_schema(df, CONFIG)
+        fc4 = FaultConditionFour(**CONFIG["fc4"])
+        expected = fc4.evaluate(df)
+
+        # passed stats stand in for the column scans
+        bad = dict(stats, pump_vfd=stats["pump_vfd"]._replace(max=99.0))
+        with pytest.raises(TypeError):
+            fc4.evaluate(df, stats=bad)
+        assert (fc4.evaluate(df, stats=stats) == expected).all()
+        assert fc4.apply(df.copy(), stats=stats)["fc4_flag"].equals(
+            expected.astype(int))
+
+    def test_in_place_edit_is_checked(self):
+        # nothing is cached on the dataframe, plain calls always check
+        df = plant_df()
+        validate_plant_schema(df, CONFIG)
+        df.loc[df.index[0], "pump_vfd"] = 99.0
+        with pytest.raises(TypeError):
+            FaultConditionFour(**CONFIG["fc4"]).evaluate(df)
@@ -0,0 +1,124 @@
+from faults.plant import BoilerPlantFaults
+from faults.service import (FaultPipeline, frame_samples, iter_source,
+                            json_lines_source)
+import asyncio
+import json
+import math
+import pandas as pd
+import pytest
+
+from tests.unit.test_boiler_plant import CONFIG, plant_df
+
+'''
+to see print statements in pytest run with
+$ pytest tests/unit/test_service.py -rP
+
+async micro batch pipeline must give the whole file flags
+'''
+
+
+class Collect(object):
+
+    def __init__(self):
+        self.pieces = {}
+
+    def __call__(self, results):
+        for flag, series in results.items():
+            self.pieces.setdefault(flag, []).append(series)
+
+    def flags(self):
+        return {flag: pd.concat(pieces)
+                for flag, pieces in self.pieces.items()}
+
+
+def assert_same_flags(collected, df):
+    expected = BoilerPlantFaults(CONFIG).apply(df)
+    for flag, series in expected.items():
+        pd.testing.assert_series_equal(
+            collected[flag].astype(int), series,
+            check_freq=False, check_names=False)
+
+
+class TestPipeline(object):
+
+    def test_flags_and_batches(self):
+        df = plant_df()
+        sink = Collect()
+        pipeline = FaultPipeline(CONFIG, sink, max_batch=50, max_delay=5.0)
+        metrics = asyncio.run(pipeline.run(iter_source(df)))
+
+        assert_same_flags(sink.flags(), df)
+        assert metrics.samples == len(df)
+        assert metrics.batches == math.ceil(len(df) / 50)
+        assert metrics.errors == 0
+        assert metrics.latency(0.99) >= metrics.latency(0.5) > 0
+
+    def test_backpressure(self):
+        df = plant_df(n=200)
+        sink = Collect()
+
+        async def slow_sink(results):
+            await asyncio.sleep(0.01)
+            sink(results)
+
+        pipeline = FaultPipeline(CONFIG, slow_sink, max_batch=10,
+                                 max_queue=20)
+        metrics = asyncio.run(pipeline.run(iter_source(df)))
+        assert metrics.blocked_puts > 0
+        assert metrics.max_queue_depth <= 20
+        assert_same_flags(sink.flags(), df)
+
+    def test_bad_batch_counted(self):
+        df = plant_df(n=100)
+        samples = list(frame_samples(df))
+        samples[10][1]["pump_status"] = 0.5
+        pipeline = FaultPipeline(CONFIG, max_batch=25)
+        metrics = asyncio.run(pipeline.run(iter_source(samples)))
+        assert metrics.errors == 1
+        assert metrics.samples == 75
+        assert "pump_status" in metrics.last_error
+
+    def test_bad_batch_leaves_state(self):
+        # fc14 fails after fc12 and fc13 already counted the batch, the
+        # dropped batch must not reach any fault's windows
+        df = plant_df(n=180)
+        samples = list(frame_samples(df))
+        samples[70][1]["boiler_stage"] = 0.5
+        sink = Collect()
+        pipeline = FaultPipeline(CONFIG, sink, max_batch=25, max_delay=5.0)
+        metrics = asyncio.run(pipeline.run(iter_source(samples)))
+        assert metrics.errors == 1
+        assert_same_flags(sink.flags(), df.drop(df.index[50:75]))
+
+    def test_sink_error_stops_run(self):
+        def broken(results):
+            raise RuntimeError("sink down")
+
+        pipeline = FaultPipeline(CONFIG, broken, max_batch=10, max_queue=5)
+        with pytest.raises(RuntimeError, match="sink down"):
+            asyncio.run(pipeline.run(iter_source(plant_df(n=100))))
+
+    def test_socket_stand_in(self):
+        df = plant_df(n=120)
+        sink = Collect()
+
+        async def main():
+            async def send(reader, writer):
+                for timestamp, sample in frame_samples(df):
+                    writer.write(json.dumps({
+                        "timestamp": timestamp.isoformat(),
+                        "points": sample}).encode() + b"\n")
+                await writer.drain()
+                writer.close()
+
+            server = await asyncio.start_server(send, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            pipeline = FaultPipeline(CONFIG, sink, max_batch=40)
+            await pipeline.run(json_lines_source(reader))
+            writer.close()
+            server.close()
+            await server.wait_closed()
+
+        asyncio.run(main())
+        assert_same_flags(sink.flags(), df)
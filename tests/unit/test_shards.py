@@ -0,0 +1,69 @@
+from faults.plant import BoilerPlantFaults
+from faults.shards import ShardedPlantFaults, shard_bounds
+import numpy as np
+import pandas as pd
+import pytest
+
+from tests.unit.test_boiler_plant import CONFIG, plant_df
+
+'''
+to see print statements in pytest run with
+$ pytest tests/unit/test_shards.py -rP
+
+time sharded runs stitch back to the same flags as a serial apply()
+'''
+
+
+def sharded_config():
+    config = dict(CONFIG)
+    config["fc6"] = dict(CONFIG["fc6"], persist="5min", clear="3min")
+    config["fc13"] = dict(CONFIG["fc13"], window="15min")
+    return config
+
+
+def assert_same(expected, results):
+    assert list(results) == list(expected)
+    for flag in expected:
+        pd.testing.assert_series_equal(results[flag], expected[flag])
+
+
+class TestShardBounds(object):
+
+    def test_covers_every_row(self):
+        bounds = shard_bounds(10, 3)
+        assert bounds == [(0, 3), (3, 6), (6, 10)]
+        assert shard_bounds(2, 5) == [(0, 1), (1, 2)]
+
+
+class TestShardedPlantFaults(object):
+
+    @pytest.mark.parametrize("shards", [1, 2, 7, 50])
+    def test_same_as_serial(self, shards):
+        df = plant_df(n=2000)
+        expected = BoilerPlantFaults(sharded_config()).apply(df)
+        sharded = ShardedPlantFaults(sharded_config(), workers=0, shards=shards)
+        assert_same(expected, sharded.apply(df))
+
+    @pytest.mark.parametrize("pool", ["thread", "process"])
+    def test_pools(self, pool):
+        df = plant_df(n=2000, seed=4)
+        expected = BoilerPlantFaults(sharded_config()).apply(df)
+        sharded = ShardedPlantFaults(sharded_config(), workers=2, shards=5,
+                                     pool=pool)
+        assert_same(expected, sharded.apply(df))
+
+    def test_gaps_in_the_index(self):
+        # whole empty windows between shards still come out as zeros
+        df = plant_df(n=1200, seed=5)
+        keep = np.ones(len(df), dtype=bool)
+        keep[300:500] = False
+        df = df[keep]
+        expected = BoilerPlantFaults(sharded_config()).apply(df)
+        sharded = ShardedPlantFaults(sharded_config(), workers=0, shards=6)
+        assert_same(expected, sharded.apply(df))
+
+    def test_bad_column_raises(self):
+        df = plant_df(n=300)
+        df["pump_status"] = df["pump_status"] * 0.5
+        with pytest.raises(TypeError):
+            ShardedPlantFaults(CONFIG, workers=0, shards=3).apply(df)
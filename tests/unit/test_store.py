@@ -0,0 +1,105 @@
+from faults.batch import run_batch
+from faults.episodes import flags_to_episodes
+from faults.plant import BoilerPlantFaults
+from faults.store import FaultStore
+import pandas as pd
+import pytest
+
+from tests.unit.test_batch import write_manifest
+from tests.unit.test_boiler_plant import CONFIG, plant_df
+
+'''
+to see print statements in pytest run with
+$ pytest tests/unit/test_store.py -rP
+
+fault flags and episodes of many sites in one sqlite file
+'''
+
+
+def site_results(seed):
+    return BoilerPlantFaults(CONFIG).apply(plant_df(n=1200, seed=seed))
+
+
+class TestFaultStore(object):
+
+    def test_episodes_round_trip(self, tmp_path):
+        results = site_results(0)
+        with FaultStore(tmp_path / "faults.db") as store:
+            store.write_results("site_a", results)
+            stored = store.episodes(site="site_a", fault="fc6")
+
+        expected = flags_to_episodes({"fc6_flag": results["fc6_flag"]})
+        assert (stored["start"] == expected["start"]).all()
+        assert (stored["end"] == expected["end"]).all()
+        assert (stored["duration"] == expected["duration"]).all()
+        assert (stored["samples"] == expected["samples"]).all()
+
+    def test_rewrite_replaces(self, tmp_path):
+        results = site_results(0)
+        with FaultStore(tmp_path / "faults.db") as store:
+            store.write_results("site_a", results, flags=True)
+            store.write_results("site_a", results, flags=True)
+            assert len(store.episodes()) == len(flags_to_episodes(results))
+            flags = store.flags("site_a", "fc1_flag")
+            assert len(flags) == results["fc1_flag"].sum()
+
+    def test_rerun_removes_old_rows(self, tmp_path):
+        results = site_results(0)
+        flag = results["fc6_flag"]
+        # the re-run keeps only the first sample of the first episode
+        first = flag.index[flag.to_numpy() == 1][0]
+        rerun = dict(results, fc6_flag=flag.where(flag.index == first, 0))
+        with FaultStore(tmp_path / "faults.db") as store:
+            store.write_results("site_a", results, flags=True)
+            store.write_results("site_a", rerun, flags=True)
+            stored = store.episodes(site="site_a", fault="fc6")
+            assert len(stored) == 1
+            assert stored["samples"].tolist() == [1]
+            assert store.top_offenders("fc6")["episodes"].tolist() == [1]
+            assert store.flags("site_a", "fc6").index.tolist() == [first]
+
+    def test_time_window_queries(self, tmp_path):
+        with FaultStore(tmp_path / "faults.db") as store:
+            for i, site in enumerate(["site_a", "site_b", "site_c"]):
+                store.write_results(site, site_results(i))
+            store.write_results("site_d", {
+                "fc6_flag": pd.Series(
+                    0, index=pd.date_range("2023-01-01", periods=10,
+                                           freq="1min"))})
+
+            window = dict(start="2023-01-01 02:00", end="2023-01-01 03:00")
+            episodes = store.episodes(fault="fc6", **window)
+            assert (episodes["end"] >= pd.Timestamp(window["start"])).all()
+            assert (episodes["start"] < pd.Timestamp(window["end"])).all()
+            assert store.sites_with("fc6", **window) == \
+                sorted(episodes["site"].unique())
+            assert "site_d" not in store.sites_with("fc6")
+
+            top = store.top_offenders("fc6", n=2)
+            assert len(top) == 2
+            assert top["hours"].is_monotonic_decreasing
+            top = store.top_offenders(n=3, by="episodes")
+            assert top["episodes"].is_monotonic_decreasing
+            with pytest.raises(ValueError):
+                store.top_offenders(by="rows")
+
+    def test_tz_aware(self, tmp_path):
+        df = plant_df(n=300)
+        df.index = df.index.tz_localize("US/Central")
+        results = BoilerPlantFaults({"fc1": CONFIG["fc1"]}).apply(df)
+        with FaultStore(tmp_path / "faults.db") as store:
+            store.write_results("site_a", results)
+            stored = store.episodes(tz="US/Central")
+        expected = flags_to_episodes(results)
+        assert (stored["start"] == expected["start"]).all()
+
+    def test_batch_writes_episodes(self, tmp_path):
+        out_dir = tmp_path / "out"
+        results = run_batch(write_manifest(tmp_path), out_dir, workers=0,
+                            store=tmp_path / "faults.db")
+        with FaultStore(tmp_path / "faults.db") as store:
+            stored = store.episodes()
+        by_site = {r["site"]: r for r in results}
+        assert set(stored["site"]) == {"site_a", "site_b"}
+        assert by_site["site_a"]["episodes"] == \
+            (stored["site"] == "site_a").sum()
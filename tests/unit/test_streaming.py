@@ -0,0 +1,86 @@
+from faults.plant import build_faults
+from faults.streaming import StreamingFaults, iter_csv_chunks
+import numpy as np
+import pandas as pd
+import pytest
+
+from tests.unit.test_boiler_plant import CONFIG, plant_df
+
+'''
+to see print statements in pytest run with
+$ pytest tests/unit/test_streaming.py -rP
+
+chunked streaming run must give the same flags as a whole file run
+'''
+
+
+def whole_file_flags(df):
+    return {fault.flag_col: fault.evaluate(df)
+            for fault in build_faults(CONFIG).values()}
+
+
+def uneven_chunks(df, sizes):
+    start = 0
+    for size in sizes:
+        yield df.iloc[start:start + size]
+        start += size
+    yield df.iloc[start:]
+
+
+def gappy_df():
+    df = plant_df(n=1500)
+    # a few missing hours so empty windows fall between chunks
+    return df.drop(df.index[700:900])
+
+
+class TestMatchesWholeFile(object):
+
+    @pytest.mark.parametrize("sizes", [
+        [1], [59, 1, 60, 7, 200], [333, 333, 333], [1300]])
+    def test_chunked_flags_match(self, sizes):
+        df = gappy_df()
+        expected = whole_file_flags(df)
+        actual = StreamingFaults(CONFIG).evaluate(uneven_chunks(df, sizes))
+
+        assert list(actual) == list(expected)
+        for flag in expected:
+            assert actual[flag].index.equals(expected[flag].index), flag
+            assert (actual[flag].to_numpy() ==
+                    expected[flag].to_numpy()).all(), flag
+
+    def test_stage_change_across_chunks(self):
+        index = pd.date_range("2023-01-01", periods=12, freq="5min")
+        df = pd.DataFrame({"boiler_stage": [1, 1, 2, 2] * 3}, index=index)
+        config = {"fc14": dict(boiler_stage_os_max=4,
+                               boiler_stage_int_col="boiler_stage")}
+
+        results = StreamingFaults(config).evaluate(
+            [df.iloc[i:i + 1] for i in range(len(df))])
+        assert results["fc14_flag"].tolist() == [1]
+
+    def test_csv_chunks(self, tmp_path):
+        df = gappy_df()
+        path = tmp_path / "trend_log.csv"
+        df.to_csv(path)
+
+        expected = whole_file_flags(pd.read_csv(
+            path, index_col=0, parse_dates=True))
+        actual = StreamingFaults(CONFIG).evaluate(
+            iter_csv_chunks(path, chunksize=250))
+        for flag in expected:
+            assert (actual[flag].to_numpy() ==
+                    expected[flag].to_numpy()).all(), flag
+
+
+class TestIterEvaluate(object):
+
+    def test_row_flags_stream_per_chunk(self):
+        df = plant_df()
+        stream = StreamingFaults({"fc2": CONFIG["fc2"], "fc13": CONFIG["fc13"]})
+        results = list(stream.iter_evaluate(uneven_chunks(df, [90, 90])))
+
+        # two chunks, the rest of the file and the flush
+        assert [len(r["fc2_flag"]) for r in results[:-1]] == [90, 90, 420]
+        assert [len(r["fc13_flag"]) for r in results] == [1, 1, 7, 1]
+        assert list(results[-1]) == ["fc13_flag"]
+        assert results[-1]["fc13_flag"].dtype == np.uint8
@@ -0,0 +1,88 @@
+from faults.plant import FAULT_CONDITIONS, build_faults
+from faults.sweep import sweep, sweep_params
+import numpy as np
+import pytest
+
+from tests.unit.test_boiler_plant import CONFIG, plant_df
+
+'''
+to see print statements in pytest run with
+$ pytest tests/unit/test_sweep.py -rP
+
+one pass sweep must count the same as evaluating every threshold
+'''
+
+SWEEPS = [(fault_id, param)
+          for fault_id, fault in build_faults(CONFIG).items()
+          for param in sweep_params(fault)]
+
+
+def values_around(value):
+    return np.round(np.linspace(value * 0.2, value * 2.0, 9) + 0.00123, 5)
+
+
+class TestSweep(object):
+
+    def test_every_fault_has_a_sweep(self):
+        assert {fault_id for fault_id, _ in SWEEPS} == set(CONFIG)
+
+    @pytest.mark.parametrize("fault_id, param", SWEEPS)
+    def test_matches_evaluate(self, fault_id, param):
+        df = plant_df()
+        fault = build_faults(CONFIG)[fault_id]
+        values = values_around(CONFIG[fault_id][param])
+        result = sweep(fault, df, param, values)
+
+        expected = []
+        for value in values:
+            args = dict(CONFIG[fault_id], **{param: value})
+            expected.append(
+                int(FAULT_CONDITIONS[fault_id](**args).evaluate(df).sum()))
+        assert result.tolist() == expected
+        assert result.index.name == param
+
+    @pytest.mark.parametrize("fault_id, param", SWEEPS)
+    def test_decimal_boundaries(self, fault_id, param):
+        # one decimal data right at one decimal thresholds, where the
+        # rewritten margins round the other way to the kernels
+        df = plant_df().round(1)
+        value = CONFIG[fault_id][param]
+        values = np.round(np.arange(-20, 21) / 10 + value, 1)
+        fault = build_faults(CONFIG)[fault_id]
+        result = sweep(fault, df, param, values)
+
+        expected = []
+        for value in values:
+            args = dict(CONFIG[fault_id], **{param: value})
+            expected.append(
+                int(FAULT_CONDITIONS[fault_id](**args).evaluate(df).sum()))
+        assert result.tolist() == expected
+
+    def test_rounding_at_threshold(self):
+        # 10.0 - 9.7 is 0.3000000000000007, but 9.7 < 10.0 - 0.3 is False
+        df = plant_df().iloc[:3].copy()
+        df["dp"] = [9.7, 9.7, 9.0]
+        df["dp_spt"] = 10.0
+        df["pump_status"] = 0
+        args = dict(CONFIG["fc1"], pump_diff_press_err_thres=0.3)
+        assert FAULT_CONDITIONS["fc1"](**args).evaluate(df).sum() == 1
+        fault = build_faults(CONFIG)["fc1"]
+        assert sweep(fault, df, "pump_diff_press_err_thres", [0.3]).tolist() \
+            == [1]
+
+    def test_hours(self):
+        df = plant_df()
+        fault = build_faults(CONFIG)["fc6"]
+        counts = sweep(fault, df, "hot_water_temp_err_thres", [1.0, 2.0])
+        hours = sweep(fault, df, "hot_water_temp_err_thres", [1.0, 2.0],
+                      hours=True)
+        np.testing.assert_allclose(hours, counts / 60.0)
+
+        fault = build_faults(CONFIG)["fc13"]
+        hours = sweep(fault, df, "boiler_os_max", [0, 100], hours=True)
+        assert hours.tolist() == [10.0, 0.0]
+
+    def test_unknown_param(self):
+        fault = build_faults(CONFIG)["fc1"]
+        with pytest.raises(ValueError, match="pump_diff_press_err_thres"):
+            sweep(fault, plant_df(), "flow_meter_err_thres", [1.0])
@@ -0,0 +1,60 @@
+from benchmarks.bench_faults import compare, run
+from faults.plant import BoilerPlantFaults
+from faults.synthetic import (FAULT_IDS, PLANT_CONFIG, iter_synthetic_plant,
+                              synthetic_plant)
+import pandas as pd
+import pytest
+
+'''
+to see print statements in pytest run with
+$ pytest tests/unit/test_synthetic.py -rP
+
+synthetic plant data must be repeatable and trip only the injected faults
+'''
+
+
+class TestSyntheticPlant(object):
+
+    def test_deterministic(self):
+        pd.testing.assert_frame_equal(synthetic_plant(5000, seed=3),
+                                      synthetic_plant(5000, seed=3))
+        assert not synthetic_plant(5000, seed=3).equals(
+            synthetic_plant(5000, seed=4))
+
+    def test_no_faults(self):
+        df = synthetic_plant(50_000, faults=[])
+        results = BoilerPlantFaults(PLANT_CONFIG).apply(df)
+        assert all(flag.sum() == 0 for flag in results.values())
+
+    @pytest.mark.parametrize("fault_id", FAULT_IDS)
+    def test_injected_fault(self, fault_id):
+        df, injected = synthetic_plant(
+            20_000, faults=[fault_id], return_injected=True)
+        results = BoilerPlantFaults(PLANT_CONFIG).apply(df)
+        flag = results[fault_id + "_flag"]
+        assert flag.sum() > 0
+
+        if fault_id not in ("fc12", "fc13", "fc14"):
+            assert flag[flag == 1].index.equals(injected[fault_id])
+
+    def test_chunks(self):
+        chunks = list(iter_synthetic_plant(25_000, chunksize=10_000, freq="15s"))
+        assert [len(chunk) for chunk in chunks] == [10_000, 10_000, 5_000]
+        df = pd.concat(chunks)
+        assert df.index.is_unique and df.index.is_monotonic_increasing
+        assert (df.index.to_series().diff().dropna() == pd.Timedelta("15s")).all()
+
+
+class TestBenchmarks(object):
+
+    def test_run_and_compare(self):
+        report = run([2000], repeat=1, only="fc1.")
+        names = {result["name"] for result in report["results"]}
+        assert names == {"fc1.apply", "fc1.evaluate", "fc1.kernel"}
+        assert all(result["peak_bytes"] > 0 for result in report["results"])
+
+        slower = dict(report, results=[
+            dict(result, seconds=result["seconds"] * 2)
+            for result in report["results"]])
+        assert compare(report, report) == []
+        assert len(compare(report, slower)) == 3
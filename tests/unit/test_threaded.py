@@ -0,0 +1,47 @@
+from faults.plant import BoilerPlantFaults
+from faults.threaded import ThreadedFaults, read_only_arrays
+import numpy as np
+import pandas as pd
+import pytest
+
+from tests.unit.test_boiler_plant import CONFIG, plant_df
+
+'''
+to see print statements in pytest run with
+$ pytest tests/unit/test_threaded.py -rP
+
+independent faults run on a thread pool over shared read only arrays
+'''
+
+
+class TestThreadedFaults(object):
+
+    def test_same_as_plant(self):
+        config = dict(CONFIG, fc6=dict(CONFIG["fc6"], persist="3min"))
+        df = plant_df(n=2000)
+        before = df.copy()
+        expected = BoilerPlantFaults(config).apply(df)
+        with ThreadedFaults(config, workers=4) as threaded:
+            results = threaded.evaluate(df)
+            # the pool is reused between calls
+            threaded.evaluate(df)
+
+        assert list(results) == list(expected)
+        for flag in expected:
+            pd.testing.assert_series_equal(results[flag], expected[flag])
+        pd.testing.assert_frame_equal(df, before)
+
+    def test_arrays_are_shared_and_read_only(self):
+        df = plant_df(n=100)
+        arrays = read_only_arrays(df, ["hws", "pump_status"])
+        assert np.shares_memory(arrays["hws"], df["hws"].to_numpy())
+        with pytest.raises(ValueError):
+            arrays["hws"][0] = 0.0
+
+    def test_bad_column_raises(self):
+        df = plant_df(n=100)
+        df["pump_status"] = df["pump_status"] * 0.5
+        threaded = ThreadedFaults(CONFIG, workers=2)
+        with pytest.raises(TypeError):
+            threaded.evaluate(df)
+        threaded.close()